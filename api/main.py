@@ -1,41 +1,21 @@
 """FastAPI application for podcasts listening history."""
-import logging
-import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 
-from api.routers import podcasts, episodes, stats, sync, settings
+import metrics
+from database import init_schema
+from api.middleware import MetricsMiddleware, RequestLogMiddleware
+from api.routers import podcasts, episodes, stats, sync, settings, diagnostics, export
 from api.routers.search import router as search_router
 from api.services.feed_refresh_scheduler import start_scheduler, stop_scheduler
 
-logger = logging.getLogger(__name__)
-
-
-class LogRequestsMiddleware(BaseHTTPMiddleware):
-    """Log each API request and response (method, path, status, duration)."""
-
-    async def dispatch(self, request, call_next):
-        start = time.perf_counter()
-        response = await call_next(request)
-        duration = time.perf_counter() - start
-        path = request.url.path
-        if request.url.query and len(request.url.query) <= 80:
-            path = f"{path}?{request.url.query}"
-        logger.info(
-            "%s %s %d %.2fs",
-            request.method,
-            path,
-            response.status_code,
-            duration,
-        )
-        return response
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Apply pending schema migrations before serving
+    init_schema()
     start_scheduler()
     yield
     stop_scheduler()
@@ -54,8 +34,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Time", "X-DB-Queries"],
 )
-app.add_middleware(LogRequestsMiddleware)
+app.add_middleware(RequestLogMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(podcasts.router, prefix="/api/podcasts", tags=["podcasts"])
 app.include_router(episodes.router, prefix="/api/episodes", tags=["episodes"])
@@ -63,8 +45,16 @@ app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
 app.include_router(sync.router, prefix="/api", tags=["sync"])
 app.include_router(settings.router, prefix="/api/settings", tags=["settings"])
 app.include_router(search_router, prefix="/api", tags=["search"])
+app.include_router(diagnostics.router, prefix="/api/diagnostics", tags=["diagnostics"])
+app.include_router(export.router, prefix="/api", tags=["export"])
 
 
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition of in-process counters and histograms."""
+    return PlainTextResponse(metrics.render_all(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,124 @@
+"""Pure-ASGI middleware for the API (no per-request Request/Response objects)."""
+import logging
+import random
+import time
+
+import db_trace
+import metrics
+from config import get_request_log_levels, get_request_log_sample_rate
+
+logger = logging.getLogger(__name__)
+
+
+def _route_label(scope) -> str:
+    """
+    Route template (e.g. /api/episodes/{uuid}) of the matched route, so label cardinality stays bounded.
+    Routes of included routers only know their own path, so the router prefix is taken from the
+    request path in front of the part the route matched.
+    """
+    path_format = getattr(scope.get("route"), "path_format", None)
+    if path_format is None:
+        return "unmatched"
+    try:
+        matched = path_format.format_map({k: str(v) for k, v in (scope.get("path_params") or {}).items()})
+    except (KeyError, ValueError):
+        return path_format
+    path = scope["path"]
+    if not path.endswith(matched):
+        return path_format
+    return path[:len(path) - len(matched)] + path_format
+
+
+class MetricsMiddleware:
+    """Count requests and observe latency per method, route template and status."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = _route_label(scope)
+            method = scope["method"]
+            metrics.HTTP_REQUESTS.inc(method, route, str(status))
+            metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, route)
+
+
+class RequestLogMiddleware:
+    """
+    Log each API request (method, path, status, duration, DB time and query count) and add
+    X-DB-Time / X-DB-Queries response headers. Successful requests are sampled at
+    PODCASTS_REQUEST_LOG_SAMPLE; per-route levels come from PODCASTS_REQUEST_LOG_LEVELS.
+    Responses with status >= 500 are always logged at WARNING.
+    """
+
+    def __init__(self, app, sample_rate=None, route_levels=None):
+        self.app = app
+        self.sample_rate = get_request_log_sample_rate() if sample_rate is None else sample_rate
+        self.route_levels = get_request_log_levels() if route_levels is None else route_levels
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        token = db_trace.begin_request()
+        db_stats = db_trace.current_request_stats()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-time", f"{db_stats.seconds * 1000:.1f}ms".encode()))
+                headers.append((b"x-db-queries", str(db_stats.queries).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            db_trace.end_request(token)
+            self._log(scope, status, time.perf_counter() - start, db_stats)
+
+    def _log(self, scope, status: int, duration: float, db_stats) -> None:
+        if status >= 500:
+            level = logging.WARNING
+        else:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return
+            level = logging.INFO
+            if self.route_levels:
+                level = self.route_levels.get(_route_label(scope), level)
+                if level is None:
+                    return
+        if not logger.isEnabledFor(level):
+            return
+        path = scope["path"]
+        query = scope.get("query_string", b"")
+        if query and len(query) <= 80:
+            path = f"{path}?{query.decode('latin-1')}"
+        logger.log(
+            level,
+            "%s %s %d %.2fs db=%.3fs/%dq",
+            scope["method"],
+            path,
+            status,
+            duration,
+            db_stats.seconds,
+            db_stats.queries,
+        )
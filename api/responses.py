@@ -0,0 +1,70 @@
+"""
+Fast JSON path for bulk list responses. Rows read from our own database are already
+the right shape, so list endpoints project them onto the response model's fields and
+serialize directly, skipping per-row model construction and response_model re-validation.
+Uses orjson when installed, otherwise the standard library encoder.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, BeforeValidator
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available (same media type, so OpenAPI is unchanged)."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    """(field name, default) pairs for model, in declaration order."""
+    return tuple(
+        (name, None if field.is_required() else field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+    )
+
+
+@lru_cache(maxsize=None)
+def _field_converters(model: Type[BaseModel]) -> Tuple[Tuple[str, Callable[[Any], Any]], ...]:
+    """(field name, function) for fields with a BeforeValidator (e.g. epoch-ms timestamps to ISO strings)."""
+    return tuple(
+        (name, meta.func)
+        for name, field in model.model_fields.items()
+        for meta in field.metadata
+        if isinstance(meta, BeforeValidator)
+    )
+
+
+def project_rows(
+    rows: Iterable[Dict[str, Any]],
+    model: Type[BaseModel],
+    fields: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Trusted DB rows reduced to model's fields (missing keys take the field default, before-validators applied).
+    fields limits the output to those keys (a fields= projection), so unselected fields are left out rather than null.
+    """
+    model_fields = _model_fields(model)
+    if fields is not None:
+        selected = set(fields)
+        model_fields = tuple((name, default) for name, default in model_fields if name in selected)
+    items = [{name: row.get(name, default) for name, default in model_fields} for row in rows]
+    converters = _field_converters(model)
+    if fields is not None:
+        converters = tuple((name, func) for name, func in converters if name in selected)
+    if converters:
+        for item in items:
+            for name, func in converters:
+                item[name] = func(item[name])
+    return items
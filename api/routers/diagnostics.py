@@ -0,0 +1,22 @@
+"""Diagnostics API endpoints (DB query timings)."""
+from fastapi import APIRouter, Query
+
+import db_trace
+from api.schemas import SlowQueryResponse
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    sort: str = Query("total", description="Sort by 'total', 'max', 'mean' or 'count'"),
+):
+    """Top-N SQL statements (normalized fingerprints) by time spent since startup or last reset."""
+    return [SlowQueryResponse(**row) for row in db_trace.top_queries(limit=limit, sort=sort)]
+
+
+@router.delete("/slow-queries", status_code=204)
+def reset_slow_queries():
+    """Clear aggregated query timings."""
+    db_trace.reset_query_stats()
@@ -1,17 +1,21 @@
 """Episode API endpoints."""
-from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Query, HTTPException
 
 from database import (
     get_episodes_list,
     get_episodes_list_count,
+    episode_list_fields,
     get_episode_by_uuid,
     get_listening_history_by_episode,
     get_play_sessions_by_episode,
+    implicit_listening_history,
+    now_ms,
+    NOT_PLAYED_STATUS,
     upsert_listening_history,
 )
-from api.schemas import EpisodeResponse, ListeningHistoryResponse, ListeningHistoryUpdateRequest, PlaySessionResponse
+from api.responses import FastJSONResponse, project_rows
+from api.schemas import EPISODE_FIELDS_DESCRIPTION, EpisodeResponse, ListeningHistoryResponse, ListeningHistoryUpdateRequest, PlaySessionResponse
 
 router = APIRouter()
 
@@ -25,17 +29,22 @@ def list_episodes(
     podcast_uuid: Optional[str] = Query(None),
     playing_status: Optional[str] = Query(None, description="1=not played, 2=in progress, 3=completed, played=both 2 and 3"),
     sort: Optional[str] = Query("last_played", description="Sort: last_played, published, created, title"),
+    fields: Optional[str] = Query("summary", description=EPISODE_FIELDS_DESCRIPTION),
 ):
     """List episodes with optional filters. Returns { items, total }."""
     sort_val = sort if sort in VALID_SORT else "last_played"
-    rows = get_episodes_list(
-        limit=limit, offset=offset, podcast_uuid=podcast_uuid, playing_status=playing_status, sort=sort_val
-    )
+    try:
+        names = episode_list_fields(fields)
+        rows = get_episodes_list(
+            limit=limit, offset=offset, podcast_uuid=podcast_uuid, playing_status=playing_status, sort=sort_val,
+            fields=fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     total = get_episodes_list_count(
         podcast_uuid=podcast_uuid, playing_status=playing_status
     )
-    items = [EpisodeResponse(**dict(row)) for row in rows]
-    return {"items": items, "total": total}
+    return FastJSONResponse({"items": project_rows(rows, EpisodeResponse, names), "total": total})
 
 
 @router.get("/{uuid}", response_model=EpisodeResponse)
@@ -52,7 +61,11 @@ def get_episode_history(uuid: str):
     """Get listening history for an episode."""
     row = get_listening_history_by_episode(uuid)
     if not row:
-        raise HTTPException(status_code=404, detail="Listening history not found for this episode")
+        # No row means not played; answer with the implicit state for episodes we know
+        episode = get_episode_by_uuid(uuid)
+        if not episode:
+            raise HTTPException(status_code=404, detail="Listening history not found for this episode")
+        row = implicit_listening_history(uuid, episode.get("duration"), episode.get("created_at"))
     return ListeningHistoryResponse(**dict(row))
 
 
@@ -63,10 +76,10 @@ def update_episode_history(uuid: str, body: ListeningHistoryUpdateRequest):
     if not episode:
         raise HTTPException(status_code=404, detail="Episode not found")
     existing = get_listening_history_by_episode(uuid)
-    now = datetime.utcnow().isoformat() + "Z"
+    now = now_ms()
     played_up_to = body.played_up_to if body.played_up_to is not None else (existing["played_up_to"] if existing else 0)
     duration = body.duration if body.duration is not None else (existing.get("duration") or episode.get("duration") or 0)
-    playing_status = body.playing_status if body.playing_status is not None else (existing["playing_status"] if existing else 0)
+    playing_status = body.playing_status if body.playing_status is not None else (existing["playing_status"] if existing else NOT_PLAYED_STATUS)
     first_played_at = existing["first_played_at"] if existing else now
     last_played_at = now
     play_count = existing["play_count"] if existing else 1
@@ -0,0 +1,26 @@
+"""Library export API: stream podcasts, episodes, history and sessions as NDJSON or CSV."""
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from database import ms_to_iso, now_ms
+from library_export import iter_export
+
+router = APIRouter()
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+@router.get("/export")
+def export_library(format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson or csv")):
+    """
+    Stream the whole library as a download. Rows are read in chunks from one read transaction,
+    so memory stays flat regardless of library size. Restore with `python library_export.py restore`.
+    """
+    stamp = ms_to_iso(now_ms())[:10]
+    return StreamingResponse(
+        iter_export(format),
+        media_type=_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="audiophile-library-{stamp}.{format}"'},
+    )
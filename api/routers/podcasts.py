@@ -1,10 +1,12 @@
 """Podcast API endpoints."""
-import hashlib
+import json
 import logging
-from datetime import datetime
-from typing import Optional
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, List, Optional
 
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
 
 logger = logging.getLogger(__name__)
 
@@ -12,94 +14,80 @@ from database import (
     get_all_podcasts,
     get_all_podcasts_count,
     get_podcast_by_uuid,
-    get_podcast_by_feed_url,
     get_episodes_by_podcast,
+    episode_list_fields,
     get_connection,
+    now_ms,
     upsert_podcast,
-    upsert_episode,
 )
+from api.responses import FastJSONResponse, project_rows
 from api.schemas import (
+    EPISODE_FIELDS_DESCRIPTION,
     PodcastResponse,
     EpisodeResponse,
     RefreshMetadataResponse,
     PodcastSubscribeRequest,
+    BulkSubscribeRequest,
     PodcastUpdateRequest,
     FeedRefreshResponse,
 )
-from api.utils.rss_fetcher import fetch_podcast_metadata, fetch_podcast_with_episodes, FeedNotFoundError
+from api.utils.rss_fetcher import fetch_podcast_metadata
 from api.services.feed_refresh import refresh_all_feeds
-from api.services.episode_identity import resolve_episode_uuid
+from api.services.subscribe import (
+    BULK_SUBSCRIBE_STATUSES,
+    MAX_BULK_SUBSCRIBE_FEEDS,
+    clean_feed_url,
+    fetch_feed,
+    iter_bulk_subscribe,
+    store_feed,
+)
 
 router = APIRouter()
 
 
-def _canonical_feed_url(feed_url: str) -> str:
-    return (feed_url or "").strip().rstrip("/")
-
-
-def _podcast_uuid_from_feed_url(feed_url: str) -> str:
-    return hashlib.sha256(_canonical_feed_url(feed_url).encode("utf-8")).hexdigest()[:32]
-
-
 @router.post("/subscribe", response_model=PodcastResponse)
 def subscribe_to_podcast(body: PodcastSubscribeRequest):
     """Subscribe to a podcast by RSS feed URL. Fetches metadata and episodes, then stores them."""
-    feed_url = _canonical_feed_url(body.feed_url)
+    feed_url = clean_feed_url(body.feed_url)
     if not feed_url or not feed_url.startswith("http"):
         raise HTTPException(status_code=400, detail="Valid feed URL is required")
-    try:
-        data = fetch_podcast_with_episodes(feed_url)
-    except FeedNotFoundError as e:
-        raise HTTPException(status_code=422, detail=f"Feed not available (HTTP {e.status})") from e
-    except Exception as e:
-        raise HTTPException(status_code=422, detail=f"Failed to fetch feed: {e}") from e
-    title = (data.get("title") or "").strip() or None
-    if not title and not data.get("entries"):
-        raise HTTPException(status_code=422, detail="Feed could not be parsed or has no content")
-    existing = get_podcast_by_feed_url(feed_url)
-    podcast_uuid = existing["uuid"] if existing else _podcast_uuid_from_feed_url(feed_url)
-    author = (data.get("author") or "").strip() or None
-    description = (data.get("description") or "").strip() or None
-    image_url = (data.get("image_url") or "").strip() or None
-    website_url = (data.get("website_url") or "").strip() or None
-    upsert_podcast(
-        uuid=podcast_uuid,
-        title=title or "Untitled Podcast",
-        author=author,
-        description=description,
-        feed_url=feed_url,
-        website_url=website_url,
-        image_url=image_url,
-        deleted_at=None,
-        is_ended=False,
-    )
+    data, error = fetch_feed(feed_url)
+    if error:
+        raise HTTPException(status_code=422, detail=error)
     with get_connection() as conn:
-        cur = conn.execute(
-            """SELECT uuid, title, published_date, file_url, created_at
-               FROM episodes WHERE podcast_uuid = ? AND deleted_at IS NULL""",
-            (podcast_uuid,),
-        )
-        existing_episodes = [dict(r) for r in cur.fetchall()]
-        for ep in data.get("entries") or []:
-            uid = resolve_episode_uuid(podcast_uuid, ep, existing_episodes)
-            upsert_episode(
-                uuid=uid,
-                podcast_uuid=podcast_uuid,
-                title=ep.get("title"),
-                description=ep.get("description"),
-                duration=ep.get("duration"),
-                published_date=ep.get("published_date"),
-                file_url=ep.get("file_url"),
-                file_type=ep.get("file_type"),
-                size_bytes=ep.get("size_bytes"),
-                video_url=ep.get("video_url"),
-                deleted_at=None,
-                conn=conn,
-            )
-    row = get_podcast_by_uuid(podcast_uuid)
+        result = store_feed(conn, feed_url, data)
+    row = get_podcast_by_uuid(result.podcast_uuid)
     return PodcastResponse(**dict(row))
 
 
+def _bulk_subscribe_lines(feed_urls: List[str]) -> Iterator[bytes]:
+    start = time.perf_counter()
+    summary: Dict[str, Any] = {status: 0 for status in BULK_SUBSCRIBE_STATUSES}
+    summary.update(episodes_added=0, episodes_updated=0)
+    for result in iter_bulk_subscribe(feed_urls):
+        summary[result.status] += 1
+        summary["episodes_added"] += result.episodes_added
+        summary["episodes_updated"] += result.episodes_updated
+        yield json.dumps({"feed": asdict(result)}, ensure_ascii=False).encode("utf-8") + b"\n"
+    summary["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    yield json.dumps({"summary": summary}).encode("utf-8") + b"\n"
+
+
+@router.post("/subscribe/bulk")
+def bulk_subscribe(body: BulkSubscribeRequest):
+    """
+    Subscribe to many podcasts by RSS feed URL. Feeds are fetched and parsed concurrently and each
+    is stored (podcast and episodes in one transaction) as soon as its fetch completes. Streams
+    NDJSON: one {"feed": {...}} line per feed URL with its status (subscribed, updated, failed,
+    invalid or duplicate) and episode counts, in completion order, then one {"summary": {...}} line.
+    """
+    if not body.feed_urls:
+        raise HTTPException(status_code=400, detail="At least one feed URL is required")
+    if len(body.feed_urls) > MAX_BULK_SUBSCRIBE_FEEDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_SUBSCRIBE_FEEDS} feed URLs per request")
+    return StreamingResponse(_bulk_subscribe_lines(body.feed_urls), media_type="application/x-ndjson")
+
+
 @router.post("/refresh-feeds", response_model=FeedRefreshResponse)
 def refresh_feeds():
     """Fetch new episodes from RSS for all active podcasts with feed URLs."""
@@ -225,7 +213,7 @@ def archive_podcast(uuid: str):
     row = get_podcast_by_uuid(uuid)
     if not row:
         raise HTTPException(status_code=404, detail="Podcast not found")
-    now = datetime.utcnow().isoformat() + "Z"
+    now = now_ms()
     is_ended = bool(row.get("is_ended", 0))
     upsert_podcast(
         uuid=uuid,
@@ -274,13 +262,19 @@ def list_podcast_episodes(
     offset: int = Query(0, ge=0),
     playing_status: Optional[str] = Query(None, description="1=not played, 2=in progress, 3=completed, played=both 2 and 3"),
     sort: Optional[str] = Query("newest", description="newest | oldest | last_played | oldest_played"),
+    fields: Optional[str] = Query("summary", description=EPISODE_FIELDS_DESCRIPTION),
 ):
     """Get episodes for a podcast (includes archived podcasts)."""
     podcast = get_podcast_by_uuid(uuid, include_deleted=True)
     if not podcast:
         raise HTTPException(status_code=404, detail="Podcast not found")
     sort_val = sort if sort in PODCAST_EPISODES_SORT else "newest"
-    rows = get_episodes_by_podcast(
-        podcast_uuid=uuid, limit=limit, offset=offset, playing_status=playing_status, sort=sort_val
-    )
-    return [EpisodeResponse(**dict(row)) for row in rows]
+    try:
+        names = episode_list_fields(fields)
+        rows = get_episodes_by_podcast(
+            podcast_uuid=uuid, limit=limit, offset=offset, playing_status=playing_status, sort=sort_val,
+            fields=fields,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(project_rows(rows, EpisodeResponse, names))
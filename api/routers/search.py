@@ -1,8 +1,9 @@
 """Unified search API."""
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 
-from database import search_podcasts, search_episodes
-from api.schemas import PodcastResponse, EpisodeResponse, SearchResultResponse
+from database import episode_list_fields, search_podcasts, search_episodes
+from api.responses import FastJSONResponse, project_rows
+from api.schemas import EPISODE_FIELDS_DESCRIPTION, PodcastResponse, EpisodeResponse, SearchResultResponse
 
 router = APIRouter()
 
@@ -13,13 +14,18 @@ def search(
     podcast_uuid: str | None = Query(None),
     playing_status: str | None = Query(None, description="1=not played, 2=in progress, 3=completed, played=both 2 and 3"),
     limit: int = Query(20, ge=1, le=100),
+    fields: str | None = Query("summary", description=EPISODE_FIELDS_DESCRIPTION),
 ):
     """Unified search across podcasts and episodes."""
     podcasts = search_podcasts(q=q, limit=limit)
-    episodes = search_episodes(
-        q=q, podcast_uuid=podcast_uuid, playing_status=playing_status, limit=limit, offset=0
-    )
-    return SearchResultResponse(
-        podcasts=[PodcastResponse(**dict(row)) for row in podcasts],
-        episodes=[EpisodeResponse(**dict(row)) for row in episodes],
-    )
+    try:
+        names = episode_list_fields(fields)
+        episodes = search_episodes(
+            q=q, podcast_uuid=podcast_uuid, playing_status=playing_status, limit=limit, offset=0, fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({
+        "podcasts": [PodcastResponse(**dict(row)).model_dump(mode="json") for row in podcasts],
+        "episodes": project_rows(episodes, EpisodeResponse, names),
+    })
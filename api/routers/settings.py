@@ -1,23 +1,67 @@
 """Settings API endpoints (e.g. OPML import, duplicate cleanup)."""
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from dataclasses import asdict
+from typing import List, Literal
 
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from database import ms_to_iso, now_ms
 from api.schemas import (
+    FeedUrlEnrichmentResponse,
     OPMLImportResponse,
     RemoveDuplicatesResponse,
     MergeDuplicateEpisodesResponse,
+    NearDuplicateEpisodesResponse,
 )
 from api.services.opml_import import import_opml
+from api.services.opml_export import DEFAULT_OPML_STATUSES, iter_opml_export
+from api.services.feed_url_enrichment import DEFAULT_FUZZY_MIN_SCORE, enrich_feed_urls
+from api.utils.opml_parser import OPMLError
 from api.services.duplicate_cleanup import remove_duplicate_podcasts
 from api.services.duplicate_episode_merge import merge_duplicate_episodes
+from api.services.near_duplicate_episodes import DEFAULT_SIMILARITY, find_near_duplicate_episodes
 
 router = APIRouter()
 
 
 @router.post("/opml/import", response_model=OPMLImportResponse)
-async def opml_import(file: UploadFile = File(..., description="OPML file")):
+async def opml_import(
+    file: UploadFile = File(..., description="OPML file"),
+    dry_run: bool = Query(False, description="Only count feeds that would be added or matched; no RSS fetches, no writes"),
+):
     """
     Upload an OPML file to import podcast subscriptions.
-    Parses the file, finds missing podcasts, and enriches metadata from RSS feeds.
+    Parses the file, finds missing podcasts, and enriches metadata from RSS feeds
+    (fetched concurrently; podcasts with complete metadata are not fetched).
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided.")
+    lower = file.filename.lower()
+    if not (lower.endswith(".opml") or lower.endswith(".xml")):
+        raise HTTPException(
+            status_code=400,
+            detail="Only .opml or .xml files are accepted.",
+        )
+    if file.size == 0:
+        raise HTTPException(status_code=400, detail="File is empty.")
+    # The upload is parsed straight from its spooled file; parsing, fetches and writes block,
+    # so keep them off the event loop
+    report = await run_in_threadpool(import_opml, file.file, dry_run=dry_run)
+    return OPMLImportResponse(**asdict(report))
+
+
+@router.post("/opml/enrich-feeds", response_model=FeedUrlEnrichmentResponse)
+async def opml_enrich_feeds(
+    file: UploadFile = File(..., description="OPML file"),
+    dry_run: bool = Query(False, description="Only report matches; no writes"),
+    fuzzy: bool = Query(True, description="Fall back to ranked fuzzy title matching when no title matches exactly"),
+    min_score: float = Query(DEFAULT_FUZZY_MIN_SCORE, ge=0.0, le=1.0, description="Minimum fuzzy match score"),
+):
+    """
+    Upload an OPML file to set feed URLs of existing podcasts (e.g. after a Pocket Casts import,
+    which stores website URLs). Entries are matched to podcasts by title and all updates are
+    applied in one transaction; the response lists the match for every entry.
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided.")
@@ -27,30 +71,45 @@ async def opml_import(file: UploadFile = File(..., description="OPML file")):
             status_code=400,
             detail="Only .opml or .xml files are accepted.",
         )
-    content = await file.read()
-    if not content:
+    if file.size == 0:
         raise HTTPException(status_code=400, detail="File is empty.")
-    report = import_opml(content)
-    return OPMLImportResponse(
-        podcasts_found=report.podcasts_found,
-        podcasts_added=report.podcasts_added,
-        podcasts_updated=report.podcasts_updated,
-        metadata_enriched=report.metadata_enriched,
-        errors=report.errors,
+    try:
+        report = await run_in_threadpool(
+            enrich_feed_urls, file.file, dry_run=dry_run, fuzzy=fuzzy, min_score=min_score
+        )
+    except OPMLError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FeedUrlEnrichmentResponse(**asdict(report))
+
+
+@router.get("/opml/export")
+def opml_export(
+    status: List[Literal["active", "archived", "ended"]] = Query(
+        list(DEFAULT_OPML_STATUSES), description="Podcasts to include; repeat for several (active, archived, ended)"
+    ),
+):
+    """
+    Download subscriptions as OPML (podcasts with a feed URL), streamed from the database so
+    memory stays flat. The file can be imported again through /opml/import.
+    """
+    stamp = ms_to_iso(now_ms())[:10]
+    return StreamingResponse(
+        iter_opml_export(status),
+        media_type="text/x-opml; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="audiophile-subscriptions-{stamp}.opml"'},
     )
 
 
 @router.post("/podcasts/remove-duplicates", response_model=RemoveDuplicatesResponse)
-def remove_duplicates():
+def remove_duplicates(
+    dry_run: bool = Query(False, description="Only list the podcasts that would be deleted; no writes"),
+):
     """
     Remove duplicate podcasts: for each feed URL, keep the podcast that has episodes,
     delete the ones with 0 episodes (e.g. created by OPML import).
     """
-    report = remove_duplicate_podcasts()
-    return RemoveDuplicatesResponse(
-        deleted_count=report.deleted_count,
-        deleted_titles=report.deleted_titles,
-    )
+    report = remove_duplicate_podcasts(dry_run=dry_run)
+    return RemoveDuplicatesResponse(**asdict(report))
 
 
 @router.post("/episodes/merge-duplicates", response_model=MergeDuplicateEpisodesResponse)
@@ -65,3 +124,22 @@ def merge_duplicate_episodes_endpoint():
         duplicate_groups=report.duplicate_groups,
         episodes_removed=report.episodes_removed,
     )
+
+
+@router.get("/episodes/near-duplicates", response_model=NearDuplicateEpisodesResponse)
+def near_duplicate_episodes(
+    threshold: float = Query(DEFAULT_SIMILARITY, ge=0.5, le=1.0, description="Minimum title shingle similarity"),
+):
+    """
+    Candidate groups of near-duplicate episodes for review: same podcast, similar titles
+    ("Ep 123: Foo" / "123 - Foo"), and close published_date or duration. Nothing is changed.
+    """
+    return NearDuplicateEpisodesResponse(**asdict(find_near_duplicate_episodes(threshold=threshold)))
+
+
+@router.post("/episodes/near-duplicates/merge", response_model=NearDuplicateEpisodesResponse)
+def merge_near_duplicate_episodes(
+    threshold: float = Query(DEFAULT_SIMILARITY, ge=0.5, le=1.0, description="Minimum title shingle similarity"),
+):
+    """Merge every near-duplicate group into its canonical episode, as merge-duplicates does for exact matches."""
+    return NearDuplicateEpisodesResponse(**asdict(find_near_duplicate_episodes(threshold=threshold, merge=True)))
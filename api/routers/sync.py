@@ -1,15 +1,26 @@
-"""Sync API endpoints: trigger sync from default path or upload, and view sync status/history."""
+"""Sync API endpoints: trigger or dry-run sync from default path or upload, and view sync status/history."""
+import shutil
 import tempfile
+from contextlib import contextmanager
+from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from fastapi import APIRouter, File, HTTPException, UploadFile, Query
 
 from config import get_db_path, get_source_db_path
 from database import get_last_sync_timestamp, get_sync_history
-from import_pocketcasts import import_from_pocketcasts_db, extract_db_from_zip
+from import_pocketcasts import (
+    COPY_CHUNK_BYTES,
+    SyncReport,
+    TargetSchemaOutdatedError,
+    diff_pocketcasts_db,
+    extract_db_from_zip,
+    import_from_pocketcasts_db,
+)
 
 from api.schemas import (
+    SyncDiffResponse,
     SyncReportResponse,
     SyncStatusResponse,
     SyncHistoryEntryResponse,
@@ -18,69 +29,96 @@ from api.schemas import (
 router = APIRouter()
 
 
-@router.post("/sync", response_model=SyncReportResponse)
-def trigger_sync():
-    """
-    Trigger sync from the default Pocket Casts export path.
-    Fails with 404 if the source database does not exist.
-    """
+def _report_response(report: SyncReport) -> SyncReportResponse:
+    return SyncReportResponse(**asdict(report))
+
+
+def _diff_response(source: Path, source_path_for_report: Optional[str]) -> SyncDiffResponse:
+    """Dry-run diff against the configured database; 409 if that database still needs migrating."""
+    try:
+        diff = diff_pocketcasts_db(source, target_db=get_db_path(), source_path_for_report=source_path_for_report)
+    except TargetSchemaOutdatedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return SyncDiffResponse(**asdict(diff))
+
+
+def _default_source() -> Path:
+    """Default Pocket Casts export path; 404 if the source database does not exist."""
     source = get_source_db_path()
     if not source.exists():
         raise HTTPException(
             status_code=404,
             detail=f"Source database not found at {source}. Export from Pocket Casts or set POCKETCASTS_SOURCE_DB_PATH.",
         )
-    target = get_db_path()
+    return source
+
+
+@contextmanager
+def _uploaded_export(file: UploadFile) -> Iterator[Path]:
+    """
+    Yield the Pocket Casts database extracted from an uploaded export ZIP. The upload is copied to a
+    per-request temporary directory in chunks and only the database member is extracted, so the
+    archive is never held in memory. Everything is removed on exit.
+    """
+    if not file.filename or not file.filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Only .zip export files are accepted.")
+    with tempfile.TemporaryDirectory(prefix="pocketcasts_upload_") as tmpdir:
+        # Fixed name: the client-supplied filename is only used for the report
+        path = Path(tmpdir) / "export.zip"
+        with open(path, "wb") as out:
+            shutil.copyfileobj(file.file, out, COPY_CHUNK_BYTES)
+        db_path = extract_db_from_zip(str(path), extract_dir=tmpdir)
+        if not db_path:
+            raise HTTPException(status_code=400, detail="No database found in ZIP.")
+        yield db_path
+
+
+@router.post("/sync", response_model=SyncReportResponse)
+def trigger_sync():
+    """
+    Trigger sync from the default Pocket Casts export path.
+    Fails with 404 if the source database does not exist.
+    """
+    source = _default_source()
     report = import_from_pocketcasts_db(
         source,
-        target_db=target,
+        target_db=get_db_path(),
         source_path_for_report=str(source),
     )
-    return SyncReportResponse(
-        sync_timestamp=report.sync_timestamp,
-        source_path=report.source_path,
-        podcasts_added=report.podcasts_added,
-        podcasts_updated=report.podcasts_updated,
-        podcasts_deleted=report.podcasts_deleted,
-        episodes_added=report.episodes_added,
-        episodes_updated=report.episodes_updated,
-        episodes_deleted=report.episodes_deleted,
-        conflicts_count=report.conflicts_count,
-    )
+    return _report_response(report)
+
+
+@router.post("/sync/dry-run", response_model=SyncDiffResponse)
+def dry_run_sync():
+    """
+    Report what POST /sync would change (adds, per-field updates, deletes, history merges)
+    without writing. Fails with 404 if the source database does not exist, and with 409 if the
+    local database has not been migrated to the current schema yet.
+    """
+    source = _default_source()
+    return _diff_response(source, str(source))
 
 
 @router.post("/sync/upload", response_model=SyncReportResponse)
-async def sync_from_upload(file: UploadFile = File(..., description="Pocket Casts export ZIP file")):
+def sync_from_upload(file: UploadFile = File(..., description="Pocket Casts export ZIP file")):
     """
     Upload a Pocket Casts export ZIP and run sync.
     Accepts only ZIP files.
     """
-    if not file.filename or not file.filename.lower().endswith(".zip"):
-        raise HTTPException(status_code=400, detail="Only .zip export files are accepted.")
-    target = get_db_path()
-    with tempfile.TemporaryDirectory() as tmpdir:
-        path = Path(tmpdir) / (file.filename or "export.zip")
-        content = await file.read()
-        path.write_bytes(content)
-        db_path = extract_db_from_zip(str(path), extract_dir=tmpdir)
-        if not db_path:
-            raise HTTPException(status_code=400, detail="No database found in ZIP.")
+    with _uploaded_export(file) as db_path:
         report = import_from_pocketcasts_db(
-            Path(db_path),
-            target_db=target,
+            db_path,
+            target_db=get_db_path(),
             source_path_for_report=file.filename,
         )
-    return SyncReportResponse(
-        sync_timestamp=report.sync_timestamp,
-        source_path=report.source_path,
-        podcasts_added=report.podcasts_added,
-        podcasts_updated=report.podcasts_updated,
-        podcasts_deleted=report.podcasts_deleted,
-        episodes_added=report.episodes_added,
-        episodes_updated=report.episodes_updated,
-        episodes_deleted=report.episodes_deleted,
-        conflicts_count=report.conflicts_count,
-    )
+    return _report_response(report)
+
+
+@router.post("/sync/upload/dry-run", response_model=SyncDiffResponse)
+def dry_run_upload(file: UploadFile = File(..., description="Pocket Casts export ZIP file")):
+    """Report what POST /sync/upload would change for this export without writing."""
+    with _uploaded_export(file) as db_path:
+        return _diff_response(db_path, file.filename)
 
 
 @router.get("/sync/status", response_model=SyncStatusResponse)
@@ -1,7 +1,13 @@
 """Pydantic models for API request/response validation."""
 from __future__ import annotations
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Annotated, Dict, Optional, List
+from pydantic import BaseModel, BeforeValidator
+
+from database import ms_to_iso
+
+# Timestamps are stored as epoch milliseconds and returned as ISO 8601 UTC strings
+Timestamp = Annotated[str, BeforeValidator(ms_to_iso)]
+OptionalTimestamp = Annotated[Optional[str], BeforeValidator(ms_to_iso)]
 
 
 class PodcastResponse(BaseModel):
@@ -10,33 +16,45 @@ class PodcastResponse(BaseModel):
     title: Optional[str] = None
     author: Optional[str] = None
     description: Optional[str] = None
+    description_text: Optional[str] = None
+    summary_snippet: Optional[str] = None
     feed_url: Optional[str] = None
     website_url: Optional[str] = None
     image_url: Optional[str] = None
-    deleted_at: Optional[str] = None
+    deleted_at: OptionalTimestamp = None
     is_ended: Optional[bool] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: OptionalTimestamp = None
+    updated_at: OptionalTimestamp = None
     episode_count: Optional[int] = None
 
     class Config:
         from_attributes = True
 
 
+# Shared description for the fields= query parameter on episode list endpoints
+EPISODE_FIELDS_DESCRIPTION = (
+    "summary (default; summary_snippet instead of description/description_text), full, or comma-separated field names. "
+    "Only the selected fields are returned; the others are left out of each item. "
+    "Full descriptions are always returned by GET /api/episodes/{uuid}."
+)
+
+
 class EpisodeResponse(BaseModel):
     id: Optional[int] = None
     uuid: str
     podcast_uuid: str
     title: Optional[str] = None
     description: Optional[str] = None
+    description_text: Optional[str] = None
+    summary_snippet: Optional[str] = None
     duration: Optional[float] = None
     published_date: Optional[float] = None
     file_url: Optional[str] = None
     file_type: Optional[str] = None
     size_bytes: Optional[int] = None
     video_url: Optional[str] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: OptionalTimestamp = None
+    updated_at: OptionalTimestamp = None
     podcast_title: Optional[str] = None
     podcast_author: Optional[str] = None
     podcast_image_url: Optional[str] = None
@@ -44,8 +62,8 @@ class EpisodeResponse(BaseModel):
     playing_status: Optional[int] = None
     episode_status: Optional[int] = None
     completion_percentage: Optional[float] = None
-    first_played_at: Optional[str] = None
-    last_played_at: Optional[str] = None
+    first_played_at: OptionalTimestamp = None
+    last_played_at: OptionalTimestamp = None
     play_count: Optional[int] = None
 
     class Config:
@@ -67,11 +85,11 @@ class ListeningHistoryResponse(BaseModel):
     playing_status: int = 0
     episode_status: Optional[int] = None
     completion_percentage: Optional[float] = None
-    first_played_at: Optional[str] = None
-    last_played_at: Optional[str] = None
+    first_played_at: OptionalTimestamp = None
+    last_played_at: OptionalTimestamp = None
     play_count: int = 1
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: OptionalTimestamp = None
+    updated_at: OptionalTimestamp = None
 
     class Config:
         from_attributes = True
@@ -80,8 +98,8 @@ class ListeningHistoryResponse(BaseModel):
 class PlaySessionResponse(BaseModel):
     id: Optional[int] = None
     episode_uuid: str
-    started_at: str
-    ended_at: Optional[str] = None
+    started_at: Timestamp
+    ended_at: OptionalTimestamp = None
     duration_seconds: Optional[float] = None
     played_from: float = 0
     played_to: float = 0
@@ -112,21 +130,42 @@ class SearchResultResponse(BaseModel):
 
 
 class SyncReportResponse(BaseModel):
-    """Response after a sync run."""
-    sync_timestamp: str
+    """Response after a sync run. *_updated rows changed since the last sync; *_unchanged were skipped."""
+    sync_timestamp: Timestamp
     source_path: Optional[str] = None
     podcasts_added: int = 0
     podcasts_updated: int = 0
     podcasts_deleted: int = 0
+    podcasts_unchanged: int = 0
     episodes_added: int = 0
     episodes_updated: int = 0
     episodes_deleted: int = 0
+    episodes_unchanged: int = 0
     conflicts_count: int = 0
 
 
+class SyncDiffResponse(BaseModel):
+    """Dry-run change set: what a sync would add, change, delete and merge. Nothing is written."""
+    source_path: Optional[str] = None
+    incremental: bool = True
+    podcasts_added: int = 0
+    podcasts_updated: int = 0
+    podcasts_deleted: int = 0
+    podcasts_unchanged: int = 0
+    podcast_fields: Dict[str, int] = {}
+    episodes_added: int = 0
+    episodes_updated: int = 0
+    episodes_deleted: int = 0
+    episodes_unchanged: int = 0
+    episode_fields: Dict[str, int] = {}
+    history_added: int = 0
+    conflicts_count: int = 0
+    history_fields: Dict[str, int] = {}
+
+
 class SyncStatusResponse(BaseModel):
     """Last sync timestamp and optional latest report summary."""
-    last_sync_timestamp: Optional[str] = None
+    last_sync_timestamp: OptionalTimestamp = None
     last_sync_source_path: Optional[str] = None
     last_sync_podcasts_added: Optional[int] = None
     last_sync_episodes_added: Optional[int] = None
@@ -135,16 +174,18 @@ class SyncStatusResponse(BaseModel):
 class SyncHistoryEntryResponse(BaseModel):
     """Single sync history record."""
     id: Optional[int] = None
-    sync_timestamp: str
+    sync_timestamp: Timestamp
     source_path: Optional[str] = None
     podcasts_added: int = 0
     podcasts_updated: int = 0
     podcasts_deleted: int = 0
+    podcasts_unchanged: int = 0
     episodes_added: int = 0
     episodes_updated: int = 0
     episodes_deleted: int = 0
+    episodes_unchanged: int = 0
     conflicts_count: int = 0
-    created_at: Optional[str] = None
+    created_at: OptionalTimestamp = None
 
     class Config:
         from_attributes = True
@@ -156,9 +197,43 @@ class OPMLImportResponse(BaseModel):
     podcasts_added: int = 0
     podcasts_updated: int = 0
     metadata_enriched: int = 0
+    fetches_skipped: int = 0
+    elapsed_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+    db_seconds: float = 0.0
     errors: List[str] = []
 
 
+class FeedUrlCandidateResponse(BaseModel):
+    """Podcast an OPML title was scored against."""
+    uuid: str
+    title: str
+    score: float
+
+
+class FeedUrlMatchResponse(BaseModel):
+    """Match outcome for one OPML entry: exact, fuzzy, ambiguous or unmatched."""
+    opml_title: Optional[str] = None
+    feed_url: str
+    status: str
+    podcast_uuid: Optional[str] = None
+    podcast_title: Optional[str] = None
+    score: Optional[float] = None
+    candidates: List[FeedUrlCandidateResponse] = []
+
+
+class FeedUrlEnrichmentResponse(BaseModel):
+    """Response after setting feed URLs from OPML (or, with dry_run, the matches that would be applied)."""
+    entries: int = 0
+    updated: int = 0
+    exact: int = 0
+    fuzzy: int = 0
+    ambiguous: int = 0
+    unmatched: int = 0
+    dry_run: bool = False
+    matches: List[FeedUrlMatchResponse] = []
+
+
 class RefreshMetadataResponse(BaseModel):
     """Response after refreshing podcast metadata from RSS."""
     podcasts_refreshed: int = 0
@@ -166,10 +241,20 @@ class RefreshMetadataResponse(BaseModel):
     errors: List[str] = []
 
 
+class DuplicatePodcastResponse(BaseModel):
+    """A 0-episode duplicate podcast and the podcast with episodes that is kept instead."""
+    uuid: str
+    title: str
+    reason: str
+    kept_uuid: str
+
+
 class RemoveDuplicatesResponse(BaseModel):
-    """Response after removing duplicate podcasts."""
+    """Response after removing duplicate podcasts (or, with dry_run, the planned deletions)."""
     deleted_count: int = 0
     deleted_titles: List[str] = []
+    duplicates: List[DuplicatePodcastResponse] = []
+    dry_run: bool = False
 
 
 class MergeDuplicateEpisodesResponse(BaseModel):
@@ -179,11 +264,41 @@ class MergeDuplicateEpisodesResponse(BaseModel):
     episodes_removed: int = 0
 
 
+class NearDuplicateEpisode(BaseModel):
+    """Member of a near-duplicate group."""
+    uuid: str
+    title: Optional[str] = None
+    published_date: Optional[float] = None
+    duration: Optional[float] = None
+
+
+class NearDuplicateEpisodeGroup(BaseModel):
+    """Candidate group of near-duplicate episodes (similar titles, close date or duration)."""
+    podcast_uuid: str
+    canonical_uuid: str
+    similarity: float
+    episodes: List[NearDuplicateEpisode] = []
+
+
+class NearDuplicateEpisodesResponse(BaseModel):
+    """Near-duplicate episode scan; episodes_removed is set when the groups were merged."""
+    podcasts_scanned: int = 0
+    episodes_scanned: int = 0
+    candidate_pairs: int = 0
+    groups: List[NearDuplicateEpisodeGroup] = []
+    episodes_removed: int = 0
+
+
 class PodcastSubscribeRequest(BaseModel):
     """Request body for subscribing to a podcast feed."""
     feed_url: str
 
 
+class BulkSubscribeRequest(BaseModel):
+    """Request body for subscribing to many podcast feeds at once."""
+    feed_urls: List[str]
+
+
 class PodcastUpdateRequest(BaseModel):
     """Request body for updating podcast metadata."""
     title: Optional[str] = None
@@ -201,3 +316,14 @@ class FeedRefreshResponse(BaseModel):
     episodes_added: int = 0
     episodes_updated: int = 0
     errors: List[str] = []
+
+
+class SlowQueryResponse(BaseModel):
+    """Aggregated timings for one normalized SQL statement."""
+    fingerprint: str
+    count: int = 0
+    slow_count: int = 0
+    total_ms: float = 0
+    mean_ms: float = 0
+    max_ms: float = 0
+    rows: int = 0
@@ -1,89 +1,113 @@
 """Remove duplicate podcasts: keep the one with episodes, delete 0-episode duplicates."""
-import re
-from collections import defaultdict
+import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Collection
 
 from config import get_db_path
-from database import get_connection, delete_podcast
-from api.services.opml_import import _canonical_feed_url
+from database import get_connection
+
+
+@dataclass
+class DuplicatePodcast:
+    """A 0-episode podcast selected for deletion, and the podcast with episodes it duplicates."""
+    uuid: str
+    title: str
+    reason: str  # "feed_url" or "title"
+    kept_uuid: str
 
 
 @dataclass
 class DuplicateCleanupReport:
-    """Result of duplicate podcast cleanup."""
+    """Result of duplicate podcast cleanup. With dry_run, the counts are what would be deleted."""
     deleted_count: int = 0
     deleted_titles: List[str] = field(default_factory=list)
+    duplicates: List[DuplicatePodcast] = field(default_factory=list)
+    dry_run: bool = False
 
 
-def _normalized_title(title: Optional[str]) -> str:
-    """Normalize title for matching: strip, lowercase, collapse whitespace."""
-    if not title or not isinstance(title, str):
-        return ""
-    s = title.strip().lower()
-    s = re.sub(r"\s+", " ", s)
-    return s
+# Both passes in one statement over the indexed feed_url_canonical / title_norm keys.
+# Pass 1: in each canonical feed URL group with episodes, every 0-episode podcast goes.
+# Pass 2: a remaining 0-episode podcast goes when exactly one podcast with its title_norm has episodes.
+# :scope (JSON array of uuids, or NULL for all) keeps only sets containing one of those podcasts.
+# has_episodes counts soft-deleted episodes too: their rows still reference the podcast, so a
+# podcast with any episode row can never be deleted (episodes.podcast_uuid is a foreign key).
+_PLAN_DELETIONS = """
+WITH p AS MATERIALIZED (
+    SELECT uuid, title, title_norm, feed_url_canonical,
+           EXISTS (SELECT 1 FROM episodes e WHERE e.podcast_uuid = podcasts.uuid) AS has_episodes,
+           :scope IS NULL OR uuid IN (SELECT value FROM json_each(:scope)) AS in_scope
+    FROM podcasts
+    WHERE deleted_at IS NULL
+),
+by_feed AS (
+    SELECT uuid, title, has_episodes,
+           MAX(has_episodes) OVER w AS feed_has_episodes,
+           MAX(in_scope) OVER w AS feed_in_scope,
+           MAX(IIF(has_episodes, uuid, NULL)) OVER w AS kept_uuid
+    FROM p
+    WHERE feed_url_canonical IS NOT NULL AND feed_url_canonical != ''
+    WINDOW w AS (PARTITION BY feed_url_canonical)
+),
+feed_duplicates AS (
+    SELECT uuid, title, 'feed_url' AS reason, kept_uuid, 1 AS pass
+    FROM by_feed
+    WHERE has_episodes = 0 AND feed_has_episodes = 1 AND feed_in_scope
+),
+by_title AS (
+    SELECT uuid, title, has_episodes, in_scope,
+           SUM(has_episodes) OVER t AS with_episodes,
+           MAX(IIF(has_episodes, uuid, NULL)) OVER t AS kept_uuid,
+           MAX(IIF(has_episodes, in_scope, 0)) OVER t AS kept_in_scope
+    FROM p
+    WHERE title_norm IS NOT NULL AND title_norm != ''
+      AND uuid NOT IN (SELECT uuid FROM feed_duplicates)
+    WINDOW t AS (PARTITION BY title_norm)
+)
+SELECT uuid, title, reason, kept_uuid, pass FROM feed_duplicates
+UNION ALL
+SELECT uuid, title, 'title', kept_uuid, 2
+FROM by_title
+WHERE has_episodes = 0 AND with_episodes = 1 AND (in_scope OR kept_in_scope)
+ORDER BY pass, title, uuid
+"""
 
 
-def remove_duplicate_podcasts(db_path: Optional[Path] = None) -> DuplicateCleanupReport:
+def remove_duplicate_podcasts(
+    db_path: Optional[Path] = None,
+    podcast_uuids: Optional[Collection[str]] = None,
+    dry_run: bool = False,
+) -> DuplicateCleanupReport:
     """
-    Find duplicates by canonical feed_url (Pass 1) or normalized title (Pass 2).
-    Keep the one with episodes, delete the ones with 0 episodes.
+    Find duplicates by canonical feed_url (Pass 1) or normalized title (Pass 2), using the stored
+    feed_url_canonical / title_norm keys.
+    Keep the one with episodes, delete the ones with 0 episodes (soft-deleted episodes count, as
+    they still reference the podcast); planning and deletion run in one transaction.
+    podcast_uuids limits the cleanup to duplicate sets containing one of those podcasts; None checks all.
+    With dry_run, return the planned deletions without applying them.
     """
     db_path = db_path or get_db_path()
-    report = DuplicateCleanupReport()
-    deleted_uuids: Set[str] = set()
-
-    # Load all non-deleted podcasts (with or without feed_url)
+    report = DuplicateCleanupReport(dry_run=dry_run)
+    if podcast_uuids is not None and not podcast_uuids:
+        return report
+    scope = json.dumps(list(podcast_uuids)) if podcast_uuids is not None else None
     with get_connection(db_path) as conn:
-        cur = conn.execute(
-            """SELECT p.uuid, p.title, p.feed_url,
-                      (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND e.deleted_at IS NULL) AS episode_count
-               FROM podcasts p
-               WHERE p.deleted_at IS NULL"""
-        )
-        rows = [dict(row) for row in cur.fetchall()]
-
-    # Pass 1: Group by canonical feed_url (skip empty). Delete 0-episode when same URL has episodes.
-    by_canonical: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for row in rows:
-        canonical = _canonical_feed_url(row.get("feed_url") or "")
-        if not canonical:
-            continue
-        by_canonical[canonical].append(row)
-
-    with get_connection(db_path) as conn:
-        for _canonical, group in by_canonical.items():
-            with_episodes = [r for r in group if (r.get("episode_count") or 0) > 0]
-            without_episodes = [r for r in group if (r.get("episode_count") or 0) == 0]
-            if not with_episodes or not without_episodes:
-                continue
-            for row in without_episodes:
-                delete_podcast(row["uuid"], conn=conn)
-                report.deleted_count += 1
-                report.deleted_titles.append((row.get("title") or "").strip() or "Unknown")
-                deleted_uuids.add(row["uuid"])
-
-    # Pass 2: Among remaining 0-episode podcasts, match by normalized title; delete if exactly one sibling has episodes.
-    remaining_zero = [r for r in rows if (r.get("episode_count") or 0) == 0 and r["uuid"] not in deleted_uuids]
-    with_episodes_by_title: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for r in rows:
-        if (r.get("episode_count") or 0) > 0 and r["uuid"] not in deleted_uuids:
-            norm = _normalized_title(r.get("title"))
-            if norm:
-                with_episodes_by_title[norm].append(r)
-
-    with get_connection(db_path) as conn:
-        for row in remaining_zero:
-            norm = _normalized_title(row.get("title"))
-            if not norm:
-                continue
-            siblings = with_episodes_by_title.get(norm, [])
-            if len(siblings) != 1:
-                continue
-            delete_podcast(row["uuid"], conn=conn)
-            report.deleted_count += 1
-            report.deleted_titles.append((row.get("title") or "").strip() or "Unknown")
-
+        if not dry_run:
+            conn.execute("BEGIN IMMEDIATE")  # plan and delete under one write lock
+        for row in conn.execute(_PLAN_DELETIONS, {"scope": scope}):
+            report.duplicates.append(
+                DuplicatePodcast(
+                    uuid=row["uuid"],
+                    title=(row["title"] or "").strip() or "Unknown",
+                    reason=row["reason"],
+                    kept_uuid=row["kept_uuid"],
+                )
+            )
+        report.deleted_count = len(report.duplicates)
+        report.deleted_titles = [d.title for d in report.duplicates]
+        if report.duplicates and not dry_run:
+            conn.execute(
+                "DELETE FROM podcasts WHERE uuid IN (SELECT value FROM json_each(?))",
+                (json.dumps([d.uuid for d in report.duplicates]),),
+            )
     return report
@@ -1,17 +1,17 @@
 """Merge duplicate episodes: same podcast, normalized title, same/close published_date. Preserve listening history."""
+import json
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Collection, Dict, List, Optional, Tuple
 
 from config import get_db_path
-from database import get_connection
+from database import get_connection, now_ms, prune_episode_descriptions
 
 from api.services.episode_identity import (
     PUBLISHED_DATE_TOLERANCE_SEC,
-    _normalized_title,
     _published_date_close,
+    _title_norm,
 )
 
 
@@ -36,7 +36,7 @@ def _group_duplicate_episodes(episodes: List[Dict[str, Any]]) -> List[List[Dict[
     tolerance = PUBLISHED_DATE_TOLERANCE_SEC
     key_to_eps: Dict[Tuple[str, Optional[float]], List[Dict[str, Any]]] = defaultdict(list)
     for ep in episodes:
-        norm = _normalized_title(ep.get("title"))
+        norm = _title_norm(ep)
         pub = ep.get("published_date")
         if pub is not None:
             base_ts = int(pub // tolerance) * tolerance
@@ -62,114 +62,133 @@ def _group_duplicate_episodes(episodes: List[Dict[str, Any]]) -> List[List[Dict[
     return groups
 
 
-def _pick_canonical(group: List[Dict[str, Any]], conn: Any) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+def _pick_canonical(group: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Pick canonical episode: one with listening_history (or most play progress), else oldest created_at.
+    Episodes carry has_history / played_up_to / play_count from the grouping query.
     Returns (canonical_episode, list_of_duplicates).
     """
-    uuids = [e["uuid"] for e in group]
-    placeholders = ",".join("?" * len(uuids))
-    cur = conn.execute(
-        f"""SELECT episode_uuid, played_up_to, play_count, first_played_at, last_played_at
-           FROM listening_history WHERE episode_uuid IN ({placeholders})""",
-        uuids,
-    )
-    lh_rows = {r["episode_uuid"]: dict(r) for r in cur.fetchall()}
     # Prefer episode that has listening history with max played_up_to or play_count
-    with_lh = [e for e in group if e["uuid"] in lh_rows]
+    with_lh = [e for e in group if e["has_history"]]
     if with_lh:
-        def score(e: Dict[str, Any]) -> Tuple[float, int, str]:
-            r = lh_rows.get(e["uuid"]) or {}
+        def score(e: Dict[str, Any]) -> Tuple[float, int, int]:
             return (
-                float(r.get("played_up_to") or 0),
-                int(r.get("play_count") or 0),
-                (e.get("created_at") or ""),
+                float(e.get("played_up_to") or 0),
+                int(e.get("play_count") or 0),
+                (e.get("created_at") or 0),
             )
         canonical = max(with_lh, key=score)
     else:
-        canonical = min(group, key=lambda e: (e.get("created_at") or "", e.get("uuid") or ""))
+        canonical = min(group, key=lambda e: (e.get("created_at") or 0, e.get("uuid") or ""))
     duplicates = [e for e in group if e["uuid"] != canonical["uuid"]]
     return canonical, duplicates
 
 
-def _merge_listening_history(
-    conn: Any,
-    canonical_uuid: str,
-    duplicate_uuid: str,
-) -> None:
+# duplicate uuid -> canonical uuid for one merge run (temp schema, gone when the connection closes)
+_CREATE_MERGE_MAP = """
+CREATE TEMP TABLE IF NOT EXISTS episode_merge_map (
+    duplicate_uuid TEXT PRIMARY KEY,
+    canonical_uuid TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+# Fold every duplicate's history row into the canonical row: max played_up_to, summed play_count,
+# earliest first_played_at, latest last_played_at. The canonical episode always has a row when
+# any duplicate does (_pick_canonical prefers episodes with history), so there is nothing to move.
+_MERGE_HISTORY = """
+WITH dup AS (
+    SELECT m.canonical_uuid,
+           MAX(h.played_up_to) AS played_up_to,
+           SUM(h.play_count) AS play_count,
+           MIN(h.first_played_at) AS first_played_at,
+           MAX(h.last_played_at) AS last_played_at,
+           MAX(h.duration) AS duration
+    FROM temp.episode_merge_map m
+    JOIN listening_history h ON h.episode_uuid = m.duplicate_uuid
+    GROUP BY m.canonical_uuid
+)
+UPDATE listening_history SET
+    played_up_to = MAX(listening_history.played_up_to, dup.played_up_to),
+    play_count = listening_history.play_count + dup.play_count,
+    first_played_at = COALESCE(MIN(listening_history.first_played_at, dup.first_played_at),
+                               listening_history.first_played_at, dup.first_played_at),
+    last_played_at = COALESCE(MAX(listening_history.last_played_at, dup.last_played_at),
+                              listening_history.last_played_at, dup.last_played_at),
+    completion_percentage = IIF(
+        COALESCE(NULLIF(listening_history.duration, 0), dup.duration) > 0,
+        MAX(listening_history.played_up_to, dup.played_up_to)
+            / COALESCE(NULLIF(listening_history.duration, 0), dup.duration) * 100.0,
+        NULL
+    ),
+    updated_at = ?
+FROM dup
+WHERE listening_history.episode_uuid = dup.canonical_uuid
+"""
+
+
+def apply_episode_merges(conn: Any, merge_map: List[Tuple[str, str]]) -> int:
     """
-    Move or merge listening_history from duplicate to canonical.
-    If canonical has no row: UPDATE duplicate's row to canonical_uuid.
-    If both have rows: merge into canonical (max played_up_to, sum play_count, earliest first_played_at, latest last_played_at), then delete duplicate's row.
+    Merge each (duplicate_uuid, canonical_uuid) pair on conn with set-based statements: fold history
+    into the canonical row, move play_sessions, delete the duplicate episodes and orphaned
+    descriptions. Canonicals must come from _pick_canonical. Returns episode rows removed.
     """
-    now = datetime.utcnow().isoformat() + "Z"
-    cur = conn.execute(
-        "SELECT * FROM listening_history WHERE episode_uuid IN (?, ?)",
-        (canonical_uuid, duplicate_uuid),
+    conn.execute(_CREATE_MERGE_MAP)
+    conn.execute("DELETE FROM temp.episode_merge_map")
+    conn.executemany("INSERT INTO temp.episode_merge_map (duplicate_uuid, canonical_uuid) VALUES (?, ?)", merge_map)
+    conn.execute(_MERGE_HISTORY, (now_ms(),))
+    conn.execute(
+        "DELETE FROM listening_history WHERE episode_uuid IN (SELECT duplicate_uuid FROM temp.episode_merge_map)"
     )
-    rows = [dict(r) for r in cur.fetchall()]
-    by_ep = {r["episode_uuid"]: r for r in rows}
-    canon_row = by_ep.get(canonical_uuid)
-    dup_row = by_ep.get(duplicate_uuid)
-    if not dup_row:
-        return
-    if not canon_row:
-        conn.execute(
-            "UPDATE listening_history SET episode_uuid = ?, updated_at = ? WHERE episode_uuid = ?",
-            (canonical_uuid, now, duplicate_uuid),
-        )
-        return
-    # Merge: keep canonical row, update with max played_up_to, sum play_count, earliest first_played_at, latest last_played_at
-    max_played = max(float(canon_row.get("played_up_to") or 0), float(dup_row.get("played_up_to") or 0))
-    sum_play_count = int(canon_row.get("play_count") or 0) + int(dup_row.get("play_count") or 0)
-    first_played = min(
-        canon_row.get("first_played_at") or "",
-        dup_row.get("first_played_at") or "",
-    ) or (canon_row.get("first_played_at") or dup_row.get("first_played_at"))
-    last_played = max(
-        canon_row.get("last_played_at") or "",
-        dup_row.get("last_played_at") or "",
-    ) or (canon_row.get("last_played_at") or dup_row.get("last_played_at"))
-    duration = canon_row.get("duration") or dup_row.get("duration") or 0
-    completion = (max_played / duration * 100.0) if duration and duration > 0 else None
     conn.execute(
-        """UPDATE listening_history SET
-             played_up_to = ?, play_count = ?, first_played_at = ?, last_played_at = ?,
-             completion_percentage = ?, updated_at = ?
-           WHERE episode_uuid = ?""",
-        (max_played, sum_play_count, first_played, last_played, completion, now, canonical_uuid),
+        """UPDATE play_sessions SET episode_uuid = m.canonical_uuid
+           FROM temp.episode_merge_map m WHERE play_sessions.episode_uuid = m.duplicate_uuid"""
     )
-    conn.execute("DELETE FROM listening_history WHERE episode_uuid = ?", (duplicate_uuid,))
+    removed = conn.execute(
+        "DELETE FROM episodes WHERE uuid IN (SELECT duplicate_uuid FROM temp.episode_merge_map)"
+    ).rowcount
+    prune_episode_descriptions(conn=conn)
+    return removed
 
 
-def merge_duplicate_episodes(db_path: Optional[Path] = None) -> DuplicateEpisodeMergeReport:
+def merge_duplicate_episodes(
+    db_path: Optional[Path] = None,
+    podcast_uuids: Optional[Collection[str]] = None,
+) -> DuplicateEpisodeMergeReport:
     """
     Find duplicate episodes (same podcast, normalized title, same/close published_date).
     For each group: pick canonical, move/merge listening_history and play_sessions to canonical, delete duplicate episode rows.
+    podcast_uuids limits the scan to those podcasts (duplicates never span podcasts); None scans the library.
+
+    Groups and canonical choices come from one read of episodes joined to their history; the merge
+    is then applied with a handful of set-based statements over a temp duplicate -> canonical map,
+    all in one transaction.
     """
     db_path = db_path or get_db_path()
     report = DuplicateEpisodeMergeReport()
+    sql = """SELECT e.uuid, e.podcast_uuid, e.title, e.title_norm, e.published_date, e.file_url, e.created_at,
+                    lh.episode_uuid IS NOT NULL AS has_history, lh.played_up_to, lh.play_count
+             FROM episodes e
+             LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
+             WHERE e.deleted_at IS NULL"""
+    params: tuple = ()
+    if podcast_uuids is not None:
+        if not podcast_uuids:
+            return report
+        sql += " AND e.podcast_uuid IN (SELECT value FROM json_each(?))"
+        params = (json.dumps(list(podcast_uuids)),)
     with get_connection(db_path) as conn:
-        cur = conn.execute(
-            """SELECT uuid, podcast_uuid, title, published_date, file_url, created_at
-               FROM episodes WHERE deleted_at IS NULL"""
-        )
-        all_episodes = [dict(r) for r in cur.fetchall()]
-    by_podcast: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for ep in all_episodes:
-        by_podcast[ep["podcast_uuid"]].append(ep)
-    for podcast_uuid, episodes in by_podcast.items():
-        report.podcasts_processed += 1
-        groups = _group_duplicate_episodes(episodes)
-        for group in groups:
-            report.duplicate_groups += 1
-            with get_connection(db_path) as conn:
-                canonical, duplicates = _pick_canonical(group, conn)
-                canonical_uuid = canonical["uuid"]
-                for dup in duplicates:
-                    dup_uuid = dup["uuid"]
-                    _merge_listening_history(conn, canonical_uuid, dup_uuid)
-                    conn.execute("UPDATE play_sessions SET episode_uuid = ? WHERE episode_uuid = ?", (canonical_uuid, dup_uuid))
-                    conn.execute("DELETE FROM episodes WHERE uuid = ?", (dup_uuid,))
-                    report.episodes_removed += 1
+        cur = conn.execute(sql + " ORDER BY e.rowid", params)
+        by_podcast: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for r in cur:
+            by_podcast[r["podcast_uuid"]].append(dict(r))
+        merge_map: List[Tuple[str, str]] = []
+        for episodes in by_podcast.values():
+            report.podcasts_processed += 1
+            for group in _group_duplicate_episodes(episodes):
+                report.duplicate_groups += 1
+                canonical, duplicates = _pick_canonical(group)
+                merge_map.extend((dup["uuid"], canonical["uuid"]) for dup in duplicates)
+        if not merge_map:
+            return report
+        report.episodes_removed = apply_episode_merges(conn, merge_map)
     return report
@@ -0,0 +1,66 @@
+"""Incremental duplicate cleanup: only podcasts marked in dirty_podcasts since the last sweep are regrouped."""
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Collection, Dict, List, Optional
+
+from config import get_db_path
+from database import clear_dirty_podcasts, get_connection, get_dirty_podcasts
+
+from api.services.duplicate_cleanup import remove_duplicate_podcasts
+from api.services.duplicate_episode_merge import merge_duplicate_episodes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DuplicateSweepReport:
+    """Result of an incremental duplicate sweep. errors lists podcasts left marked because their cleanup failed."""
+    podcasts_checked: int = 0
+    podcasts_removed: int = 0
+    removed_titles: List[str] = field(default_factory=list)
+    duplicate_groups: int = 0
+    episodes_removed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _sweep(db_path: Path, podcast_uuids: Collection[str], report: DuplicateSweepReport) -> None:
+    """Podcast cleanup, then episode merge, over podcast_uuids; each step commits on its own."""
+    podcasts = remove_duplicate_podcasts(db_path=db_path, podcast_uuids=podcast_uuids)
+    report.podcasts_removed += podcasts.deleted_count
+    report.removed_titles.extend(podcasts.deleted_titles)
+    episodes = merge_duplicate_episodes(db_path=db_path, podcast_uuids=podcast_uuids)
+    report.duplicate_groups += episodes.duplicate_groups
+    report.episodes_removed += episodes.episodes_removed
+
+
+def sweep_dirty_duplicates(db_path: Optional[Path] = None) -> DuplicateSweepReport:
+    """
+    Remove duplicate podcasts and merge duplicate episodes, limited to podcasts changed since the
+    previous sweep (new duplicates can only appear there), then clear the marks that were processed.
+    When the sweep over all marked podcasts fails, it is retried podcast by podcast: the podcasts
+    that still fail stay marked (and are listed in errors) without holding back the other marks.
+    """
+    db_path = db_path or get_db_path()
+    report = DuplicateSweepReport()
+    with get_connection(db_path) as conn:
+        marks = get_dirty_podcasts(conn)
+    if not marks:
+        return report
+    report.podcasts_checked = len(marks)
+    cleared: Dict[str, int] = marks
+    try:
+        _sweep(db_path, set(marks), report)
+    except Exception as e:
+        logger.warning("Duplicate sweep over %d podcasts failed (%s); retrying podcast by podcast", len(marks), e)
+        cleared = {}
+        for uuid, marked_at in marks.items():
+            try:
+                _sweep(db_path, {uuid}, report)
+            except Exception as e:
+                report.errors.append(f"{uuid}: {e}")
+                continue
+            cleared[uuid] = marked_at
+    with get_connection(db_path) as conn:
+        clear_dirty_podcasts(cleared, conn)
+    return report
@@ -1,18 +1,16 @@
 """Resolve feed entry to existing episode UUID to prevent duplicates when feed guid/link changes."""
-import re
 from typing import Any, Dict, List, Optional
 
+from text_utils import normalize_title
+
 # Tolerance for published_date match: same day (86400 seconds)
 PUBLISHED_DATE_TOLERANCE_SEC = 86400
 
 
-def _normalized_title(title: Optional[str]) -> str:
-    """Normalize title for matching: strip, lowercase, collapse whitespace."""
-    if not title or not isinstance(title, str):
-        return ""
-    s = title.strip().lower()
-    s = re.sub(r"\s+", " ", s)
-    return s
+def _title_norm(episode: Dict[str, Any]) -> str:
+    """Stored title_norm when the row was selected with it, else normalized from title."""
+    norm = episode.get("title_norm")
+    return norm if norm is not None else normalize_title(episode.get("title"))
 
 
 def _published_date_close(a: Optional[float], b: Optional[float], tolerance: float = PUBLISHED_DATE_TOLERANCE_SEC) -> bool:
@@ -24,49 +22,69 @@ def _published_date_close(a: Optional[float], b: Optional[float], tolerance: flo
     return abs(a - b) <= tolerance
 
 
+class ExistingEpisodes:
+    """
+    A podcast's stored episodes keyed for resolving feed entries: by file_url and by title_norm.
+    Build it once per podcast and resolve every feed entry against it, so a refresh costs
+    O(entries + existing) rather than a scan of the existing episodes per entry.
+    """
+
+    def __init__(self, existing_episodes: List[Dict[str, Any]]) -> None:
+        self.by_file_url: Dict[str, Dict[str, Any]] = {}
+        self.by_title_norm: Dict[str, List[Dict[str, Any]]] = {}
+        for ex in existing_episodes:
+            ex_url = (ex.get("file_url") or "").strip()
+            if ex_url:
+                # First row wins, as the scan over the rows did
+                self.by_file_url.setdefault(ex_url, ex)
+            ex_title_norm = _title_norm(ex)
+            if ex_title_norm:
+                self.by_title_norm.setdefault(ex_title_norm, []).append(ex)
+
+    def resolve(self, feed_entry: Dict[str, Any]) -> str:
+        """
+        Resolve a feed entry to the UUID to use for upsert (existing or feed-derived).
+
+        Matches an existing episode by:
+        1. file_url: if feed entry has file_url and it matches an existing episode's file_url
+        2. title + published_date: same normalized title and same (or very close) published_date
+
+        When multiple existing episodes match (duplicates), pick one deterministically:
+        oldest created_at, then first by uuid.
+
+        Returns the existing episode's uuid if a match is found, otherwise feed_entry["uuid"].
+        """
+        feed_uuid = feed_entry.get("uuid") or ""
+        feed_file_url = (feed_entry.get("file_url") or "").strip()
+        feed_title_norm = normalize_title(feed_entry.get("title"))
+        feed_published = feed_entry.get("published_date")
+
+        # 1. Match by file_url (strong signal when present and stable)
+        if feed_file_url and feed_file_url in self.by_file_url:
+            return self.by_file_url[feed_file_url]["uuid"]
+
+        # 2. Match by normalized title + published_date (same or within one day)
+        if feed_title_norm:
+            candidates = [
+                ex for ex in self.by_title_norm.get(feed_title_norm, ())
+                if _published_date_close(feed_published, ex.get("published_date"))
+            ]
+            if candidates:
+                # Deterministic: oldest created_at, then first by uuid
+                candidates.sort(key=lambda e: (e.get("created_at") or 0, e.get("uuid") or ""))
+                return candidates[0]["uuid"]
+
+        return feed_uuid
+
+
 def resolve_episode_uuid(
     podcast_uuid: str,
     feed_entry: Dict[str, Any],
     existing_episodes: List[Dict[str, Any]],
 ) -> str:
     """
-    Resolve a feed entry to the UUID to use for upsert (existing or feed-derived).
-
-    Matches an existing episode for the same podcast by:
-    1. file_url: if feed entry has file_url and it matches an existing episode's file_url
-    2. title + published_date: same normalized title and same (or very close) published_date
-
-    When multiple existing episodes match (duplicates), pick one deterministically:
-    oldest created_at, then first by uuid.
-
-    Returns the existing episode's uuid if a match is found, otherwise feed_entry["uuid"].
+    Resolve one feed entry against existing_episodes (see ExistingEpisodes.resolve).
+    existing_episodes rows should include title_norm (stored on episodes) so titles are not re-normalized.
+    To resolve a whole feed, build ExistingEpisodes once instead of calling this per entry.
     """
-    feed_uuid = feed_entry.get("uuid") or ""
-    feed_file_url = (feed_entry.get("file_url") or "").strip() or None
-    feed_title_norm = _normalized_title(feed_entry.get("title"))
-    feed_published = feed_entry.get("published_date")
-
-    # 1. Match by file_url (strong signal when present and stable)
-    if feed_file_url:
-        for ex in existing_episodes:
-            ex_url = (ex.get("file_url") or "").strip() or None
-            if ex_url and ex_url == feed_file_url:
-                return ex["uuid"]
-
-    # 2. Match by normalized title + published_date (same or within one day)
-    if feed_title_norm:
-        candidates = []
-        for ex in existing_episodes:
-            ex_title_norm = _normalized_title(ex.get("title"))
-            if ex_title_norm != feed_title_norm:
-                continue
-            ex_published = ex.get("published_date")
-            if not _published_date_close(feed_published, ex_published):
-                continue
-            candidates.append(ex)
-        if candidates:
-            # Deterministic: oldest created_at, then first by uuid
-            candidates.sort(key=lambda e: (e.get("created_at") or "", e.get("uuid") or ""))
-            return candidates[0]["uuid"]
-
-    return feed_uuid
+    return ExistingEpisodes(existing_episodes).resolve(feed_entry)
@@ -1,10 +1,13 @@
 """Feed refresh service: fetch new episodes from RSS for all active podcasts."""
 import logging
+import time
 from typing import List, Tuple
 
-from database import get_connection, upsert_episode, upsert_listening_history, update_podcast_is_ended
+import metrics
+from database import get_connection, upsert_episode, update_podcast_is_ended
 from api.utils.rss_fetcher import fetch_podcast_with_episodes, FeedNotFoundError
-from api.services.episode_identity import resolve_episode_uuid
+from api.services.episode_identity import ExistingEpisodes
+from api.services.duplicate_sweep import sweep_dirty_duplicates
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +16,11 @@ def refresh_all_feeds() -> Tuple[int, int, int, List[str]]:
     """
     Fetch new episodes from RSS for all active podcasts with feed URLs.
     Skips soft-deleted and ended podcasts. Marks podcast as ended when feed returns 404/410.
+    Finishes with an incremental duplicate sweep over the podcasts this refresh (or any other
+    write since the last sweep) touched.
     Returns (podcasts_refreshed, episodes_added, episodes_updated, errors).
     """
+    start = time.perf_counter()
     errors: List[str] = []
     episodes_added = 0
     episodes_updated = 0
@@ -50,14 +56,15 @@ def refresh_all_feeds() -> Tuple[int, int, int, List[str]]:
         local_updated = 0
         with get_connection() as conn:
             cur = conn.execute(
-                """SELECT uuid, title, published_date, file_url, created_at
+                """SELECT uuid, title, title_norm, published_date, file_url, created_at
                    FROM episodes WHERE podcast_uuid = ? AND deleted_at IS NULL""",
                 (podcast_uuid,),
             )
             existing_episodes = [dict(r) for r in cur.fetchall()]
             existing_uuids = {r["uuid"] for r in existing_episodes}
+            known = ExistingEpisodes(existing_episodes)
             for ep in entries:
-                uid = resolve_episode_uuid(podcast_uuid, ep, existing_episodes)
+                uid = known.resolve(ep)
                 is_new = uid not in existing_uuids
                 if is_new:
                     episodes_added += 1
@@ -80,14 +87,6 @@ def refresh_all_feeds() -> Tuple[int, int, int, List[str]]:
                     deleted_at=None,
                     conn=conn,
                 )
-                if is_new:
-                    upsert_listening_history(
-                        uid,
-                        played_up_to=0,
-                        duration=ep.get("duration") or 0,
-                        playing_status=1,
-                        conn=conn,
-                    )
         logger.info(
             "Refreshed %s: %d entries (%d new, %d updated)",
             title,
@@ -95,4 +94,23 @@ def refresh_all_feeds() -> Tuple[int, int, int, List[str]]:
             local_added,
             local_updated,
         )
+    try:
+        sweep = sweep_dirty_duplicates()
+    except Exception as e:
+        errors.append(f"Duplicate sweep failed: {e}")
+        logger.warning("Duplicate sweep failed: %s", e)
+    else:
+        logger.info(
+            "Duplicate sweep: %d podcasts checked, %d duplicate podcasts removed, %d duplicate episodes merged",
+            sweep.podcasts_checked,
+            sweep.podcasts_removed,
+            sweep.episodes_removed,
+        )
+        for error in sweep.errors:
+            errors.append(f"Duplicate sweep failed for {error}")
+            logger.warning("Duplicate sweep failed for %s", error)
+    metrics.FEED_REFRESH_RUNS.inc()
+    metrics.FEED_REFRESH_SECONDS.observe(time.perf_counter() - start)
+    metrics.FEED_EPISODES.inc("added", amount=episodes_added)
+    metrics.FEED_EPISODES.inc("updated", amount=episodes_updated)
     return podcasts_refreshed, episodes_added, episodes_updated, errors
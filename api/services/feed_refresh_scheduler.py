@@ -1,9 +1,12 @@
 """Background scheduler for hourly feed refresh."""
 import logging
+from datetime import datetime, timezone
 
+from apscheduler.events import EVENT_JOB_SUBMITTED, JobSubmissionEvent
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
+import metrics
 from api.services.feed_refresh import refresh_all_feeds
 
 logger = logging.getLogger(__name__)
@@ -25,12 +28,21 @@ def _run_refresh() -> None:
         logger.exception("Feed refresh failed: %s", e)
 
 
+def _record_lag(event: JobSubmissionEvent) -> None:
+    """Track how late a job was handed to the executor relative to its scheduled time."""
+    if not event.scheduled_run_times:
+        return
+    lag = (datetime.now(timezone.utc) - event.scheduled_run_times[-1]).total_seconds()
+    metrics.SCHEDULER_LAG_SECONDS.set(max(lag, 0.0), event.job_id)
+
+
 def start_scheduler() -> None:
     """Start the background scheduler for hourly feed refresh."""
     global _scheduler
     if _scheduler is not None:
         return
     _scheduler = BackgroundScheduler()
+    _scheduler.add_listener(_record_lag, EVENT_JOB_SUBMITTED)
     _scheduler.add_job(_run_refresh, IntervalTrigger(hours=1), id="feed_refresh")
     _scheduler.start()
     logger.info("Feed refresh scheduler started (hourly)")
@@ -0,0 +1,201 @@
+"""
+Set podcast feed URLs from an OPML file, matching OPML entries to podcasts by title.
+
+Entries are matched on the stored title_norm first. Titles with no exact match fall back to a
+ranked fuzzy match over a token index of the library: each title token is weighted by its
+inverse document frequency, and candidates sharing a token are scored by weighted Jaccard
+similarity, so distinctive words ("hardcore", "history") count and filler ("the", "podcast")
+barely does. The best candidate is taken when it reaches the minimum score and leads the
+runner-up by FUZZY_MARGIN. All updates are applied in one transaction at the end.
+"""
+import heapq
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple, Union
+
+from config import get_db_path
+from database import get_connection, update_podcast_feed_urls
+from text_utils import normalize_title
+
+from api.utils.opml_parser import iter_opml
+
+DEFAULT_FUZZY_MIN_SCORE = 0.6
+# Best fuzzy score must beat the runner-up by this much, otherwise the entry is ambiguous
+FUZZY_MARGIN = 0.1
+# Tokens in more podcast titles than this only add weight to candidates other tokens found
+MAX_POSTINGS = 1000
+# Alternatives listed per entry in the report
+REPORT_CANDIDATES = 3
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+@dataclass
+class FeedUrlCandidate:
+    """Podcast an OPML title was scored against."""
+    uuid: str
+    title: str
+    score: float
+
+
+@dataclass
+class FeedUrlMatch:
+    """Match outcome for one OPML entry: exact, fuzzy, ambiguous or unmatched."""
+    opml_title: Optional[str]
+    feed_url: str
+    status: str
+    podcast_uuid: Optional[str] = None
+    podcast_title: Optional[str] = None
+    score: Optional[float] = None
+    candidates: List[FeedUrlCandidate] = field(default_factory=list)
+
+
+@dataclass
+class FeedUrlEnrichmentReport:
+    """Result of feed URL enrichment from OPML. With dry_run, updated counts what would be updated."""
+    entries: int = 0
+    updated: int = 0
+    exact: int = 0
+    fuzzy: int = 0
+    ambiguous: int = 0
+    unmatched: int = 0
+    dry_run: bool = False
+    matches: List[FeedUrlMatch] = field(default_factory=list)
+
+
+def _tokens(title_norm: str) -> Set[str]:
+    return set(_TOKEN.findall(title_norm))
+
+
+class _TitleIndex:
+    """Active podcasts by title_norm (exact) and by title token (fuzzy)."""
+
+    def __init__(self, rows: List[Any]) -> None:
+        self.podcasts: List[Tuple[str, str]] = []  # (uuid, title)
+        self.by_title: Dict[str, List[int]] = defaultdict(list)
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.token_sets: List[Set[str]] = []
+        for i, row in enumerate(rows):
+            self.podcasts.append((row["uuid"], row["title"] or ""))
+            key = row["title_norm"] or ""
+            self.by_title[key].append(i)
+            tokens = _tokens(key)
+            self.token_sets.append(tokens)
+            for token in tokens:
+                self.postings[token].append(i)
+        total = len(rows)
+        self.idf = {t: math.log(1 + total / len(ids)) for t, ids in self.postings.items()}
+        self.unseen_weight = math.log(1 + max(total, 1))
+        self.weights = [sum(self.idf[t] for t in tokens) for tokens in self.token_sets]
+
+    def weight(self, token: str) -> float:
+        return self.idf.get(token, self.unseen_weight)
+
+    def rank(self, title_norm: str, exclude: Set[int], limit: int, min_score: float) -> List[Tuple[float, int]]:
+        """
+        Top limit (score, podcast index) pairs among podcasts sharing a token with the title, best first.
+        Empty when no podcast could reach min_score: shared weight / query weight bounds every score.
+        """
+        tokens = _tokens(title_norm)
+        if not tokens:
+            return []
+        query_weight = sum(self.weight(t) for t in tokens)
+        known = [t for t in tokens if t in self.postings]
+        if sum(self.idf[t] for t in known) < min_score * query_weight:
+            return []
+        rare = [t for t in known if len(self.postings[t]) <= MAX_POSTINGS] or known
+        shared: Dict[int, float] = defaultdict(float)
+        for token in rare:
+            for i in self.postings[token]:
+                shared[i] += self.idf[token]
+        # Common tokens only add to candidates the rare ones found
+        common = [t for t in known if t not in rare]
+        if common:
+            for i in shared:
+                shared[i] += sum(self.idf[t] for t in common if t in self.token_sets[i])
+        scored = ((s / (query_weight + self.weights[i] - s), i) for i, s in shared.items() if i not in exclude)
+        return heapq.nlargest(limit, scored, key=lambda x: (x[0], -x[1]))
+
+
+def _candidates(index: _TitleIndex, ranked: List[Tuple[float, int]]) -> List[FeedUrlCandidate]:
+    return [FeedUrlCandidate(*index.podcasts[i], score=round(score, 3)) for score, i in ranked]
+
+
+def _match(
+    index: _TitleIndex,
+    opml_title: str,
+    feed_url: str,
+    fuzzy: bool,
+    min_score: float,
+    claimed: Set[int],
+) -> Tuple[FeedUrlMatch, Optional[int]]:
+    key = normalize_title(opml_title)
+    match = FeedUrlMatch(opml_title=opml_title or None, feed_url=feed_url, status="unmatched")
+    exact = index.by_title.get(key, [])
+    if len(exact) == 1:
+        i = exact[0]
+        match.status, match.score = "exact", 1.0
+        match.podcast_uuid, match.podcast_title = index.podcasts[i]
+        return match, i
+    if len(exact) > 1:
+        match.status = "ambiguous"
+        match.candidates = _candidates(index, [(1.0, i) for i in exact])
+        return match, None
+    if not fuzzy:
+        return match, None
+    # A podcast already matched by an earlier entry is not offered again
+    ranked = index.rank(key, claimed, REPORT_CANDIDATES, min_score)
+    match.candidates = _candidates(index, ranked)
+    if not ranked or ranked[0][0] < min_score:
+        return match, None
+    if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < FUZZY_MARGIN:
+        match.status = "ambiguous"
+        return match, None
+    score, i = ranked[0]
+    match.status, match.score = "fuzzy", round(score, 3)
+    match.podcast_uuid, match.podcast_title = index.podcasts[i]
+    return match, i
+
+
+def enrich_feed_urls(
+    source: Union[bytes, BinaryIO],
+    db_path: Optional[Path] = None,
+    dry_run: bool = False,
+    fuzzy: bool = True,
+    min_score: float = DEFAULT_FUZZY_MIN_SCORE,
+) -> FeedUrlEnrichmentReport:
+    """
+    Match OPML entries (bytes or a binary file stream, parsed as it is read) to active podcasts by
+    title and set feed_url (and website_url, when the OPML has one) from each matched entry.
+    Titles without an exact title_norm match get a fuzzy match unless fuzzy is False.
+    Every entry with a feed URL gets a FeedUrlMatch in the report. Updates are applied in one
+    transaction; with dry_run nothing is written. Raises OPMLError for malformed OPML (nothing applied).
+    """
+    db_path = db_path or get_db_path()
+    report = FeedUrlEnrichmentReport(dry_run=dry_run)
+    updates: List[Tuple[str, str, Optional[str]]] = []
+    with get_connection(db_path) as conn:
+        if not dry_run:
+            conn.execute("BEGIN IMMEDIATE")  # match and update under one write lock
+        index = _TitleIndex(
+            conn.execute("SELECT uuid, title, title_norm FROM podcasts WHERE deleted_at IS NULL ORDER BY id").fetchall()
+        )
+        claimed: Set[int] = set()
+        for entry in iter_opml(source):
+            feed_url = (entry.get("feed_url") or "").strip()
+            if not feed_url:
+                continue
+            report.entries += 1
+            match, i = _match(index, (entry.get("title") or "").strip(), feed_url, fuzzy, min_score, claimed)
+            setattr(report, match.status, getattr(report, match.status) + 1)
+            report.matches.append(match)
+            if i is not None:
+                claimed.add(i)
+                updates.append((index.podcasts[i][0], feed_url, (entry.get("website_url") or "").strip() or None))
+        report.updated = len(updates)
+        if updates and not dry_run:
+            update_podcast_feed_urls(updates, conn=conn)
+    return report
@@ -0,0 +1,226 @@
+"""
+Near-duplicate episodes: titles that differ in numbering style, punctuation or small edits
+("Ep 123: Foo" / "123 - Foo"), as left behind by republished feeds. Exact matches are handled by
+duplicate_episode_merge.
+
+Per podcast, each title is reduced to a core string (lowercase letters, digits and single spaces,
+without "ep"/"episode"-style markers) and its character 4-shingles are MinHashed with one
+permutation hashing (one hash per shingle, split into SIGNATURE_BINS bins). Locality-sensitive
+hashing over bands of the signature yields candidate pairs without comparing every pair, so a run
+is near-linear in the number of episodes. Candidates are kept when their exact shingle Jaccard
+similarity reaches the threshold, their numbers (episode / part numbers) agree when both have
+any, and they were published within a day or have durations within DURATION_TOLERANCE_SEC.
+Numbers are also checked per group, so an unnumbered title cannot chain "Foo 2" and "Foo 3" together.
+"""
+import re
+import zlib
+from dataclasses import dataclass, field
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from config import get_db_path
+from database import get_connection
+
+from api.services.duplicate_episode_merge import _pick_canonical, apply_episode_merges
+from api.services.episode_identity import _published_date_close
+
+SHINGLE_SIZE = 4
+SIGNATURE_BINS = 32  # power of two
+# 10 bands of 3 values: pairs at Jaccard 0.7 collide in some band ~98% of the time, unrelated titles rarely
+LSH_BANDS = 10
+LSH_ROWS = 3
+DEFAULT_SIMILARITY = 0.7
+DURATION_TOLERANCE_SEC = 60
+# Buckets larger than this (generic titles such as "Trailer") are skipped instead of compared pairwise
+MAX_BUCKET_SIZE = 200
+
+_BIN_BITS = SIGNATURE_BINS.bit_length() - 1
+_EMPTY_BIN = 1 << 32
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_NUMBERS = re.compile(r"\d+")
+# Numbering and republishing markers dropped from the core title ("ep 12", "no. 12", "(rebroadcast)")
+_MARKERS = re.compile(r"\b(?:ep|eps|episode|episodes|e|no|pt|rebroadcast|rerun|replay|repeat|encore|reissue)\b")
+
+
+@dataclass
+class NearDuplicateGroup:
+    """Candidate group of near-duplicate episodes within one podcast; canonical as merge would pick it."""
+    podcast_uuid: str
+    canonical_uuid: str
+    similarity: float
+    episodes: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class NearDuplicateReport:
+    """Result of a near-duplicate scan (and merge, when requested)."""
+    podcasts_scanned: int = 0
+    episodes_scanned: int = 0
+    candidate_pairs: int = 0
+    groups: List[NearDuplicateGroup] = field(default_factory=list)
+    episodes_removed: int = 0
+
+
+def _core_title(title_norm: Optional[str]) -> str:
+    core = _NON_ALNUM.sub(" ", title_norm or "")
+    return " ".join(_MARKERS.sub(" ", core).split())
+
+
+def _shingles(core: str) -> FrozenSet[str]:
+    padded = f" {core} "
+    return frozenset(padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1))
+
+
+def _signature(shingles: FrozenSet[str]) -> Tuple[int, ...]:
+    """
+    One-permutation MinHash: each shingle hash goes to bin (hash mod bins) and each bin keeps its
+    minimum. Empty bins borrow the next non-empty bin's value (rotation densification).
+    """
+    sig = [_EMPTY_BIN] * SIGNATURE_BINS
+    for s in shingles:
+        h = zlib.crc32(s.encode("utf-8"))
+        b = h & (SIGNATURE_BINS - 1)
+        v = h >> _BIN_BITS
+        if v < sig[b]:
+            sig[b] = v
+    for i in range(SIGNATURE_BINS):
+        if sig[i] == _EMPTY_BIN:
+            for step in range(1, SIGNATURE_BINS):
+                v = sig[(i + step) % SIGNATURE_BINS]
+                if v < _EMPTY_BIN:
+                    sig[i] = v + (step << 28)
+                    break
+    return tuple(sig)
+
+
+def _close(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """Published within the exact-duplicate tolerance, or durations within DURATION_TOLERANCE_SEC."""
+    if a.get("published_date") is not None and _published_date_close(a.get("published_date"), b.get("published_date")):
+        return True
+    da, db = a.get("duration") or 0, b.get("duration") or 0
+    return da > 0 and db > 0 and abs(da - db) <= DURATION_TOLERANCE_SEC
+
+
+def find_near_duplicate_groups(
+    episodes: List[Dict[str, Any]],
+    threshold: float = DEFAULT_SIMILARITY,
+) -> Tuple[List[List[int]], List[float], int]:
+    """
+    Near-duplicate groups among one podcast's episodes (dicts with title_norm or title,
+    published_date, duration). Returns (groups as index lists, min pair similarity per group,
+    candidate pairs checked).
+    """
+    cores = [_core_title(e.get("title_norm") if e.get("title_norm") is not None else (e.get("title") or "").lower())
+             for e in episodes]
+    shingles = [_shingles(c) if len(c) >= SHINGLE_SIZE else frozenset() for c in cores]
+    buckets: Dict[tuple, List[int]] = {}
+    for i, sh in enumerate(shingles):
+        if not sh:
+            continue
+        sig = _signature(sh)
+        for band in range(LSH_BANDS):
+            start = band * LSH_ROWS
+            buckets.setdefault((band,) + sig[start:start + LSH_ROWS], []).append(i)
+
+    parent = list(range(len(episodes)))
+    # Numbers of each group (kept at its root): groups with different non-empty numbers never join
+    group_numbers = [tuple(_NUMBERS.findall(c)) for c in cores]
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    seen = set()
+    edges: Dict[Tuple[int, int], float] = {}
+    for members in buckets.values():
+        if len(members) < 2 or len(members) > MAX_BUCKET_SIZE:
+            continue
+        for x in range(len(members)):
+            i = members[x]
+            for j in members[x + 1:]:
+                if (i, j) in seen:
+                    continue
+                seen.add((i, j))
+                a, b = shingles[i], shingles[j]
+                similarity = len(a & b) / len(a | b)
+                if similarity < threshold:
+                    continue
+                if not _close(episodes[i], episodes[j]):
+                    continue
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    numbers_i, numbers_j = group_numbers[ri], group_numbers[rj]
+                    if numbers_i and numbers_j and numbers_i != numbers_j:
+                        continue
+                    parent[rj] = ri
+                    group_numbers[ri] = numbers_i or numbers_j
+                edges[(i, j)] = similarity
+
+    components: Dict[int, List[int]] = {}
+    for i, j in edges:
+        root = find(i)
+        members = components.setdefault(root, [])
+        for k in (i, j):
+            if k not in members:
+                members.append(k)
+    min_similarity: Dict[int, float] = {}
+    for (i, _j), similarity in edges.items():
+        root = find(i)
+        min_similarity[root] = min(similarity, min_similarity.get(root, 1.0))
+    roots = list(components)
+    return [sorted(components[r]) for r in roots], [min_similarity[r] for r in roots], len(seen)
+
+
+def _podcast_episodes(conn: Any) -> Iterable[List[Dict[str, Any]]]:
+    """Active episodes with their history fields, streamed one podcast at a time."""
+    cur = conn.execute(
+        """SELECT e.uuid, e.podcast_uuid, e.title, e.title_norm, e.published_date, e.duration, e.created_at,
+                  lh.episode_uuid IS NOT NULL AS has_history, lh.played_up_to, lh.play_count
+           FROM episodes e
+           LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
+           WHERE e.deleted_at IS NULL
+           ORDER BY e.podcast_uuid, e.id"""
+    )
+    for _podcast_uuid, rows in groupby(cur, key=lambda r: r["podcast_uuid"]):
+        yield [dict(r) for r in rows]
+
+
+def find_near_duplicate_episodes(
+    db_path: Optional[Path] = None,
+    threshold: float = DEFAULT_SIMILARITY,
+    merge: bool = False,
+) -> NearDuplicateReport:
+    """
+    Scan active episodes for near-duplicate groups. With merge, every member of a group is merged
+    into its canonical episode (as merge_duplicate_episodes does) in one transaction. Groups are
+    joined transitively through matching pairs, so review them first when lowering the threshold.
+    """
+    db_path = db_path or get_db_path()
+    report = NearDuplicateReport()
+    merge_map: List[Tuple[str, str]] = []
+    with get_connection(db_path) as conn:
+        for episodes in _podcast_episodes(conn):
+            report.podcasts_scanned += 1
+            report.episodes_scanned += len(episodes)
+            groups, similarities, pairs = find_near_duplicate_groups(episodes, threshold)
+            report.candidate_pairs += pairs
+            for indexes, similarity in zip(groups, similarities):
+                members = [episodes[i] for i in indexes]
+                canonical, duplicates = _pick_canonical(members)
+                report.groups.append(
+                    NearDuplicateGroup(
+                        podcast_uuid=canonical["podcast_uuid"],
+                        canonical_uuid=canonical["uuid"],
+                        similarity=round(similarity, 3),
+                        episodes=[
+                            {k: e[k] for k in ("uuid", "title", "published_date", "duration")} for e in members
+                        ],
+                    )
+                )
+                merge_map.extend((dup["uuid"], canonical["uuid"]) for dup in duplicates)
+        if merge and merge_map:
+            report.episodes_removed = apply_episode_merges(conn, merge_map)
+    return report
@@ -0,0 +1,90 @@
+"""OPML export service: stream subscriptions from the podcasts table as OPML 2.0."""
+import re
+from email.utils import formatdate
+from pathlib import Path
+from typing import BinaryIO, Collection, Iterator, Optional
+from xml.sax.saxutils import quoteattr
+
+from config import get_db_path
+from database import get_connection
+
+OPML_STATUSES = ("active", "archived", "ended")
+# Everything still subscribed: archived (soft-deleted) podcasts are left out unless asked for
+DEFAULT_OPML_STATUSES = ("active", "ended")
+# Podcasts fetched per cursor batch; each batch is yielded as one chunk
+OPML_EXPORT_CHUNK_ROWS = 500
+
+# Same definitions as the podcast list filter in database.get_all_podcasts
+_STATUS_SQL = {
+    "active": "(deleted_at IS NULL AND (is_ended IS NULL OR is_ended = 0))",
+    "archived": "deleted_at IS NOT NULL",
+    "ended": "(is_ended = 1 AND deleted_at IS NULL)",
+}
+# Characters XML 1.0 cannot carry at all, even as references
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _attr(value: str) -> str:
+    """Quoted attribute value; quoteattr also encodes tabs and newlines so they read back unchanged."""
+    return quoteattr(_INVALID_XML_CHARS.sub("", value))
+
+
+def _outline(title: Optional[str], feed_url: str, website_url: Optional[str]) -> str:
+    text = _attr(title or "")
+    line = f'    <outline type="rss" text={text} title={text} xmlUrl={_attr(feed_url)}'
+    if website_url:
+        line += f" htmlUrl={_attr(website_url)}"
+    return line + "/>\n"
+
+
+def iter_opml_export(
+    statuses: Collection[str] = DEFAULT_OPML_STATUSES,
+    db_path: Optional[Path] = None,
+) -> Iterator[bytes]:
+    """
+    Yield an OPML document of podcasts with a feed URL, ordered by title, as UTF-8 chunks read
+    from a cursor in batches (memory stays flat). statuses picks podcasts by list filter:
+    active, archived and/or ended. parse_opml reads back each feed URL, title and website URL.
+    """
+    unknown = set(statuses) - set(OPML_STATUSES)
+    if unknown:
+        raise ValueError(f"Unknown OPML status filter: {', '.join(sorted(unknown))}")
+    if not statuses:
+        raise ValueError("At least one OPML status filter is required")
+    where = " OR ".join(_STATUS_SQL[s] for s in OPML_STATUSES if s in statuses)
+    db_path = db_path or get_db_path()
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<opml version="2.0">\n'
+        "  <head>\n"
+        "    <title>Audiophile subscriptions</title>\n"
+        f"    <dateCreated>{formatdate(usegmt=True)}</dateCreated>\n"
+        "  </head>\n"
+        "  <body>\n"
+    ).encode("utf-8")
+    # Streaming responses may resume this generator on different threadpool threads
+    with get_connection(db_path, check_same_thread=False) as conn:
+        cur = conn.execute(
+            f"""SELECT title, feed_url, website_url FROM podcasts
+                WHERE feed_url IS NOT NULL AND TRIM(feed_url) != '' AND ({where})
+                ORDER BY title_norm, id"""
+        )
+        while True:
+            rows = cur.fetchmany(OPML_EXPORT_CHUNK_ROWS)
+            if not rows:
+                break
+            yield "".join(_outline(r["title"], r["feed_url"], r["website_url"]) for r in rows).encode("utf-8")
+    yield b"  </body>\n</opml>\n"
+
+
+def export_opml(
+    out: BinaryIO,
+    statuses: Collection[str] = DEFAULT_OPML_STATUSES,
+    db_path: Optional[Path] = None,
+) -> int:
+    """Write the OPML export to a binary stream; return bytes written."""
+    written = 0
+    for chunk in iter_opml_export(statuses, db_path=db_path):
+        out.write(chunk)
+        written += len(chunk)
+    return written
@@ -1,8 +1,9 @@
 """OPML import service: parse OPML, find missing podcasts, enrich metadata from RSS."""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from urllib.parse import urlparse
+from typing import Optional, List, Dict, Any, BinaryIO, Set, Tuple, Union
 
 from config import get_db_path
 from database import (
@@ -10,11 +11,18 @@ from database import (
     get_connection,
     upsert_podcast,
 )
-from api.utils.opml_parser import parse_opml
+from api.utils.opml_parser import OPMLError, iter_opml
 from api.utils.rss_fetcher import fetch_podcast_metadata
+from text_utils import canonical_feed_url
 import uuid as uuid_module
 
 
+# Feeds fetched at once; fetches are network-bound, so threads overlap the waiting
+OPML_FETCH_WORKERS = 8
+# Podcast upserts written per transaction while fetches continue
+OPML_UPSERT_BATCH = 50
+
+
 @dataclass
 class OPMLImportReport:
     """Result of an OPML import run."""
@@ -22,26 +30,28 @@ class OPMLImportReport:
     podcasts_added: int = 0
     podcasts_updated: int = 0
     metadata_enriched: int = 0
+    # Existing podcasts with author, description and image already set, and repeated feeds in the OPML
+    fetches_skipped: int = 0
+    elapsed_seconds: float = 0.0
+    fetch_seconds: float = 0.0  # summed over fetches; above elapsed_seconds when they overlap
+    db_seconds: float = 0.0
     errors: List[str] = field(default_factory=list)
 
 
-def _canonical_feed_url(url: str) -> str:
-    """Normalize feed URL for matching: strip, no trailing slash, https, lowercase host."""
-    if not url or not isinstance(url, str):
-        return ""
-    s = url.strip().rstrip("/")
-    if not s:
-        return ""
-    parsed = urlparse(s)
-    if not parsed.netloc:
-        return s
-    scheme = "https" if parsed.scheme in ("http", "https") else (parsed.scheme or "https")
-    path = parsed.path or "/"
-    if parsed.query:
-        path = path + "?" + parsed.query
-    if parsed.fragment:
-        path = path + "#" + parsed.fragment
-    return f"{scheme}://{parsed.netloc.lower()}{path}"
+def _find_podcast_by_canonical(conn: Any, canonical: str) -> Optional[Dict[str, Any]]:
+    """Active podcast whose feed_url_canonical matches (indexed); the one with most episodes wins."""
+    if not canonical:
+        return None
+    row = conn.execute(
+        """SELECT p.uuid, p.title, p.author, p.description, p.feed_url, p.website_url, p.image_url,
+                  (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND e.deleted_at IS NULL) AS episode_count
+           FROM podcasts p
+           WHERE p.feed_url_canonical = ? AND p.deleted_at IS NULL
+           ORDER BY episode_count DESC, p.id
+           LIMIT 1""",
+        (canonical,),
+    ).fetchone()
+    return dict(row) if row else None
 
 
 def _uuid_from_feed_url(feed_url: str) -> str:
@@ -49,116 +59,156 @@ def _uuid_from_feed_url(feed_url: str) -> str:
     return str(uuid_module.uuid5(uuid_module.NAMESPACE_URL, feed_url.strip()))
 
 
-def import_opml(content: bytes, db_path: Optional[Path] = None) -> OPMLImportReport:
+def _has_complete_metadata(podcast: Dict[str, Any]) -> bool:
+    """Nothing for RSS to fill in: author, description and image are all set."""
+    return all((podcast.get(key) or "").strip() for key in ("author", "description", "image_url"))
+
+
+def _timed_fetch(feed_url: str) -> Tuple[Dict[str, Any], float]:
+    start = time.perf_counter()
+    meta = fetch_podcast_metadata(feed_url)
+    return meta, time.perf_counter() - start
+
+
+def _podcast_fields(
+    entry: Dict[str, Any],
+    existing: Optional[Dict[str, Any]],
+    rss_meta: Dict[str, Any],
+    report: OPMLImportReport,
+) -> Dict[str, Any]:
+    """upsert_podcast arguments for one OPML entry: RSS metadata with OPML fallback, existing values first."""
+    feed_url = entry["feed_url"]
+    opml_title = (entry.get("title") or "").strip() or None
+    # Build title, author, description, image from RSS with OPML fallback
+    title = (rss_meta.get("title") or opml_title or "").strip() or None
+    author = (rss_meta.get("author") or "").strip() or None
+    description = (rss_meta.get("description") or "").strip() or None
+    image_url = (rss_meta.get("image_url") or "").strip() or None
+    if not title:
+        title = opml_title
+
+    if existing:
+        # Enrich only missing fields; prefer existing if present
+        enriched = (
+            (not existing.get("author") and author)
+            or (not existing.get("description") and description)
+            or (not existing.get("image_url") and image_url)
+        )
+        if enriched:
+            report.metadata_enriched += 1
+        # Always ensure feed_url and title are set
+        return {
+            "uuid": existing["uuid"],
+            "title": existing.get("title") or title,
+            "author": existing.get("author") or author,
+            "description": existing.get("description") or description,
+            "feed_url": existing.get("feed_url") or feed_url,
+            "website_url": existing.get("website_url") or entry.get("website_url"),
+            "image_url": existing.get("image_url") or image_url,
+        }
+
+    # New podcast: use RSS + OPML; if RSS failed, use OPML title only
+    if not title:
+        report.errors.append(f"No title for feed: {feed_url[:80]}...")
+        title = "Unknown"
+    if rss_meta.get("title") or rss_meta.get("author") or rss_meta.get("description") or rss_meta.get("image_url"):
+        report.metadata_enriched += 1
+    return {
+        "uuid": _uuid_from_feed_url(feed_url),
+        "title": title,
+        "author": author,
+        "description": description,
+        "feed_url": feed_url,
+        "website_url": entry.get("website_url"),
+        "image_url": image_url,
+    }
+
+
+def _write_podcasts(db_path: Path, batch: List[Dict[str, Any]], report: OPMLImportReport) -> None:
+    """Upsert a batch of podcasts in one transaction."""
+    start = time.perf_counter()
+    with get_connection(db_path) as conn:
+        for fields in batch:
+            upsert_podcast(**fields, conn=conn)
+    report.db_seconds += time.perf_counter() - start
+    batch.clear()
+
+
+def import_opml(
+    content: Union[bytes, BinaryIO],
+    db_path: Optional[Path] = None,
+    dry_run: bool = False,
+    workers: int = OPML_FETCH_WORKERS,
+) -> OPMLImportReport:
     """
-    Parse OPML content, find missing podcasts, enrich metadata from RSS, and upsert.
-    Returns report with counts and any errors.
+    Parse OPML content (bytes, or a binary file stream read as it is parsed), find missing podcasts,
+    enrich metadata from RSS, and upsert. Returns report with counts and any errors; nothing is
+    written when the OPML is malformed.
+    Feeds are fetched by up to workers threads; existing podcasts whose author, description and
+    image are already set are not fetched. Upserts are written in batches of OPML_UPSERT_BATCH
+    as fetches complete.
+    With dry_run, only count the feeds that would be added or matched to existing podcasts:
+    no RSS fetches, no writes (metadata_enriched stays 0).
     """
+    start = time.perf_counter()
     db_path = db_path or get_db_path()
-    init_schema(db_path)
+    if not dry_run:
+        init_schema(db_path)
     report = OPMLImportReport()
 
+    # One entry per canonical feed URL, matched against the library (indexed lookups) as it is parsed
+    to_fetch: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = []
+    to_write: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
     try:
-        entries = parse_opml(content)
-    except Exception as e:
-        report.errors.append(f"Failed to parse OPML: {e}")
+        with get_connection(db_path) as conn:
+            for entry in iter_opml(content):
+                report.podcasts_found += 1
+                feed_url = entry.get("feed_url") or ""
+                if not feed_url:
+                    continue
+                canonical = canonical_feed_url(feed_url)
+                if canonical in seen:
+                    # Repeated feed: it is added or updated once
+                    report.podcasts_updated += 1
+                    report.fetches_skipped += 1
+                    continue
+                seen.add(canonical)
+                existing = _find_podcast_by_canonical(conn, canonical)
+                if existing:
+                    report.podcasts_updated += 1
+                else:
+                    report.podcasts_added += 1
+                if existing and _has_complete_metadata(existing):
+                    report.fetches_skipped += 1
+                    to_write.append(_podcast_fields(entry, existing, {}, report))
+                else:
+                    to_fetch.append((entry, existing))
+    except OPMLError as e:
+        return OPMLImportReport(errors=[f"Failed to parse OPML: {e}"])
+    if dry_run:
+        report.elapsed_seconds = round(time.perf_counter() - start, 3)
         return report
 
-    report.podcasts_found = len(entries)
-    if not entries:
-        return report
-
-    with get_connection(db_path) as conn:
-        # Build canonical feed_url -> podcast row (prefer row with higher episode_count)
-        cur = conn.execute(
-            """SELECT p.uuid, p.title, p.author, p.description, p.feed_url, p.website_url, p.image_url,
-                      (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND e.deleted_at IS NULL) AS episode_count
-               FROM podcasts p
-               WHERE p.deleted_at IS NULL AND TRIM(COALESCE(p.feed_url, '')) != ''"""
-        )
-        by_canonical: Dict[str, Dict[str, Any]] = {}
-        for row in cur.fetchall():
-            row_dict = dict(row)
-            canonical = _canonical_feed_url(row_dict.get("feed_url") or "")
-            if not canonical:
-                continue
-            existing_row = by_canonical.get(canonical)
-            if existing_row is None or (row_dict.get("episode_count") or 0) > (existing_row.get("episode_count") or 0):
-                by_canonical[canonical] = row_dict
-
-        for entry in entries:
-            feed_url = entry.get("feed_url") or ""
-            opml_title = (entry.get("title") or "").strip() or None
-            if not feed_url:
-                continue
-
-            existing = by_canonical.get(_canonical_feed_url(feed_url))
-            rss_meta = fetch_podcast_metadata(feed_url)
-
-            # Build title, author, description, image from RSS with OPML fallback
-            title = (rss_meta.get("title") or opml_title or "").strip() or None
-            author = (rss_meta.get("author") or "").strip() or None
-            description = (rss_meta.get("description") or "").strip() or None
-            image_url = (rss_meta.get("image_url") or "").strip() or None
-            if not title:
-                title = opml_title
-
-            if existing:
-                # Enrich only missing fields; prefer existing if present
-                uuid_val = existing["uuid"]
-                final_title = existing.get("title") or title
-                final_author = existing.get("author") or author
-                final_description = existing.get("description") or description
-                final_image_url = existing.get("image_url") or image_url
-                final_website_url = existing.get("website_url") or entry.get("website_url")
-                enriched = (
-                    (not existing.get("author") and author)
-                    or (not existing.get("description") and description)
-                    or (not existing.get("image_url") and image_url)
-                )
-                if enriched:
-                    report.metadata_enriched += 1
-                # Always ensure feed_url and title are set
-                upsert_podcast(
-                    uuid=uuid_val,
-                    title=final_title or existing.get("title"),
-                    author=final_author or existing.get("author"),
-                    description=final_description or existing.get("description"),
-                    feed_url=existing.get("feed_url") or feed_url,
-                    website_url=final_website_url or existing.get("website_url"),
-                    image_url=final_image_url or existing.get("image_url"),
-                    conn=conn,
-                )
-                report.podcasts_updated += 1
-            else:
-                # New podcast: use RSS + OPML; if RSS failed, use OPML title only
-                uuid_val = _uuid_from_feed_url(feed_url)
-                if not title:
-                    report.errors.append(f"No title for feed: {feed_url[:80]}...")
-                    title = "Unknown"
-                if rss_meta.get("title") or rss_meta.get("author") or rss_meta.get("description") or rss_meta.get("image_url"):
-                    report.metadata_enriched += 1
-                upsert_podcast(
-                    uuid=uuid_val,
-                    title=title,
-                    author=author,
-                    description=description,
-                    feed_url=feed_url,
-                    website_url=entry.get("website_url"),
-                    image_url=image_url,
-                    conn=conn,
-                )
-                report.podcasts_added += 1
-                # So duplicate feeds in the same OPML don't create duplicate rows
-                by_canonical[_canonical_feed_url(feed_url)] = {
-                    "uuid": uuid_val,
-                    "title": title,
-                    "author": author,
-                    "description": description,
-                    "feed_url": feed_url,
-                    "website_url": entry.get("website_url"),
-                    "image_url": image_url,
-                    "episode_count": 0,
-                }
-
+    batch: List[Dict[str, Any]] = []
+    for fields in to_write:
+        batch.append(fields)
+        if len(batch) >= OPML_UPSERT_BATCH:
+            _write_podcasts(db_path, batch, report)
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(_timed_fetch, entry["feed_url"]): (entry, existing) for entry, existing in to_fetch}
+            for future in as_completed(futures):
+                entry, existing = futures[future]
+                rss_meta, seconds = future.result()
+                report.fetch_seconds += seconds
+                batch.append(_podcast_fields(entry, existing, rss_meta, report))
+                if len(batch) >= OPML_UPSERT_BATCH:
+                    _write_podcasts(db_path, batch, report)
+    if batch:
+        _write_podcasts(db_path, batch, report)
+
+    report.fetch_seconds = round(report.fetch_seconds, 3)
+    report.db_seconds = round(report.db_seconds, 3)
+    report.elapsed_seconds = round(time.perf_counter() - start, 3)
     return report
@@ -0,0 +1,172 @@
+"""
+Subscribe service: fetch a podcast feed by URL and store the podcast with all its episodes,
+for one feed or many at once. Bulk subscribes fetch and parse feeds in a thread pool and
+write each feed (podcast and episodes, one transaction) as its fetch completes.
+"""
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config import get_db_path
+from database import get_connection, upsert_episodes, upsert_podcast
+from text_utils import canonical_feed_url
+from api.utils.rss_fetcher import FeedNotFoundError, fetch_podcast_with_episodes
+from api.services.episode_identity import ExistingEpisodes
+
+# Feeds fetched at once; fetches are network-bound, so threads overlap the waiting
+SUBSCRIBE_FETCH_WORKERS = 8
+# Feed URLs accepted per bulk subscribe request
+MAX_BULK_SUBSCRIBE_FEEDS = 1000
+BULK_SUBSCRIBE_STATUSES = ("subscribed", "updated", "failed", "invalid", "duplicate")
+
+
+@dataclass
+class FeedSubscribeResult:
+    """
+    Outcome for one feed URL: subscribed (new podcast), updated (already in the library),
+    failed (fetch or parse error), invalid (not an http(s) URL) or duplicate (repeated in the request).
+    """
+    feed_url: str
+    status: str
+    podcast_uuid: Optional[str] = None
+    title: Optional[str] = None
+    episodes_added: int = 0
+    episodes_updated: int = 0
+    error: Optional[str] = None
+    fetch_seconds: float = 0.0
+    db_seconds: float = 0.0
+
+
+def clean_feed_url(feed_url: str) -> str:
+    """Feed URL as stored on subscribe: surrounding whitespace and trailing slashes removed."""
+    return (feed_url or "").strip().rstrip("/")
+
+
+def podcast_uuid_from_feed_url(feed_url: str) -> str:
+    return hashlib.sha256(clean_feed_url(feed_url).encode("utf-8")).hexdigest()[:32]
+
+
+def fetch_feed(feed_url: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(feed data, None), or (None, error message) when the feed is gone, fails to fetch or has no content."""
+    try:
+        data = fetch_podcast_with_episodes(feed_url)
+    except FeedNotFoundError as e:
+        return None, f"Feed not available (HTTP {e.status})"
+    except Exception as e:
+        return None, f"Failed to fetch feed: {e}"
+    if not (data.get("title") or "").strip() and not data.get("entries"):
+        return None, "Feed could not be parsed or has no content"
+    return data, None
+
+
+def store_feed(conn: Any, feed_url: str, data: Dict[str, Any]) -> FeedSubscribeResult:
+    """
+    Upsert the podcast for feed_url (the active one with that canonical feed URL, else a new one)
+    and all feed entries as episodes, on conn. Episodes already stored keep their uuid.
+    """
+    existing = conn.execute(
+        "SELECT uuid FROM podcasts WHERE feed_url_canonical = ? AND deleted_at IS NULL LIMIT 1",
+        (canonical_feed_url(feed_url),),
+    ).fetchone()
+    podcast_uuid = existing["uuid"] if existing else podcast_uuid_from_feed_url(feed_url)
+    title = (data.get("title") or "").strip() or "Untitled Podcast"
+    upsert_podcast(
+        uuid=podcast_uuid,
+        title=title,
+        author=(data.get("author") or "").strip() or None,
+        description=(data.get("description") or "").strip() or None,
+        feed_url=feed_url,
+        website_url=(data.get("website_url") or "").strip() or None,
+        image_url=(data.get("image_url") or "").strip() or None,
+        deleted_at=None,
+        is_ended=False,
+        conn=conn,
+    )
+    cur = conn.execute(
+        """SELECT uuid, title, title_norm, published_date, file_url, created_at
+           FROM episodes WHERE podcast_uuid = ? AND deleted_at IS NULL""",
+        (podcast_uuid,),
+    )
+    existing_episodes = [dict(r) for r in cur.fetchall()]
+    existing_uuids = {r["uuid"] for r in existing_episodes}
+    known = ExistingEpisodes(existing_episodes)
+    result = FeedSubscribeResult(
+        feed_url=feed_url,
+        status="updated" if existing else "subscribed",
+        podcast_uuid=podcast_uuid,
+        title=title,
+    )
+    episodes: Dict[str, Dict[str, Any]] = {}
+    for ep in data.get("entries") or []:
+        uid = known.resolve(ep)
+        if uid in existing_uuids:
+            result.episodes_updated += 1
+        else:
+            result.episodes_added += 1
+            existing_uuids.add(uid)
+        # A feed listing the same episode twice: the later entry wins, as with one upsert per entry
+        episodes[uid] = {**ep, "uuid": uid, "deleted_at": None}
+    upsert_episodes(podcast_uuid, list(episodes.values()), conn=conn)
+    return result
+
+
+def _timed_fetch(feed_url: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], float]:
+    start = time.perf_counter()
+    data, error = fetch_feed(feed_url)
+    return data, error, time.perf_counter() - start
+
+
+def iter_bulk_subscribe(
+    feed_urls: Iterable[str],
+    db_path: Optional[Path] = None,
+    workers: int = SUBSCRIBE_FETCH_WORKERS,
+) -> Iterator[FeedSubscribeResult]:
+    """
+    Subscribe to many feeds, yielding a FeedSubscribeResult per feed URL as soon as it is known:
+    invalid and repeated URLs first, then each feed in fetch completion order once it is written.
+    Feeds are fetched and parsed by up to workers threads; writes happen on the consuming thread,
+    one transaction per feed, so a failing feed never rolls back another. Closing the iterator
+    early cancels fetches that have not started.
+    """
+    db_path = db_path or get_db_path()
+    to_fetch: List[str] = []
+    seen: Set[str] = set()
+    for raw in feed_urls:
+        feed_url = clean_feed_url(raw)
+        if not feed_url.startswith("http"):
+            yield FeedSubscribeResult(feed_url=raw, status="invalid", error="Valid feed URL is required")
+            continue
+        canonical = canonical_feed_url(feed_url)
+        if canonical in seen:
+            yield FeedSubscribeResult(feed_url=feed_url, status="duplicate")
+            continue
+        seen.add(canonical)
+        to_fetch.append(feed_url)
+    if not to_fetch:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(to_fetch))))
+    try:
+        futures = {pool.submit(_timed_fetch, url): url for url in to_fetch}
+        for future in as_completed(futures):
+            feed_url = futures[future]
+            data, error, fetch_seconds = future.result()
+            if error:
+                yield FeedSubscribeResult(
+                    feed_url=feed_url, status="failed", error=error, fetch_seconds=round(fetch_seconds, 3)
+                )
+                continue
+            start = time.perf_counter()
+            try:
+                with get_connection(db_path) as conn:
+                    result = store_feed(conn, feed_url, data)
+            except Exception as e:
+                result = FeedSubscribeResult(feed_url=feed_url, status="failed", error=f"Failed to store feed: {e}")
+            result.fetch_seconds = round(fetch_seconds, 3)
+            result.db_seconds = round(time.perf_counter() - start, 3)
+            yield result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
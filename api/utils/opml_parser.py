@@ -1,32 +1,81 @@
 """Parse OPML files to extract podcast feed URLs and titles."""
-import xml.etree.ElementTree as ET
-from typing import List, Dict, Any
+import codecs
+import xml.parsers.expat
+from typing import Any, BinaryIO, Dict, Iterator, List, Union
 
+# Bytes read from a file stream per parser step; entries are yielded after each step
+READ_CHUNK_BYTES = 64 * 1024
 
-def parse_opml(content: bytes | str) -> List[Dict[str, Any]]:
+
+class OPMLError(ValueError):
+    """Malformed or disallowed OPML (e.g. a DTD declaring entities)."""
+
+
+def _forbid_entity_decl(name: str, *_args: Any) -> None:
+    raise OPMLError(f"Entity declarations are not allowed (entity {name!r})")
+
+
+def _forbid_external_entity(*_args: Any) -> int:
+    raise OPMLError("External entities are not allowed")
+
+
+def _chunks(source: Union[bytes, str, BinaryIO]) -> Iterator[Union[bytes, str]]:
+    if isinstance(source, (bytes, str)):
+        yield source
+        return
+    while True:
+        chunk = source.read(READ_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_opml(source: Union[bytes, str, BinaryIO]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream podcast entries from OPML content or a binary file object, in document order.
+    Each entry has feed_url (from xmlUrl), title (from text) and website_url (from htmlUrl).
+    Outlines at any depth are found without building a tree, so memory stays flat. Bytes are read
+    as UTF-8 (undecodable bytes replaced). Entity declarations and external entities are rejected,
+    which blocks entity expansion ("billion laughs") and external entity (XXE) attacks.
+    Raises OPMLError for malformed or disallowed content; entries before the error have already been yielded.
+    """
+    parser = xml.parsers.expat.ParserCreate()
+    parser.SetParamEntityParsing(xml.parsers.expat.XML_PARAM_ENTITY_PARSING_NEVER)
+    parser.EntityDeclHandler = _forbid_entity_decl
+    parser.UnparsedEntityDeclHandler = _forbid_entity_decl
+    parser.ExternalEntityRefHandler = _forbid_external_entity
+    pending: List[Dict[str, Any]] = []
+
+    def start_element(tag: str, attrs: Dict[str, str]) -> None:
+        if not tag.endswith("outline"):
+            return
+        xml_url = attrs.get("xmlUrl") or attrs.get("xmlurl")
+        if xml_url and xml_url.strip():
+            title = (attrs.get("text") or attrs.get("title") or "").strip()
+            html_url = (attrs.get("htmlUrl") or attrs.get("htmlurl") or "").strip() or None
+            pending.append({
+                "feed_url": xml_url.strip(),
+                "title": title or None,
+                "website_url": html_url,
+            })
+
+    parser.StartElementHandler = start_element
+    # Text input makes expat ignore the declared encoding, as decoding the whole file did before
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    try:
+        for chunk in _chunks(source):
+            parser.Parse(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk, False)
+            yield from pending
+            pending.clear()
+        parser.Parse(decoder.decode(b"", final=True), True)
+    except xml.parsers.expat.ExpatError as e:
+        raise OPMLError(f"Invalid OPML: {xml.parsers.expat.ErrorString(e.code)} (line {e.lineno}, column {e.offset})") from e
+    yield from pending
+
+
+def parse_opml(content: Union[bytes, str, BinaryIO]) -> List[Dict[str, Any]]:
     """
     Parse OPML content and return list of podcast entries.
-    Each entry has feed_url (from xmlUrl) and title (from text).
-    Recursively walks outline elements to find entries with xmlUrl.
+    Each entry has feed_url (from xmlUrl) and title (from text). See iter_opml to stream them.
     """
-    if isinstance(content, bytes):
-        content = content.decode("utf-8", errors="replace")
-    root = ET.fromstring(content)
-    entries: List[Dict[str, Any]] = []
-
-    def collect_outlines(element: ET.Element) -> None:
-        for child in element:
-            if child.tag.endswith("outline"):
-                xml_url = child.get("xmlUrl") or child.get("xmlurl")
-                if xml_url and xml_url.strip():
-                    title = (child.get("text") or child.get("title") or "").strip()
-                    html_url = (child.get("htmlUrl") or child.get("htmlurl") or "").strip() or None
-                    entries.append({
-                        "feed_url": xml_url.strip(),
-                        "title": title or None,
-                        "website_url": html_url,
-                    })
-            collect_outlines(child)
-
-    collect_outlines(root)
-    return entries
+    return list(iter_opml(content))
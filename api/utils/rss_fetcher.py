@@ -1,11 +1,21 @@
 """Fetch and parse RSS/Atom feeds to extract podcast metadata and episodes."""
+import gzip
 import hashlib
+import socket
+import time
+import urllib.error
+import urllib.request
+import zlib
 import feedparser
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-# Timeout in seconds for fetching feeds (used when feedparser supports it)
+import metrics
+
+# Timeout in seconds for fetching feeds
 RSS_FETCH_TIMEOUT = 15
 
+USER_AGENT = "PodcastsReviewer/1.0"
+
 
 class FeedNotFoundError(Exception):
     """Raised when a feed returns HTTP 404 Not Found or 410 Gone."""
@@ -15,6 +25,83 @@ class FeedNotFoundError(Exception):
         super().__init__(message or f"Feed not available (HTTP {status})")
 
 
+def _download_feed(feed_url: str) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Download a feed body; return (body, lowercased response headers).
+    Raises FeedNotFoundError for HTTP 404/410; other HTTP and network errors propagate.
+    """
+    request = urllib.request.Request(
+        feed_url,
+        headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=RSS_FETCH_TIMEOUT) as resp:
+            body = resp.read()
+            headers = {k.lower(): v for k, v in resp.headers.items()}
+            final_url = resp.geturl()
+    except urllib.error.HTTPError as e:
+        if e.code in (404, 410):
+            raise FeedNotFoundError(e.code) from e
+        raise
+    encoding = (headers.pop("content-encoding", None) or "").lower()
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoding == "deflate":
+        try:
+            body = zlib.decompress(body)
+        except zlib.error:
+            body = zlib.decompress(body, -zlib.MAX_WBITS)
+    # feedparser resolves relative links against content-location
+    headers["content-location"] = final_url or feed_url
+    return body, headers
+
+
+def _parse_feed(body: bytes, headers: Dict[str, str]) -> Any:
+    """Parse a downloaded feed body with feedparser."""
+    return feedparser.parse(body, response_headers=headers)
+
+
+def _error_type(exc: BaseException) -> str:
+    """Coarse error label for the feed_errors_total metric."""
+    if isinstance(exc, FeedNotFoundError):
+        return "not_found"
+    if isinstance(exc, urllib.error.HTTPError):
+        return "http_5xx" if exc.code >= 500 else "http_4xx"
+    if isinstance(exc, (socket.timeout, TimeoutError)):
+        return "timeout"
+    if isinstance(exc, urllib.error.URLError):
+        reason = getattr(exc, "reason", None)
+        return "timeout" if isinstance(reason, (socket.timeout, TimeoutError)) else "network"
+    if isinstance(exc, (OSError, zlib.error)):
+        return "network"
+    return "other"
+
+
+def _fetch_and_parse(feed_url: str) -> Any:
+    """Download then parse a feed. Kept as two steps so fetch and parse cost can be measured separately."""
+    metrics.FEED_FETCHES.inc()
+    start = time.perf_counter()
+    try:
+        body, headers = _download_feed(feed_url)
+    except Exception as e:
+        metrics.FEED_ERRORS.inc(_error_type(e))
+        raise
+    finally:
+        metrics.FEED_FETCH_SECONDS.inc(amount=time.perf_counter() - start)
+    metrics.FEED_BYTES.inc(amount=len(body))
+    start = time.perf_counter()
+    try:
+        parsed = _parse_feed(body, headers)
+    except Exception:
+        metrics.FEED_ERRORS.inc("parse")
+        raise
+    finally:
+        metrics.FEED_PARSE_SECONDS.inc(amount=time.perf_counter() - start)
+    if getattr(parsed, "bozo", False) and not getattr(parsed, "entries", None):
+        metrics.FEED_ERRORS.inc("parse")
+    return parsed
+
+
 def fetch_podcast_with_episodes(feed_url: str) -> Dict[str, Any]:
     """
     Fetch RSS feed and extract podcast metadata plus all episode entries.
@@ -32,17 +119,12 @@ def fetch_podcast_with_episodes(feed_url: str) -> Dict[str, Any]:
         "entries": [],
     }
     try:
-        parsed = feedparser.parse(
-            feed_url,
-            request_headers={"User-Agent": "PodcastsReviewer/1.0"},
-        )
+        parsed = _fetch_and_parse(feed_url)
+    except FeedNotFoundError:
+        raise
     except Exception:
         return result
 
-    status = getattr(parsed, "status", None)
-    if status in (404, 410):
-        raise FeedNotFoundError(status)
-
     feed = getattr(parsed, "feed", None)
     if not feed:
         return result
@@ -248,10 +330,7 @@ def fetch_podcast_metadata(feed_url: str) -> Dict[str, Any]:
         "image_url": None,
     }
     try:
-        parsed = feedparser.parse(
-            feed_url,
-            request_headers={"User-Agent": "PodcastsReviewer/1.0"},
-        )
+        parsed = _fetch_and_parse(feed_url)
     except Exception:
         return result
 
@@ -1,47 +1,27 @@
 #!/usr/bin/env python3
 """
-One-time backfill: set playing_status = 1 (Not Played) for episodes that have
-no listening_history row or have playing_status = 0.
+One-time backfill: set playing_status = 1 (Not Played) for listening_history rows
+with playing_status = 0. Episodes without a listening_history row are already
+read as Not Played, so no rows are inserted for them (see compact_listening_history.py
+to remove placeholder rows written by earlier versions).
 Run from project root: python backfill_episode_status.py
 """
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from config import get_db_path
-from database import get_connection, upsert_listening_history
+from database import NOT_PLAYED_STATUS, get_connection, now_ms
 
 
 def main(db_path: Optional[Path] = None) -> None:
     db_path = db_path or get_db_path()
-    inserted = 0
-    updated = 0
     with get_connection(db_path) as conn:
         cur = conn.execute(
-            """
-            SELECT e.uuid, e.duration
-            FROM episodes e
-            WHERE e.deleted_at IS NULL
-              AND NOT EXISTS (SELECT 1 FROM listening_history lh WHERE lh.episode_uuid = e.uuid)
-            """
-        )
-        rows = [dict(row) for row in cur.fetchall()]
-        for row in rows:
-            upsert_listening_history(
-                row["uuid"],
-                played_up_to=0,
-                duration=row["duration"] if row["duration"] is not None else 0,
-                playing_status=1,
-                conn=conn,
-            )
-            inserted += 1
-        now = datetime.utcnow().isoformat() + "Z"
-        cur = conn.execute(
-            "UPDATE listening_history SET playing_status = 1, updated_at = ? WHERE playing_status = 0",
-            (now,),
+            "UPDATE listening_history SET playing_status = ?, updated_at = ? WHERE playing_status = 0",
+            (NOT_PLAYED_STATUS, now_ms()),
         )
         updated = cur.rowcount
-    print(f"Backfill complete: {inserted} inserted, {updated} updated.")
+    print(f"Backfill complete: {updated} updated.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+# Offline benchmarks and load-test harnesses (run from project root: python -m benchmarks.<name>)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+In-process load test for the FastAPI app. Requests are driven straight through the
+ASGI interface (no sockets, no HTTP client dependency) against an existing database,
+and per-endpoint p50/p95/p99 latency and throughput are written as JSON so runs can
+be compared over time.
+
+Run from project root:
+  python -m benchmarks.library_generator /tmp/large.db
+  python -m benchmarks.api_load --db /tmp/large.db --requests 200 --concurrency 8
+  python -m benchmarks.api_load --db /tmp/large.db --compare benchmarks/results/api_load-<previous>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+
+async def asgi_request(app: Callable, method: str, path: str, query: str = "",
+                       headers: Optional[List[Tuple[bytes, bytes]]] = None,
+                       body: bytes = b"") -> Tuple[int, Dict[str, str], bytes]:
+    """Send one request through an ASGI app; return (status, headers, body)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"loadtest")] + list(headers or []),
+        "client": ("127.0.0.1", 50000),
+        "server": ("loadtest", 80),
+    }
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    status = 0
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers.update({k.decode().lower(): v.decode() for k, v in message.get("headers", [])})
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, response_headers, b"".join(chunks)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], wall_seconds: float, errors: int, total_bytes: int) -> Dict[str, Any]:
+    values = sorted(latencies)
+    n = len(values)
+    return {
+        "requests": n,
+        "errors": errors,
+        "p50_ms": round(_percentile(values, 50) * 1000, 2),
+        "p95_ms": round(_percentile(values, 95) * 1000, 2),
+        "p99_ms": round(_percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        "mean_ms": round(sum(values) / n * 1000, 2) if n else 0.0,
+        "throughput_rps": round(n / wall_seconds, 1) if wall_seconds else 0.0,
+        "mean_bytes": int(total_bytes / n) if n else 0,
+    }
+
+
+def _sample_ids(db_path: Path) -> Dict[str, str]:
+    """Pick representative uuids and a search term from the target database."""
+    from database import get_connection
+    with get_connection(db_path) as conn:
+        busiest = conn.execute(
+            "SELECT podcast_uuid, COUNT(*) AS n FROM episodes GROUP BY podcast_uuid ORDER BY n DESC LIMIT 1"
+        ).fetchone()
+        episode = conn.execute(
+            "SELECT uuid, title FROM episodes WHERE deleted_at IS NULL ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+    if not busiest or not episode:
+        raise SystemExit(f"No episodes in {db_path}; generate a library first (python -m benchmarks.library_generator)")
+    term = next((w for w in (episode["title"] or "").split() if len(w) > 3 and w.isalpha()), "episode")
+    return {"podcast_uuid": busiest["podcast_uuid"], "episode_uuid": episode["uuid"], "term": term.lower()}
+
+
+def default_endpoints(ids: Dict[str, str]) -> List[Tuple[str, str, str]]:
+    """(name, path, query) for each endpoint under test."""
+    return [
+        ("episodes_last_played", "/api/episodes", "limit=100"),
+        ("episodes_last_played_full", "/api/episodes", "limit=100&fields=full"),
+        ("episodes_title", "/api/episodes", "limit=100&sort=title"),
+        ("episodes_published_offset", "/api/episodes", "limit=100&offset=5000&sort=published"),
+        ("episodes_in_progress", "/api/episodes", "limit=100&playing_status=2"),
+        ("episodes_played_500", "/api/episodes", "limit=500&playing_status=played"),
+        ("episode_detail", f"/api/episodes/{ids['episode_uuid']}", ""),
+        ("podcast_episodes", f"/api/podcasts/{ids['podcast_uuid']}/episodes", "limit=100"),
+        ("podcast_episodes_full", f"/api/podcasts/{ids['podcast_uuid']}/episodes", "limit=100&fields=full"),
+        ("podcasts", "/api/podcasts", "limit=100"),
+        ("podcasts_search", "/api/podcasts", f"search={ids['term']}"),
+        ("search", "/api/search", f"q={ids['term']}"),
+        ("stats_summary", "/api/stats/summary", ""),
+        ("stats_top_hours", "/api/stats/top-podcasts", "sort=hours"),
+        ("stats_top_episodes", "/api/stats/top-podcasts", "sort=episodes"),
+    ]
+
+
+async def run_endpoint(app: Callable, path: str, query: str, requests: int, concurrency: int,
+                       warmup: int = 2) -> Dict[str, Any]:
+    """Fire requests against one endpoint with bounded concurrency; return summary."""
+    for _ in range(warmup):
+        await asgi_request(app, "GET", path, query)
+    latencies: List[float] = []
+    errors = 0
+    total_bytes = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        nonlocal errors, total_bytes
+        async with semaphore:
+            start = time.perf_counter()
+            status, _, body = await asgi_request(app, "GET", path, query)
+            latencies.append(time.perf_counter() - start)
+            total_bytes += len(body)
+            if status >= 400:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return summarize(latencies, time.perf_counter() - wall_start, errors, total_bytes)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _print_results(results: Dict[str, Dict[str, Any]], previous: Optional[Dict[str, Any]] = None) -> None:
+    header = f"{'endpoint':<28} {'req':>5} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'bytes':>9}"
+    if previous:
+        header += f" {'p95 vs prev':>12}"
+    print(header)
+    print("-" * len(header))
+    prev_endpoints = (previous or {}).get("endpoints", {})
+    for name, r in results.items():
+        line = (
+            f"{name:<28} {r['requests']:>5} {r['errors']:>4} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['throughput_rps']:>8.1f} {r['mean_bytes']:>9}"
+        )
+        if previous:
+            before = prev_endpoints.get(name, {}).get("p95_ms")
+            line += f" {(r['p95_ms'] / before - 1) * 100:>+11.1f}%" if before else f" {'-':>12}"
+        print(line)
+
+
+async def run_load_test(db_path: Path, requests: int, concurrency: int,
+                        only: Optional[List[str]] = None) -> Dict[str, Any]:
+    os.environ["PODCASTS_DB_PATH"] = str(db_path)
+    from api.main import app
+    from database import get_connection
+
+    ids = _sample_ids(db_path)
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, path, query in default_endpoints(ids):
+        if only and name not in only:
+            continue
+        results[name] = await run_endpoint(app, path, query, requests, concurrency)
+        print(f"  {name}: p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+    with get_connection(db_path) as conn:
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) AS n FROM {table}").fetchone()["n"]
+            for table in ("podcasts", "episodes", "listening_history", "play_sessions")
+        }
+    return {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "git_commit": _git_commit(),
+        "db": {"path": str(db_path), "size_bytes": db_path.stat().st_size, "rows": counts},
+        "config": {"requests": requests, "concurrency": concurrency},
+        "endpoints": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-process API load test with latency percentiles.")
+    parser.add_argument("--db", type=Path, required=True, help="Database to test (see benchmarks.library_generator)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", nargs="+", default=None, help="Endpoint names to run")
+    parser.add_argument("--output", type=Path, default=None, help="JSON output (default: benchmarks/results/api_load-<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous results JSON to compare against")
+    args = parser.parse_args()
+    if not args.db.exists():
+        parser.error(f"Database not found: {args.db}")
+
+    report = asyncio.run(run_load_test(args.db, args.requests, args.concurrency, args.only))
+    previous = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    _print_results(report["endpoints"], previous)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"api_load-{report['timestamp'].replace(':', '')}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
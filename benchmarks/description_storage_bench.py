@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+DB size and episodes-scan speed with inline descriptions (schema v5) against the
+compressed, deduplicated episode_descriptions side table (schema v6+).
+
+A legacy copy of the source database's podcasts and episodes is built in a temporary
+directory (optionally replacing a share of descriptions with repeated boilerplate, as
+real feeds do), measured, migrated with init_schema, vacuumed and measured again.
+
+Run from project root:
+  python -m benchmarks.description_storage_bench --db /tmp/small.db
+"""
+import argparse
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database import decode_description, init_schema, ms_to_iso
+
+# episodes as created before schema v6
+LEGACY_EPISODES = """
+CREATE TABLE episodes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid TEXT UNIQUE NOT NULL,
+    podcast_uuid TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    duration REAL,
+    published_date REAL,
+    file_url TEXT,
+    file_type TEXT,
+    size_bytes INTEGER,
+    video_url TEXT,
+    deleted_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+SCANS = {
+    "count_active": "SELECT COUNT(*) FROM episodes WHERE deleted_at IS NULL",
+    "sum_duration": "SELECT SUM(duration) FROM episodes",
+    "merge_candidates": "SELECT uuid, podcast_uuid, title, published_date, file_url, created_at FROM episodes WHERE deleted_at IS NULL",
+}
+
+
+def _build_legacy(source: Path, target: Path, boilerplate_share: float, seed: int) -> None:
+    conn = sqlite3.connect(str(target))
+    conn.create_function("decode_description", 2, decode_description, deterministic=True)
+    conn.create_function("ms_to_iso", 1, ms_to_iso, deterministic=True)
+    conn.execute("ATTACH DATABASE ? AS src", (str(source),))
+    conn.execute("CREATE TABLE podcasts AS SELECT * FROM src.podcasts")
+    conn.execute(LEGACY_EPISODES)
+    columns = [row[1] for row in conn.execute("PRAGMA src.table_info(episodes)").fetchall()]
+    description = (
+        "e.description" if "description" in columns
+        else "(SELECT decode_description(d.codec, d.body) FROM src.episode_descriptions d WHERE d.id = e.description_id)"
+    )
+    conn.execute(
+        f"""INSERT INTO episodes (id, uuid, podcast_uuid, title, description, duration, published_date, file_url,
+                                  file_type, size_bytes, video_url, deleted_at, created_at, updated_at)
+            SELECT e.id, e.uuid, e.podcast_uuid, e.title, {description}, e.duration, e.published_date, e.file_url,
+                   e.file_type, e.size_bytes, e.video_url, ms_to_iso(e.deleted_at), ms_to_iso(e.created_at), ms_to_iso(e.updated_at)
+            FROM src.episodes e"""
+    )
+    if boilerplate_share > 0:
+        # Per-podcast boilerplate: the same show notes repeated across that podcast's episodes
+        rng = random.Random(seed)
+        rows = conn.execute("SELECT id, podcast_uuid, description FROM episodes WHERE description IS NOT NULL").fetchall()
+        templates: Dict[str, str] = {}
+        updates = []
+        for episode_id, podcast_uuid, text in rows:
+            if rng.random() < boilerplate_share:
+                updates.append((templates.setdefault(podcast_uuid, text), episode_id))
+        conn.executemany("UPDATE episodes SET description = ? WHERE id = ?", updates)
+    conn.execute("CREATE INDEX idx_episodes_podcast_uuid ON episodes(podcast_uuid)")
+    conn.execute("CREATE TABLE _schema_meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("INSERT INTO _schema_meta VALUES ('schema_version', '5')")
+    conn.commit()
+    conn.execute("DETACH DATABASE src")
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _measure(db_path: Path, repeat: int) -> Dict[str, Any]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        result: Dict[str, Any] = {"size_mb": round(db_path.stat().st_size / 1e6, 1)}
+        for name, sql in SCANS.items():
+            result[f"{name}_ms"] = round(_best_of(lambda: conn.execute(sql).fetchall(), repeat) * 1000, 1)
+        return result
+    finally:
+        conn.close()
+
+
+def run(source: Path, boilerplate_share: float, repeat: int, seed: int) -> Dict[str, Any]:
+    tmpdir = Path(tempfile.mkdtemp(prefix="audiophile_desc_"))
+    try:
+        db_path = tmpdir / "legacy.db"
+        _build_legacy(source, db_path, boilerplate_share, seed)
+        before = _measure(db_path, repeat)
+        start = time.perf_counter()
+        init_schema(db_path)
+        migrate_seconds = time.perf_counter() - start
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("VACUUM")
+        stats = conn.execute("SELECT COUNT(*), SUM(size), SUM(length(body)) FROM episode_descriptions").fetchone()
+        referenced = conn.execute("SELECT COUNT(*) FROM episodes WHERE description_id IS NOT NULL").fetchone()[0]
+        conn.close()
+        after = _measure(db_path, repeat)
+        return {
+            "before": before,
+            "after": after,
+            "migrate_seconds": round(migrate_seconds, 1),
+            "episodes_with_description": referenced,
+            "distinct_descriptions": stats[0],
+            "raw_mb": round((stats[1] or 0) / 1e6, 1),
+            "stored_mb": round((stats[2] or 0) / 1e6, 1),
+        }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare inline vs compressed side-table episode descriptions.")
+    parser.add_argument("--db", type=Path, required=True, help="Source library (see benchmarks.library_generator)")
+    parser.add_argument("--boilerplate-share", type=float, default=0.2,
+                        help="Share of episodes whose description is replaced by their podcast's boilerplate")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        parser.error(f"Database not found: {args.db}")
+    r = run(args.db, args.boilerplate_share, args.repeat, args.seed)
+    print(f"Descriptions: {r['episodes_with_description']} episodes -> {r['distinct_descriptions']} distinct, "
+          f"{r['raw_mb']} MB raw -> {r['stored_mb']} MB stored (migration {r['migrate_seconds']}s)")
+    print(f"{'':<22} {'inline (v5)':>12} {'side table':>16}")
+    for key in r["before"]:
+        print(f"{key:<22} {r['before'][key]:>12} {r['after'][key]:>16}")
+
+
+if __name__ == "__main__":
+    main()
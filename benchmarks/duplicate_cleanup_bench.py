@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Duplicate podcast cleanup timings: copies a generated library, adds 0-episode duplicates of a
+share of its podcasts (same feed URL spelled differently, or same title under another feed URL,
+as OPML imports leave them), then times the cleanup's preview (dry run) and the actual deletion.
+
+Build a 10k-podcast library first, e.g.:
+  python -m benchmarks.library_generator /tmp/podcasts_10k.db --podcasts 10000 --episodes 200000 --history 0 --sessions 0 --description-bytes 200
+
+Run from project root:
+  python -m benchmarks.duplicate_cleanup_bench --db /tmp/podcasts_10k.db
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database import get_connection, init_schema, upsert_podcast
+from api.services.duplicate_cleanup import remove_duplicate_podcasts
+
+
+def add_duplicates(db: Path, share: float, seed: int = 7) -> int:
+    """Insert a 0-episode duplicate for roughly share of the active podcasts; return how many."""
+    rng = random.Random(seed)
+    added = 0
+    with get_connection(db) as conn:
+        rows = conn.execute("SELECT uuid, title, feed_url FROM podcasts WHERE deleted_at IS NULL").fetchall()
+        for row in rows:
+            if rng.random() >= share:
+                continue
+            if rng.random() < 0.5 and row["feed_url"]:
+                # Same feed, different spelling: http, upper-case host, trailing slash
+                feed_url = row["feed_url"].replace("https://", "http://").replace("feeds.example", "FEEDS.example") + "/"
+                title = f"{row['title']} (imported)"
+            else:
+                feed_url = f"https://mirror.example.net/{row['uuid']}.xml"
+                title = row["title"]
+            upsert_podcast(uuid=f"{row['uuid']}-dup", title=title, feed_url=feed_url, conn=conn)
+            added += 1
+    return added
+
+
+def run(db: Path, share: float) -> Dict[str, Any]:
+    tmpdir = Path(tempfile.mkdtemp(prefix="audiophile_cleanup_"))
+    try:
+        target = tmpdir / "library.db"
+        shutil.copy(db, target)
+        init_schema(target)
+        added = add_duplicates(target, share)
+        with get_connection(target) as conn:
+            podcasts = conn.execute("SELECT COUNT(*) FROM podcasts").fetchone()[0]
+        start = time.perf_counter()
+        preview = remove_duplicate_podcasts(db_path=target, dry_run=True)
+        preview_s = time.perf_counter() - start
+        start = time.perf_counter()
+        applied = remove_duplicate_podcasts(db_path=target)
+        apply_s = time.perf_counter() - start
+        remaining = remove_duplicate_podcasts(db_path=target, dry_run=True)
+        return {
+            "podcasts": podcasts,
+            "duplicates_added": added,
+            "planned": preview.deleted_count,
+            "deleted": applied.deleted_count,
+            "left_after": remaining.deleted_count,
+            "preview_ms": round(preview_s * 1000, 1),
+            "apply_ms": round(apply_s * 1000, 1),
+        }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time duplicate podcast cleanup (preview and apply).")
+    parser.add_argument("--db", type=Path, required=True, help="Library to copy (see benchmarks.library_generator)")
+    parser.add_argument("--share", type=float, default=0.1, help="Share of podcasts that get a duplicate")
+    args = parser.parse_args(argv)
+    r = run(args.db, args.share)
+    for key, value in r.items():
+        print(f"{key:<17} {value}")
+
+
+if __name__ == "__main__":
+    main()
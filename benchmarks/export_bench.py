@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Library export / restore timings: streams the source database to NDJSON and CSV, then restores
+each file into an empty database, reporting rows per second, file size and the export's peak
+Python allocation (tracemalloc), which should stay flat as the library grows.
+
+Build a 1M-row library first (episodes + history + sessions), e.g.:
+  python -m benchmarks.library_generator /tmp/export_1m.db --podcasts 2000 --episodes 450000 --history 450000 --sessions 100000
+
+Run from project root:
+  python -m benchmarks.export_bench --db /tmp/export_1m.db
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from library_export import EXPORT_FORMATS, export_library, restore_library
+
+
+def _timed_export(db: Path, fmt: str, out_path: Path) -> Dict[str, Any]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(out_path, "wb") as out:
+        written = export_library(out, fmt, db_path=db)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 2), "mb": round(written / 1e6, 1), "peak_mb": round(peak / 1e6, 1)}
+
+
+def _timed_restore(src_path: Path, fmt: str, target: Path) -> Dict[str, Any]:
+    start = time.perf_counter()
+    with open(src_path, "rb") as src:
+        counts = restore_library(src, fmt, db_path=target)
+    return {"seconds": round(time.perf_counter() - start, 2), "rows": sum(counts.values())}
+
+
+def run(db: Path, formats: List[str]) -> Dict[str, Dict[str, Any]]:
+    tmpdir = Path(tempfile.mkdtemp(prefix="audiophile_export_"))
+    try:
+        results = {}
+        for fmt in formats:
+            out_path = tmpdir / f"library.{fmt}"
+            exported = _timed_export(db, fmt, out_path)
+            restored = _timed_restore(out_path, fmt, tmpdir / f"restored_{fmt}.db")
+            rows = restored["rows"]
+            results[fmt] = {
+                "rows": rows,
+                "export_s": exported["seconds"],
+                "export_rows_per_s": round(rows / exported["seconds"]) if exported["seconds"] else 0,
+                "file_mb": exported["mb"],
+                "export_peak_mb": exported["peak_mb"],
+                "restore_s": restored["seconds"],
+                "restore_rows_per_s": round(rows / restored["seconds"]) if restored["seconds"] else 0,
+            }
+        return results
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time streaming library export and bulk restore.")
+    parser.add_argument("--db", type=Path, required=True, help="Library to export (see benchmarks.library_generator)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, action="append", default=None, help="Default: both")
+    args = parser.parse_args(argv)
+    results = run(args.db, args.format or list(EXPORT_FORMATS))
+    print(f"{'':<7} {'rows':>9} {'export_s':>9} {'rows/s':>8} {'MB':>7} {'peak_MB':>8} {'restore_s':>10} {'rows/s':>8}")
+    for fmt, r in results.items():
+        print(
+            f"{fmt:<7} {r['rows']:>9} {r['export_s']:>9} {r['export_rows_per_s']:>8} {r['file_mb']:>7} "
+            f"{r['export_peak_mb']:>8} {r['restore_s']:>10} {r['restore_rows_per_s']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Feed URL enrichment from OPML: speed and match accuracy on synthetic titles.
+
+Builds a library of podcasts titled like real shows ("The Kalomi Hour", "Dartor & Pequeen"),
+then an OPML file covering a share of them: half with the stored title, the rest reworded
+(leading "The" dropped, "Podcast" appended, "and" for "&", one word dropped) plus titles not in
+the library. Times the previous per-entry lookup and update loop against enrich_feed_urls (dry
+run and applied), and reports how many reworded titles the fuzzy match recovered and how many
+entries it matched to the wrong podcast.
+
+Run from project root:
+  python -m benchmarks.feed_enrichment_bench --sizes 1000,10000,50000
+"""
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from xml.sax.saxutils import quoteattr
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database import get_connection, init_schema, now_ms, update_podcast_feed_url
+from api.services.feed_url_enrichment import enrich_feed_urls
+from api.utils.opml_parser import iter_opml
+from text_utils import normalize_title
+
+_SYLLABLES = ("ka", "lo", "mi", "ra", "ten", "vo", "shi", "dar", "pe", "nu", "gor", "lis", "ba", "que", "tor", "el")
+_PATTERNS = (
+    "The {0} Hour",
+    "{0} {1}",
+    "{0} & {1}",
+    "The {0} {1} Show",
+    "{0} Radio",
+    "{0} {1} {2}",
+    "Daily {0}",
+    "The {0} {1} Podcast",
+)
+
+
+def _title(rng: random.Random, vocabulary: List[str]) -> str:
+    words = [rng.choice(vocabulary).capitalize() for _ in range(3)]
+    return rng.choice(_PATTERNS).format(*words)
+
+
+def _reword(rng: random.Random, title: str) -> str:
+    if title.startswith("The ") and rng.random() < 0.5:
+        return title[4:]
+    if "&" in title:
+        return title.replace("&", "and")
+    words = title.split()
+    if len(words) > 3 and rng.random() < 0.5:
+        words.pop(rng.randrange(len(words)))
+        return " ".join(words)
+    return f"{title} Podcast"
+
+
+def build_library(db: Path, podcasts: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """Insert podcasts with website-style feed URLs; return (uuid, title) pairs."""
+    rng = random.Random(seed)
+    vocabulary = sorted({"".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(podcasts)})
+    init_schema(db)
+    rows = [(f"bench-{i:06d}", _title(rng, vocabulary)) for i in range(podcasts)]
+    now = now_ms()
+    with get_connection(db) as conn:
+        conn.executemany(
+            """INSERT INTO podcasts (uuid, title, title_norm, feed_url, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(uuid, title, normalize_title(title), f"https://shows.example.com/{uuid}", now, now) for uuid, title in rows],
+        )
+    return rows
+
+
+def build_opml(rows: List[Tuple[str, str]], share: float, seed: int = 11) -> Tuple[bytes, Dict[str, str]]:
+    """OPML for share of the library (half reworded) plus 5% unknown titles; feed URL -> expected uuid."""
+    rng = random.Random(seed)
+    outlines: List[str] = []
+    expected: Dict[str, str] = {}
+    for uuid, title in rng.sample(rows, int(len(rows) * share)):
+        if rng.random() < 0.5:
+            title = _reword(rng, title)
+        feed_url = f"https://feeds.example.com/{uuid}.xml"
+        expected[feed_url] = uuid
+        outlines.append(f"<outline type=\"rss\" text={quoteattr(title)} xmlUrl={quoteattr(feed_url)}/>")
+    for i in range(len(outlines) // 20):
+        outlines.append(f"<outline type=\"rss\" text=\"Unlisted Show {i}\" xmlUrl=\"https://feeds.example.com/unlisted-{i}.xml\"/>")
+    rng.shuffle(outlines)
+    body = "\n".join(outlines)
+    return f'<?xml version="1.0" encoding="utf-8"?>\n<opml version="2.0"><body>\n{body}\n</body></opml>\n'.encode("utf-8"), expected
+
+
+def legacy_enrich(db: Path, content: bytes) -> int:
+    """The previous enrich_feeds_from_opml.py loop: one title lookup and one UPDATE per entry."""
+    updated = 0
+    with get_connection(db) as conn:
+        for entry in iter_opml(content):
+            feed_url = (entry.get("feed_url") or "").strip()
+            if not feed_url:
+                continue
+            key = normalize_title((entry.get("title") or "").strip())
+            candidates = conn.execute(
+                "SELECT uuid FROM podcasts WHERE title_norm = ? AND deleted_at IS NULL LIMIT 2", (key,)
+            ).fetchall()
+            if len(candidates) != 1:
+                continue
+            update_podcast_feed_url(uuid=candidates[0]["uuid"], feed_url=feed_url, website_url=None, conn=conn)
+            updated += 1
+    return updated
+
+
+def run(podcasts: int, share: float) -> Dict[str, Any]:
+    tmpdir = Path(tempfile.mkdtemp(prefix="audiophile_enrich_"))
+    try:
+        base = tmpdir / "base.db"
+        rows = build_library(base, podcasts)
+        content, expected = build_opml(rows, share)
+
+        legacy_db = tmpdir / "legacy.db"
+        shutil.copy(base, legacy_db)
+        start = time.perf_counter()
+        legacy_updated = legacy_enrich(legacy_db, content)
+        legacy_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        enrich_feed_urls(content, db_path=base, dry_run=True)
+        dry_run_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = enrich_feed_urls(content, db_path=base)
+        apply_s = time.perf_counter() - start
+
+        wrong = sum(1 for m in report.matches if m.podcast_uuid and expected.get(m.feed_url) != m.podcast_uuid)
+        return {
+            "podcasts": podcasts,
+            "entries": report.entries,
+            "legacy_s": legacy_s,
+            "legacy_updated": legacy_updated,
+            "dry_run_s": dry_run_s,
+            "apply_s": apply_s,
+            "exact": report.exact,
+            "fuzzy": report.fuzzy,
+            "ambiguous": report.ambiguous,
+            "unmatched": report.unmatched,
+            "wrong": wrong,
+        }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark feed URL enrichment from OPML.")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="Comma-separated podcast counts")
+    parser.add_argument("--share", type=float, default=0.5, help="Share of the library listed in the OPML (default 0.5)")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    print(f"{'podcasts':>9} {'entries':>8} {'legacy':>9} {'dry run':>9} {'apply':>9} {'exact':>7} {'fuzzy':>7} {'ambig':>6} {'unmatch':>8} {'wrong':>6}")
+    for size in sizes:
+        r = run(size, args.share)
+        print(
+            f"{r['podcasts']:>9} {r['entries']:>8} {r['legacy_s']:>8.2f}s {r['dry_run_s']:>8.2f}s {r['apply_s']:>8.2f}s "
+            f"{r['exact']:>7} {r['fuzzy']:>7} {r['ambiguous']:>6} {r['unmatched']:>8} {r['wrong']:>6}"
+        )
+        print(f"{'':>9} legacy loop updated {r['legacy_updated']} (exact titles only)")
+
+
+if __name__ == "__main__":
+    main()
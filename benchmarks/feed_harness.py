@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Offline feed harness: synthetic RSS feeds and a local HTTP server that serves them
+(or replays recorded feed snapshots) so refresh, subscribe and OPML import can be
+benchmarked and regression-tested without touching real podcast hosts.
+
+Run from project root:
+  python -m benchmarks.feed_harness serve --feeds 100
+  python -m benchmarks.feed_harness record urls.txt --out snapshots/
+  python -m benchmarks.feed_harness serve --replay snapshots/
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+# Fixed reference time so generated feeds are byte-identical across runs
+EPOCH_REFERENCE = 1767225600  # 2026-01-01T00:00:00Z
+
+ETAG_MODES = ("strong", "changing", "none")
+
+
+@dataclass
+class FeedSpec:
+    """Shape and server behaviour of one synthetic feed."""
+    feed_id: int
+    items: int = 50
+    description_bytes: int = 2000
+    cadence_days: float = 7.0
+    status: int = 200
+    delay_seconds: float = 0.0
+    etag_mode: str = "strong"
+
+
+@dataclass
+class ServerStats:
+    """Counters collected by the feed server."""
+    requests: int = 0
+    bytes_sent: int = 0
+    not_modified: int = 0
+    by_status: Dict[int, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, status: int, size: int) -> None:
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += size
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+            if status == 304:
+                self.not_modified += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "bytes_sent": self.bytes_sent,
+                "not_modified": self.not_modified,
+                "by_status": {str(k): v for k, v in sorted(self.by_status.items())},
+            }
+
+
+def _filler_html(rng: random.Random, size: int) -> str:
+    """HTML show notes of roughly size bytes."""
+    words = ("podcast", "episode", "guest", "interview", "news", "science", "history",
+             "music", "sponsor", "links", "notes", "discussion", "listener", "question")
+    parts: List[str] = []
+    total = 0
+    while total < size:
+        sentence = " ".join(rng.choice(words) for _ in range(12)).capitalize() + "."
+        chunk = f"<p>{sentence} <a href=\"https://example.com/{rng.randrange(10**6)}\">link</a></p>"
+        parts.append(chunk)
+        total += len(chunk)
+    return "".join(parts)
+
+
+def generate_feed_xml(spec: FeedSpec, base_url: str = "http://127.0.0.1") -> bytes:
+    """Render a deterministic podcast RSS document for spec."""
+    rng = random.Random(spec.feed_id)
+    title = f"Synthetic Podcast {spec.feed_id}"
+    out: List[str] = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">\n<channel>\n',
+        f"<title>{escape(title)}</title>\n",
+        f"<link>https://example.com/podcasts/{spec.feed_id}</link>\n",
+        f"<description>{escape(_filler_html(rng, 400))}</description>\n",
+        f"<itunes:author>Author {spec.feed_id % 997}</itunes:author>\n",
+        f'<itunes:image href="https://example.com/art/{spec.feed_id}.jpg"/>\n',
+    ]
+    for i in range(spec.items):
+        published = EPOCH_REFERENCE - int(i * spec.cadence_days * 86400)
+        duration = 600 + rng.randrange(5400)
+        guid = f"{base_url}/episodes/{spec.feed_id}/{i}"
+        out.append(
+            "<item>\n"
+            f"<title>Episode {spec.items - i}: {escape(rng.choice(('Origins', 'Deep Dive', 'Q&A', 'Live', 'Recap')))}</title>\n"
+            f"<guid isPermaLink=\"true\">{escape(guid)}</guid>\n"
+            f"<pubDate>{formatdate(published, usegmt=True)}</pubDate>\n"
+            f"<description>{escape(_filler_html(rng, spec.description_bytes))}</description>\n"
+            f"<itunes:duration>{duration // 3600}:{(duration // 60) % 60:02d}:{duration % 60:02d}</itunes:duration>\n"
+            f'<enclosure url="https://media.example.com/{spec.feed_id}/{i}.mp3" type="audio/mpeg" length="{duration * 16000}"/>\n'
+            "</item>\n"
+        )
+    out.append("</channel>\n</rss>\n")
+    return "".join(out).encode("utf-8")
+
+
+def build_library(
+    count: int,
+    seed: int = 42,
+    min_items: int = 5,
+    max_items: int = 300,
+    description_bytes: int = 2000,
+    not_found_rate: float = 0.01,
+    gone_rate: float = 0.005,
+    error_rate: float = 0.01,
+    slow_rate: float = 0.01,
+    slow_seconds: float = 0.25,
+    etag_mode: str = "strong",
+) -> List[FeedSpec]:
+    """
+    Build count feed specs with a skewed (Pareto) episode-count distribution and a
+    small share of 404 / 410 / 500 / slow feeds.
+    """
+    rng = random.Random(seed)
+    specs: List[FeedSpec] = []
+    for feed_id in range(count):
+        items = min(max_items, max(min_items, int(min_items * rng.paretovariate(1.1))))
+        roll = rng.random()
+        status, delay = 200, 0.0
+        if roll < not_found_rate:
+            status = 404
+        elif roll < not_found_rate + gone_rate:
+            status = 410
+        elif roll < not_found_rate + gone_rate + error_rate:
+            status = 500
+        elif roll < not_found_rate + gone_rate + error_rate + slow_rate:
+            delay = slow_seconds
+        specs.append(FeedSpec(
+            feed_id=feed_id,
+            items=items,
+            description_bytes=int(description_bytes * rng.uniform(0.25, 2.0)),
+            cadence_days=rng.choice((1.0, 3.5, 7.0, 14.0, 30.0)),
+            status=status,
+            delay_seconds=delay,
+            etag_mode=etag_mode,
+        ))
+    return specs
+
+
+class _Route:
+    """One servable path: a synthetic spec or a recorded snapshot file."""
+
+    def __init__(self, spec: Optional[FeedSpec] = None, snapshot: Optional[Path] = None,
+                 status: int = 200, etag_mode: str = "strong"):
+        self.spec = spec
+        self.snapshot = snapshot
+        self.status = spec.status if spec else status
+        self.delay = spec.delay_seconds if spec else 0.0
+        self.etag_mode = spec.etag_mode if spec else etag_mode
+        self._body: Optional[bytes] = None
+
+    def body(self, base_url: str) -> bytes:
+        if self._body is None:
+            if self.snapshot is not None:
+                self._body = self.snapshot.read_bytes()
+            else:
+                self._body = generate_feed_xml(self.spec, base_url)
+        return self._body
+
+
+class FeedServer:
+    """
+    Threaded local HTTP server for synthetic feeds (/feeds/<id>.xml) and replayed
+    snapshots (/replay/<n>.xml). Honors If-None-Match according to each feed's ETag mode.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.stats = ServerStats()
+        self._routes: Dict[str, _Route] = {}
+        self._etag_counter = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server._handle(self)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_specs(self, specs: List[FeedSpec]) -> List[str]:
+        """Register synthetic feeds; return their URLs in spec order."""
+        urls = []
+        for spec in specs:
+            path = f"/feeds/{spec.feed_id}.xml"
+            self._routes[path] = _Route(spec=spec)
+            urls.append(self.base_url + path)
+        return urls
+
+    def add_snapshots(self, snapshot_dir: Path, count: Optional[int] = None) -> List[str]:
+        """
+        Register recorded snapshots from snapshot_dir (see record_snapshots).
+        When count exceeds the number of snapshots they are cycled under distinct paths.
+        """
+        manifest = json.loads((snapshot_dir / "manifest.json").read_text(encoding="utf-8"))
+        feeds = manifest.get("feeds") or []
+        if not feeds:
+            return []
+        total = count or len(feeds)
+        urls = []
+        for n in range(total):
+            entry = feeds[n % len(feeds)]
+            path = f"/replay/{n}.xml"
+            file_name = entry.get("file")
+            self._routes[path] = _Route(
+                snapshot=snapshot_dir / file_name if file_name else None,
+                status=int(entry.get("status") or 200),
+            )
+            urls.append(self.base_url + path)
+        return urls
+
+    def start(self) -> "FeedServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FeedServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, body: bytes = b"",
+              headers: Optional[Dict[str, str]] = None) -> None:
+        handler.send_response(status)
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if body:
+            handler.wfile.write(body)
+        self.stats.record(status, len(body))
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        route = self._routes.get(handler.path.split("?", 1)[0])
+        if route is None:
+            self._send(handler, 404, b"not found")
+            return
+        if route.delay:
+            time.sleep(route.delay)
+        if route.status != 200 or (route.snapshot is None and route.spec is None):
+            self._send(handler, route.status if route.status != 200 else 404, b"error")
+            return
+        body = route.body(self.base_url)
+        headers = {"Content-Type": "application/rss+xml; charset=utf-8"}
+        if route.etag_mode == "strong":
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        elif route.etag_mode == "changing":
+            with self.stats.lock:
+                self._etag_counter += 1
+                etag = f'"v{self._etag_counter}"'
+        else:
+            etag = None
+        if etag:
+            headers["ETag"] = etag
+            if handler.headers.get("If-None-Match") == etag:
+                self._send(handler, 304, b"", {"ETag": etag})
+                return
+        self._send(handler, 200, body, headers)
+
+
+def record_snapshots(feed_urls: List[str], out_dir: Path, timeout: float = 30.0) -> Dict[str, object]:
+    """
+    Download each feed once and store the raw bytes plus a manifest.json so the
+    same library can be replayed offline with FeedServer.add_snapshots.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    feeds: List[Dict[str, object]] = []
+    for n, url in enumerate(feed_urls):
+        entry: Dict[str, object] = {"url": url, "file": None, "status": None, "etag": None}
+        request = urllib.request.Request(url, headers={"User-Agent": "PodcastsReviewer/1.0"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as resp:
+                body = resp.read()
+                entry["status"] = resp.status
+                entry["etag"] = resp.headers.get("ETag")
+            file_name = f"{n:05d}.xml"
+            (out_dir / file_name).write_bytes(body)
+            entry["file"] = file_name
+        except urllib.error.HTTPError as e:
+            entry["status"] = e.code
+        except Exception as e:
+            entry["status"] = 599
+            entry["error"] = str(e)
+        feeds.append(entry)
+        print(f"[{n + 1}/{len(feed_urls)}] {entry['status']} {url}")
+    manifest = {"recorded_at": formatdate(usegmt=True), "feeds": feeds}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def build_opml(feed_urls: List[str]) -> bytes:
+    """OPML document listing feed_urls (for OPML import benchmarks)."""
+    lines = ['<?xml version="1.0" encoding="utf-8"?>', '<opml version="1.0">', "<head><title>Synthetic</title></head>", "<body>"]
+    for n, url in enumerate(feed_urls):
+        lines.append(f'<outline type="rss" text="Synthetic Podcast {n}" xmlUrl="{escape(url)}"/>')
+    lines.extend(["</body>", "</opml>"])
+    return "\n".join(lines).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic or recorded podcast feeds locally.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Serve synthetic feeds (or replay snapshots) until interrupted")
+    serve.add_argument("--feeds", type=int, default=100, help="Number of synthetic feeds")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--seed", type=int, default=42)
+    serve.add_argument("--etag", choices=ETAG_MODES, default="strong")
+    serve.add_argument("--replay", type=Path, default=None, help="Snapshot directory written by 'record'")
+
+    record = sub.add_parser("record", help="Record real feeds to a snapshot directory")
+    record.add_argument("urls", type=Path, help="Text file with one feed URL per line")
+    record.add_argument("--out", type=Path, required=True)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        urls = [line.strip() for line in args.urls.read_text(encoding="utf-8").splitlines() if line.strip()]
+        record_snapshots(urls, args.out)
+        return
+
+    server = FeedServer(port=args.port)
+    if args.replay:
+        urls = server.add_snapshots(args.replay)
+    else:
+        urls = server.add_specs(build_library(args.feeds, seed=args.seed, etag_mode=args.etag))
+    server.start()
+    print(f"Serving {len(urls)} feeds at {server.base_url} (first: {urls[0] if urls else '-'})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
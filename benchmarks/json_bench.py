@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Serialization cost of 500-row episode pages: the previous Pydantic path (EpisodeResponse
+per row, response_model re-validation, standard encoder) against the fast path in
+api/responses.py (field projection + FastJSONResponse). Also times the SQL for the same
+page and the endpoints end to end over ASGI.
+
+Run from project root:
+  python -m benchmarks.json_bench --db /tmp/small.db
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(db_path: Path, rows: int, repeat: int, requests: int) -> Dict[str, Any]:
+    os.environ["PODCASTS_DB_PATH"] = str(db_path)
+    from pydantic import TypeAdapter
+    from starlette.responses import JSONResponse
+
+    from api.responses import FastJSONResponse, orjson, project_rows
+    from api.schemas import EpisodeResponse
+    from benchmarks.api_load import _sample_ids, run_endpoint
+    from database import get_episodes_list
+
+    page = get_episodes_list(limit=rows, offset=0, sort="published")
+    adapter = TypeAdapter(List[EpisodeResponse])
+
+    def pydantic_path() -> bytes:
+        items = [EpisodeResponse(**dict(row)) for row in page]
+        validated = adapter.validate_python(items, from_attributes=True)
+        return JSONResponse({"items": adapter.dump_python(validated, mode="json"), "total": len(page)}).body
+
+    def fast_path() -> bytes:
+        return FastJSONResponse({"items": project_rows(page, EpisodeResponse), "total": len(page)}).body
+
+    assert json.loads(pydantic_path()) == json.loads(fast_path()), "fast path output differs"
+    result: Dict[str, Any] = {
+        "rows": len(page),
+        "encoder": "orjson" if orjson is not None else "json",
+        "sql_ms": round(_best_of(lambda: get_episodes_list(limit=rows, offset=0, sort="published"), repeat) * 1000, 2),
+        "pydantic_ms": round(_best_of(pydantic_path, repeat) * 1000, 2),
+        "fast_ms": round(_best_of(fast_path, repeat) * 1000, 2),
+        "bytes": len(fast_path()),
+    }
+
+    from api.main import app
+    ids = _sample_ids(db_path)
+    endpoints = {
+        "episodes_500": ("/api/episodes", f"limit={rows}&sort=published"),
+        "podcast_episodes_500": (f"/api/podcasts/{ids['podcast_uuid']}/episodes", f"limit={rows}"),
+    }
+    result["endpoints"] = {
+        name: asyncio.run(run_endpoint(app, path, query, requests, concurrency=1))
+        for name, (path, query) in endpoints.items()
+    }
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serialization cost of 500-row episode pages.")
+    parser.add_argument("--db", type=Path, required=True, help="Database to test (see benchmarks.library_generator)")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions per micro-benchmark (best is kept)")
+    parser.add_argument("--requests", type=int, default=50, help="End-to-end requests per endpoint")
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        parser.error(f"Database not found: {args.db}")
+    r = run(args.db, args.rows, args.repeat, args.requests)
+    print(f"{r['rows']} rows, {r['bytes']} bytes, encoder={r['encoder']}")
+    print(f"  SQL:            {r['sql_ms']:>8.2f} ms")
+    print(f"  Pydantic path:  {r['pydantic_ms']:>8.2f} ms")
+    print(f"  Fast path:      {r['fast_ms']:>8.2f} ms  ({r['pydantic_ms'] / r['fast_ms']:.1f}x)")
+    for name, e in r["endpoints"].items():
+        print(f"  {name:<22} p50 {e['p50_ms']:>8.2f} ms  p95 {e['p95_ms']:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Fill a SQLite database with a synthetic listening library for load tests.
+Podcasts get a skewed (Pareto) episode-count distribution; listening history has
+realistic play states and recency-skewed timestamps. Rows go through the upsert
+helpers in database.py so derived columns stay consistent with the real write path.
+
+Run from project root:
+  python -m benchmarks.library_generator /tmp/large.db                       # 5k podcasts / 1M episodes / 1M history
+  python -m benchmarks.library_generator /tmp/small.db --podcasts 200 --episodes 20000 --history 20000
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database import (
+    get_connection,
+    init_schema,
+    upsert_episode,
+    upsert_listening_history,
+    upsert_podcast,
+)
+
+# Fixed "now" so generated libraries are reproducible
+REFERENCE_NOW = 1767225600.0  # 2026-01-01T00:00:00Z
+
+_WORDS = (
+    "history", "science", "daily", "weekly", "news", "culture", "tech", "money", "story",
+    "crime", "comedy", "sports", "health", "design", "music", "politics", "hour", "show",
+)
+
+# Pocket Casts playing_status share: 1=not played, 2=in progress, 3=completed
+PLAY_STATE_WEIGHTS = ((1, 0.55), (2, 0.12), (3, 0.33))
+
+
+def _ms(ts: float) -> int:
+    return int(ts * 1000)
+
+
+def _title(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).title()
+
+
+def _description(rng: random.Random, mean_bytes: int) -> str:
+    """HTML show notes with a log-normal size around mean_bytes."""
+    target = int(rng.lognormvariate(math.log(max(mean_bytes, 1)), 0.6))
+    parts: List[str] = []
+    total = 0
+    while total < target:
+        chunk = f"<p>{_title(rng, 10)}. <a href=\"https://example.com/{rng.randrange(10**7)}\">Link</a></p>"
+        parts.append(chunk)
+        total += len(chunk)
+    return "".join(parts)
+
+
+def _episode_counts(rng: random.Random, podcasts: int, episodes: int) -> List[int]:
+    """Split episodes across podcasts with a heavy-tailed distribution (every podcast gets at least one)."""
+    weights = [rng.paretovariate(1.2) for _ in range(podcasts)]
+    total_weight = sum(weights)
+    spare = max(episodes - podcasts, 0)
+    counts = [1 + int(spare * w / total_weight) for w in weights]
+    # Hand out rounding leftovers to the largest podcasts
+    leftover = episodes - sum(counts)
+    order = sorted(range(podcasts), key=lambda i: weights[i], reverse=True)
+    for i in range(max(leftover, 0)):
+        counts[order[i % podcasts]] += 1
+    return counts
+
+
+def generate_library(
+    db_path: Path,
+    podcasts: int = 5000,
+    episodes: int = 1_000_000,
+    history: int = 1_000_000,
+    sessions: int = 100_000,
+    description_bytes: int = 1500,
+    seed: int = 7,
+    batch_size: int = 5000,
+    progress: bool = True,
+) -> dict:
+    """Generate the library into db_path (created if needed); return row counts and elapsed seconds."""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    init_schema(db_path)
+    history = min(history, episodes)
+    counts = _episode_counts(rng, podcasts, episodes)
+
+    episode_refs: List[tuple] = []  # (uuid, duration, published_date)
+    with get_connection(db_path) as conn:
+        conn.execute("PRAGMA synchronous = OFF")
+        for p in range(podcasts):
+            upsert_podcast(
+                uuid=f"gen-podcast-{p:06d}",
+                title=f"{_title(rng, 2)} {p}",
+                author=f"Author {p % 1777}",
+                description=_description(rng, 600),
+                feed_url=f"https://feeds.example.com/{p}.xml",
+                website_url=f"https://example.com/{p}",
+                image_url=f"https://images.example.com/{p}.jpg",
+                deleted_at=_ms(REFERENCE_NOW) if rng.random() < 0.03 else None,
+                is_ended=rng.random() < 0.05,
+                conn=conn,
+            )
+        written = 0
+        for p, count in enumerate(counts):
+            cadence = rng.choice((1, 3.5, 7, 14, 30)) * 86400
+            newest = REFERENCE_NOW - rng.uniform(0, 60 * 86400)
+            for i in range(count):
+                uuid = f"gen-ep-{p:06d}-{i:06d}"
+                duration = float(rng.randrange(300, 10800))
+                published = newest - i * cadence
+                upsert_episode(
+                    uuid=uuid,
+                    podcast_uuid=f"gen-podcast-{p:06d}",
+                    title=f"Episode {count - i}: {_title(rng, rng.randrange(2, 7))}",
+                    description=_description(rng, description_bytes),
+                    duration=duration,
+                    published_date=published,
+                    file_url=f"https://media.example.com/{p}/{i}.mp3",
+                    file_type="audio/mpeg",
+                    size_bytes=int(duration * 16000),
+                    deleted_at=None,
+                    conn=conn,
+                )
+                episode_refs.append((uuid, duration, published))
+                written += 1
+                if written % batch_size == 0:
+                    conn.commit()
+                    if progress:
+                        print(f"  episodes: {written}/{episodes}", end="\r", file=sys.stderr)
+
+        statuses = [s for s, _ in PLAY_STATE_WEIGHTS]
+        weights = [w for _, w in PLAY_STATE_WEIGHTS]
+        for n, (uuid, duration, published) in enumerate(rng.sample(episode_refs, history)):
+            status = rng.choices(statuses, weights)[0]
+            if status == 3:
+                played = duration
+            elif status == 2:
+                played = duration * rng.uniform(0.05, 0.95)
+            else:
+                played = 0.0
+            # Recency-skewed: most listening in the last few months
+            last_played = min(REFERENCE_NOW, max(published, REFERENCE_NOW - rng.expovariate(1 / (90 * 86400))))
+            upsert_listening_history(
+                uuid,
+                played_up_to=played,
+                duration=duration,
+                playing_status=status,
+                first_played_at=_ms(max(published, last_played - rng.uniform(0, 7 * 86400))),
+                last_played_at=_ms(last_played),
+                play_count=1 if status == 1 else rng.choice((1, 1, 1, 2, 3)),
+                conn=conn,
+            )
+            if (n + 1) % batch_size == 0:
+                conn.commit()
+                if progress:
+                    print(f"  history: {n + 1}/{history}        ", end="\r", file=sys.stderr)
+
+        session_rows = []
+        for _ in range(sessions):
+            uuid, duration, published = rng.choice(episode_refs)
+            started = REFERENCE_NOW - rng.expovariate(1 / (60 * 86400))
+            length = rng.uniform(60, min(duration, 3600))
+            played_from = rng.uniform(0, max(duration - length, 0))
+            session_rows.append((uuid, _ms(started), _ms(started + length), length, played_from, played_from + length))
+        for i in range(0, len(session_rows), batch_size):
+            conn.executemany(
+                """INSERT INTO play_sessions (episode_uuid, started_at, ended_at, duration_seconds, played_from, played_to)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                session_rows[i:i + batch_size],
+            )
+        conn.execute("ANALYZE")
+    if progress:
+        print(file=sys.stderr)
+    return {
+        "podcasts": podcasts,
+        "episodes": episodes,
+        "history": history,
+        "sessions": sessions,
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic listening library for load tests.")
+    parser.add_argument("db", type=Path, help="Target SQLite database (should not already contain data)")
+    parser.add_argument("--podcasts", type=int, default=5000)
+    parser.add_argument("--episodes", type=int, default=1_000_000)
+    parser.add_argument("--history", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--description-bytes", type=int, default=1500, help="Mean episode description size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    if args.db.exists():
+        parser.error(f"{args.db} already exists; choose a new path")
+    result = generate_library(
+        args.db,
+        podcasts=args.podcasts,
+        episodes=args.episodes,
+        history=args.history,
+        sessions=args.sessions,
+        description_bytes=args.description_bytes,
+        seed=args.seed,
+    )
+    print(
+        f"Generated {result['podcasts']} podcasts, {result['episodes']} episodes, "
+        f"{result['history']} history rows, {result['sessions']} sessions in {result['seconds']}s -> {args.db}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Before/after throughput for request logging middleware: the previous BaseHTTPMiddleware
+implementation against the pure-ASGI RequestLogMiddleware (and no logging middleware as a
+floor). Each variant wraps the same routers; requests go through the ASGI interface with
+logging enabled at INFO into a null handler so formatting cost is included.
+
+Run from project root:
+  python -m benchmarks.library_generator /tmp/small.db --podcasts 200 --episodes 20000 --history 20000
+  python -m benchmarks.middleware_bench --db /tmp/small.db --requests 3000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+VARIANTS = ("none", "base_http", "asgi")
+
+
+def _legacy_middleware():
+    """The BaseHTTPMiddleware request logger as it was before the pure-ASGI rewrite."""
+    from starlette.middleware.base import BaseHTTPMiddleware
+
+    import db_trace
+
+    logger = logging.getLogger("benchmarks.legacy_log")
+
+    class LogRequestsMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            start = time.perf_counter()
+            token = db_trace.begin_request()
+            try:
+                response = await call_next(request)
+                db_stats = db_trace.current_request_stats()
+            finally:
+                db_trace.end_request(token)
+            duration = time.perf_counter() - start
+            response.headers["X-DB-Time"] = f"{db_stats.seconds * 1000:.1f}ms"
+            response.headers["X-DB-Queries"] = str(db_stats.queries)
+            path = request.url.path
+            if request.url.query and len(request.url.query) <= 80:
+                path = f"{path}?{request.url.query}"
+            logger.info(
+                "%s %s %d %.2fs db=%.3fs/%dq",
+                request.method, path, response.status_code, duration, db_stats.seconds, db_stats.queries,
+            )
+            return response
+
+    return LogRequestsMiddleware
+
+
+def build_app(variant: str):
+    """Same routers as api.main, with only the request logging middleware varying."""
+    from fastapi import FastAPI
+
+    from api.middleware import RequestLogMiddleware
+    from api.routers import episodes, podcasts, stats
+    from api.routers.search import router as search_router
+
+    app = FastAPI()
+    if variant == "base_http":
+        app.add_middleware(_legacy_middleware())
+    elif variant == "asgi":
+        app.add_middleware(RequestLogMiddleware, sample_rate=1.0, route_levels={})
+    app.include_router(podcasts.router, prefix="/api/podcasts")
+    app.include_router(episodes.router, prefix="/api/episodes")
+    app.include_router(stats.router, prefix="/api/stats")
+    app.include_router(search_router, prefix="/api")
+
+    @app.get("/api/health")
+    def health():
+        return {"status": "ok"}
+
+    return app
+
+
+async def run(db_path: Path, requests: int, concurrency: int, rounds: int) -> Dict[str, Any]:
+    os.environ["PODCASTS_DB_PATH"] = str(db_path)
+    from benchmarks.api_load import _sample_ids, run_endpoint
+
+    for name in ("api.middleware", "benchmarks.legacy_log"):
+        log = logging.getLogger(name)
+        log.setLevel(logging.INFO)
+        log.addHandler(logging.NullHandler())
+        log.propagate = False
+
+    ids = _sample_ids(db_path)
+    endpoints = [
+        ("episode_detail", f"/api/episodes/{ids['episode_uuid']}", ""),
+        ("health", "/api/health", ""),
+    ]
+    apps = {variant: build_app(variant) for variant in VARIANTS}
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, path, query in endpoints:
+        results[name] = {}
+        # Interleave variants across rounds and keep the best so background noise does not pick a winner
+        for _ in range(rounds):
+            for variant, app in apps.items():
+                r = await run_endpoint(app, path, query, requests, concurrency, warmup=20)
+                best = results[name].get(variant)
+                if best is None or r["throughput_rps"] > best["throughput_rps"]:
+                    results[name][variant] = r
+    return {"config": {"requests": requests, "concurrency": concurrency, "rounds": rounds}, "endpoints": results}
+
+
+def _print(report: Dict[str, Any]) -> None:
+    header = f"{'endpoint':<16} {'variant':<10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'vs base_http':>13}"
+    print(header)
+    print("-" * len(header))
+    for name, variants in report["endpoints"].items():
+        baseline = variants["base_http"]["throughput_rps"]
+        for variant, r in variants.items():
+            delta = (r["throughput_rps"] / baseline - 1) * 100 if baseline else 0.0
+            print(f"{name:<16} {variant:<10} {r['throughput_rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {delta:>+12.1f}%")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Throughput of request logging middleware variants.")
+    parser.add_argument("--db", type=Path, required=True, help="Database to test (see benchmarks.library_generator)")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per endpoint per round")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON")
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        parser.error(f"Database not found: {args.db}")
+    report = asyncio.run(run(args.db, args.requests, args.concurrency, args.rounds))
+    _print(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
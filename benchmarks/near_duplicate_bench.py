@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate episode detection (MinHash / LSH) speed and accuracy on synthetic titles.
+
+Episodes are generated in memory ("Ep 12: Word word word"), spread over podcasts with a skewed
+size distribution. A share of them get a near-duplicate: renumbered ("12 - ..."), marked as a
+rebroadcast with a new publish date and the same duration, or with a one-character typo. The
+detector runs per podcast at each size; the table shows time, candidate pairs checked against
+the pairs an all-pairs comparison would need, and recall / precision against the injected pairs.
+
+Run from project root:
+  python -m benchmarks.near_duplicate_bench --sizes 10000,100000,1000000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from api.services.near_duplicate_episodes import find_near_duplicate_groups
+from text_utils import normalize_title
+
+_SYLLABLES = ("ka", "lo", "mi", "ra", "ten", "vo", "shi", "dar", "pe", "nu", "gor", "lis", "ba", "que", "tor", "el")
+REFERENCE_NOW = 1767225600.0
+
+
+def _vocabulary(rng: random.Random, size: int = 3000) -> List[str]:
+    return sorted({"".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)})
+
+
+def _variant(rng: random.Random, number: int, words: str) -> str:
+    kind = rng.randrange(3)
+    if kind == 0:
+        return f"{number} - {words.title()}"
+    if kind == 1:
+        return f"Episode {number}: {words} (Rebroadcast)"
+    cut = rng.randrange(len(words))
+    return f"Ep {number}: {words[:cut]}{words[cut + 1:]}"
+
+
+def build_podcasts(episodes: int, duplicate_share: float, seed: int = 7) -> Tuple[List[List[Dict[str, Any]]], Set[Tuple[int, int, int]]]:
+    """Podcasts as lists of episode dicts, plus the injected (podcast, original, copy) index triples."""
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng)
+    podcasts: List[List[Dict[str, Any]]] = []
+    truth: Set[Tuple[int, int, int]] = set()
+    remaining = episodes
+    while remaining > 0:
+        size = min(remaining, max(5, int(rng.paretovariate(1.2) * 40)))
+        rows: List[Dict[str, Any]] = []
+        for n in range(size):
+            if rows and rng.random() < duplicate_share:
+                original = rng.randrange(len(rows))
+                src = rows[original]
+                republished = rng.random() < 0.5
+                rows.append({
+                    "title_norm": normalize_title(_variant(rng, src["number"], src["words"])),
+                    "published_date": src["published_date"] + (rng.randint(400, 3000) * 86400 if republished else rng.randint(0, 3600)),
+                    "duration": src["duration"] + rng.randint(-30, 30),
+                    "number": src["number"],
+                    "words": src["words"],
+                })
+                truth.add((len(podcasts), original, len(rows) - 1))
+                continue
+            words = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(3, 7)))
+            rows.append({
+                "title_norm": normalize_title(f"Ep {n + 1}: {words}"),
+                "published_date": REFERENCE_NOW - (size - n) * 7 * 86400,
+                "duration": rng.randint(600, 7200),
+                "number": n + 1,
+                "words": words,
+            })
+        podcasts.append(rows)
+        remaining -= size
+    return podcasts, truth
+
+
+def run(episodes: int, duplicate_share: float) -> Dict[str, Any]:
+    podcasts, truth = build_podcasts(episodes, duplicate_share)
+    start = time.perf_counter()
+    found: Set[Tuple[int, int, int]] = set()
+    checked = 0
+    for p, rows in enumerate(podcasts):
+        groups, _similarities, pairs = find_near_duplicate_groups(rows)
+        checked += pairs
+        for group in groups:
+            found.update((p, i, j) for x, i in enumerate(group) for j in group[x + 1:])
+    seconds = time.perf_counter() - start
+    # A copy of a copy is also a true pair with its original: close truth transitively per group
+    true_pairs = set(truth)
+    by_copy = {(p, j): i for p, i, j in truth}
+    for p, i, j in truth:
+        root = i
+        while (p, root) in by_copy:
+            root = by_copy[(p, root)]
+        true_pairs.add((p, min(root, j), max(root, j)))
+    hits = len(found & true_pairs)
+    return {
+        "episodes": episodes,
+        "podcasts": len(podcasts),
+        "seconds": round(seconds, 2),
+        "us_per_episode": round(seconds / episodes * 1e6, 1),
+        "pairs_checked": checked,
+        "all_pairs": sum(len(r) * (len(r) - 1) // 2 for r in podcasts),
+        "recall": round(len(found & set(truth)) / len(truth), 3) if truth else 1.0,
+        "precision": round(hits / len(found), 3) if found else 1.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time MinHash/LSH near-duplicate episode detection.")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated episode counts")
+    parser.add_argument("--duplicate-share", type=float, default=0.02, help="Share of episodes that are near-duplicates")
+    args = parser.parse_args(argv)
+    print(f"{'episodes':>9} {'podcasts':>8} {'seconds':>8} {'us/ep':>6} {'pairs':>9} {'all_pairs':>12} {'recall':>7} {'precision':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        r = run(size, args.duplicate_share)
+        print(
+            f"{r['episodes']:>9} {r['podcasts']:>8} {r['seconds']:>8} {r['us_per_episode']:>6} {r['pairs_checked']:>9} "
+            f"{r['all_pairs']:>12} {r['recall']:>7} {r['precision']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
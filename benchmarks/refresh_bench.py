@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Benchmark feed refresh, subscribe (one feed per call, or bulk) and OPML import against the offline feed harness.
+Reports feeds/sec, bytes served, fetch/parse time, DB time and peak RSS per library size.
+Each size runs in its own subprocess so peak RSS is not carried over between sizes.
+
+Run from project root:
+  python -m benchmarks.refresh_bench                      # refresh over 100 / 1000 / 5000 feeds
+  python -m benchmarks.refresh_bench --sizes 100 --scenario subscribe
+  python -m benchmarks.refresh_bench --sizes 100 --scenario bulk      # one bulk subscribe for all feeds
+  python -m benchmarks.refresh_bench --replay snapshots/ --output bench.json
+  python -m benchmarks.refresh_bench --sizes 400 --scenario opml --latency 0.3   # each feed answers after 300ms
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+SCENARIOS = ("refresh", "subscribe", "bulk", "opml")
+DEFAULT_SIZES = (100, 1000, 5000)
+
+
+class _Timers:
+    """Thread-safe accumulators for the instrumented phases."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.fetch_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.db_seconds = 0.0
+        self.bytes_fetched = 0
+        self._depth = threading.local()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.fetch_seconds = self.parse_seconds = self.db_seconds = 0.0
+            self.bytes_fetched = 0
+
+    def add(self, name: str, seconds: float) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + seconds)
+
+
+def _instrument(timers: _Timers) -> None:
+    """
+    Wrap feed download/parse and database.get_connection with timers.
+    Must run before api modules import get_connection by name.
+    """
+    import database
+    from api.utils import rss_fetcher
+
+    real_download = rss_fetcher._download_feed
+    real_parse = rss_fetcher._parse_feed
+    real_get_connection = database.get_connection
+
+    def timed_download(feed_url):
+        start = time.perf_counter()
+        try:
+            body, headers = real_download(feed_url)
+        finally:
+            timers.add("fetch_seconds", time.perf_counter() - start)
+        with timers.lock:
+            timers.bytes_fetched += len(body)
+        return body, headers
+
+    def timed_parse(body, headers):
+        start = time.perf_counter()
+        try:
+            return real_parse(body, headers)
+        finally:
+            timers.add("parse_seconds", time.perf_counter() - start)
+
+    @contextmanager
+    def timed_get_connection(db_path=None):
+        depth = getattr(timers._depth, "value", 0)
+        timers._depth.value = depth + 1
+        start = time.perf_counter()
+        try:
+            with real_get_connection(db_path) as conn:
+                yield conn
+        finally:
+            timers._depth.value = depth
+            if depth == 0:
+                timers.add("db_seconds", time.perf_counter() - start)
+
+    rss_fetcher._download_feed = timed_download
+    rss_fetcher._parse_feed = timed_parse
+    database.get_connection = timed_get_connection
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_single(size: int, scenario: str, seed: int, replay: Optional[Path], latency: float = 0.0) -> Dict[str, Any]:
+    """Run one scenario over a fresh temporary DB with size feeds; return metrics. latency delays every feed response."""
+    tmpdir = tempfile.mkdtemp(prefix="audiophile_bench_")
+    os.environ["PODCASTS_DB_PATH"] = str(Path(tmpdir) / "bench.db")
+
+    timers = _Timers()
+    _instrument(timers)
+
+    from benchmarks.feed_harness import FeedServer, build_library, build_opml
+    from database import init_schema, upsert_podcast, get_connection
+
+    init_schema()
+    server = FeedServer()
+    if replay:
+        urls = server.add_snapshots(replay, count=size)
+    else:
+        specs = build_library(size, seed=seed)
+        for spec in specs:
+            spec.delay_seconds = max(spec.delay_seconds, latency)
+        urls = server.add_specs(specs)
+    server.start()
+    errors = 0
+    extra: Dict[str, Any] = {}
+    try:
+        if scenario == "refresh":
+            from api.services.feed_refresh import refresh_all_feeds
+            with get_connection() as conn:
+                for n, url in enumerate(urls):
+                    upsert_podcast(uuid=f"bench-{n}", title=f"Synthetic Podcast {n}", feed_url=url, conn=conn)
+            timers.reset()
+            start = time.perf_counter()
+            _, added, updated, errs = refresh_all_feeds()
+            elapsed = time.perf_counter() - start
+            errors = len(errs)
+            extra = {"episodes_added": added, "episodes_updated": updated}
+        elif scenario == "subscribe":
+            from fastapi import HTTPException
+            from api.routers.podcasts import subscribe_to_podcast
+            from api.schemas import PodcastSubscribeRequest
+            timers.reset()
+            start = time.perf_counter()
+            for url in urls:
+                try:
+                    subscribe_to_podcast(PodcastSubscribeRequest(feed_url=url))
+                except HTTPException:
+                    errors += 1
+            elapsed = time.perf_counter() - start
+        elif scenario == "bulk":
+            from api.services.subscribe import iter_bulk_subscribe
+            timers.reset()
+            start = time.perf_counter()
+            first_result = None
+            for result in iter_bulk_subscribe(urls):
+                if first_result is None:
+                    first_result = time.perf_counter() - start
+                if result.status == "failed":
+                    errors += 1
+            elapsed = time.perf_counter() - start
+            extra = {"first_result_seconds": round(first_result or 0.0, 3)}
+        else:
+            from api.services.opml_import import import_opml
+            content = build_opml(urls)
+            timers.reset()
+            start = time.perf_counter()
+            report = import_opml(content)
+            elapsed = time.perf_counter() - start
+            errors = len(report.errors)
+            extra = {
+                "podcasts_added": report.podcasts_added,
+                "metadata_enriched": report.metadata_enriched,
+                "fetches_skipped": report.fetches_skipped,
+            }
+    finally:
+        server.stop()
+
+    with get_connection() as conn:
+        episodes = conn.execute("SELECT COUNT(*) AS n FROM episodes").fetchone()["n"]
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    served = server.stats.snapshot()
+    result = {
+        "scenario": scenario,
+        "feeds": size,
+        "seconds": round(elapsed, 3),
+        "feeds_per_sec": round(size / elapsed, 2) if elapsed else None,
+        "bytes_served": served["bytes_sent"],
+        "bytes_fetched": timers.bytes_fetched,
+        "fetch_seconds": round(timers.fetch_seconds, 3),
+        "parse_seconds": round(timers.parse_seconds, 3),
+        "db_seconds": round(timers.db_seconds, 3),
+        "episodes_in_db": episodes,
+        "errors": errors,
+        "http_status": served["by_status"],
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+    result.update(extra)
+    return result
+
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    header = f"{'scenario':<10} {'feeds':>6} {'sec':>8} {'feeds/s':>8} {'MB':>8} {'fetch s':>8} {'parse s':>8} {'db s':>8} {'rss MB':>8} {'errors':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<10} {r['feeds']:>6} {r['seconds']:>8.2f} {r['feeds_per_sec'] or 0:>8.1f} "
+            f"{r['bytes_served'] / 1e6:>8.1f} {r['fetch_seconds']:>8.2f} {r['parse_seconds']:>8.2f} "
+            f"{r['db_seconds']:>8.2f} {r['peak_rss_mb']:>8.1f} {r['errors']:>6}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark refresh/subscribe/OPML import against local synthetic feeds.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Library sizes (feeds)")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="refresh")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--replay", type=Path, default=None, help="Replay recorded snapshots instead of synthetic feeds")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every synthetic feed waits before answering")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON")
+    parser.add_argument("--single", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(run_single(args.single, args.scenario, args.seed, args.replay, args.latency)))
+        return
+
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        cmd = [sys.executable, "-m", "benchmarks.refresh_bench", "--single", str(size),
+               "--scenario", args.scenario, "--seed", str(args.seed), "--latency", str(args.latency)]
+        if args.replay:
+            cmd.extend(["--replay", str(args.replay)])
+        proc = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stderr, file=sys.stderr)
+            sys.exit(proc.returncode)
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    _print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
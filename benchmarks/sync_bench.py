@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Pocket Casts resync timings: full re-import against delta (incremental) sync.
+
+A synthetic export (SJPodcast / SJEpisode, the columns import_pocketcasts reads) is written to a
+temporary directory and imported once. The export is then edited the way a week of listening
+would (--changed episodes get new progress, --new episodes appear) and synced again, once with
+every row applied and once skipping rows whose hash is unchanged.
+
+Run from project root:
+  python -m benchmarks.sync_bench --episodes 60000 --changed 300 --new 50
+"""
+import argparse
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from import_pocketcasts import import_from_pocketcasts_db
+
+# Seconds between the Unix epoch and 2001-01-01 (Pocket Casts stores Cocoa timestamps)
+COCOA_EPOCH_OFFSET = 978307200
+EXPORT_SCHEMA = """
+CREATE TABLE SJPodcast (
+    uuid TEXT PRIMARY KEY, title TEXT, author TEXT, podcastDescription TEXT, podcastUrl TEXT,
+    imageURL TEXT, thumbnailURL TEXT, wasDeleted INTEGER DEFAULT 0
+);
+CREATE TABLE SJEpisode (
+    uuid TEXT PRIMARY KEY, podcastUuid TEXT, title TEXT, episodeDescription TEXT, duration REAL,
+    publishedDate REAL, downloadUrl TEXT, fileType TEXT, sizeInBytes INTEGER, playedUpTo REAL,
+    playingStatus INTEGER, episodeStatus INTEGER, addedDate REAL, lastPlaybackInteractionDate REAL,
+    wasDeleted INTEGER DEFAULT 0
+);
+"""
+
+
+def build_export(path: Path, podcasts: int, episodes: int, seed: int = 7) -> None:
+    """Write a synthetic Pocket Casts export database to path."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(EXPORT_SCHEMA)
+    conn.executemany(
+        "INSERT INTO SJPodcast VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+        [
+            (f"pod-{i}", f"Podcast {i}", f"Author {i % 97}", "<p>About the show.</p>" * 5,
+             f"https://example.com/{i}", f"https://img.example.com/{i}.jpg", None)
+            for i in range(podcasts)
+        ],
+    )
+    now = time.time() - COCOA_EPOCH_OFFSET
+    rows = []
+    for i in range(episodes):
+        duration = rng.randint(600, 7200)
+        status = rng.choice((1, 1, 2, 3))
+        played = 0 if status == 1 else (duration if status == 3 else rng.randint(1, duration - 1))
+        added = now - rng.randint(0, 3 * 365 * 86400)
+        rows.append((
+            f"ep-{i}", f"pod-{i % podcasts}", f"Episode {i}", "<p>Show notes.</p>" * 20, duration,
+            added, f"https://cdn.example.com/{i}.mp3", "audio/mpeg", duration * 16000, played, status,
+            None, added, added + rng.randint(0, 86400) if played else None, 0,
+        ))
+    conn.executemany(f"INSERT INTO SJEpisode VALUES ({', '.join('?' * 15)})", rows)
+    conn.commit()
+    conn.close()
+
+
+def edit_export(path: Path, changed: int, new: int, podcasts: int, seed: int = 11) -> None:
+    """Advance playback on `changed` random episodes and append `new` episodes."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(path))
+    total = conn.execute("SELECT COUNT(*) FROM SJEpisode").fetchone()[0]
+    now = time.time() - COCOA_EPOCH_OFFSET
+    for i in rng.sample(range(total), min(changed, total)):
+        conn.execute(
+            """UPDATE SJEpisode SET playedUpTo = MIN(duration, playedUpTo + 900), playingStatus = 2,
+                      lastPlaybackInteractionDate = ? WHERE uuid = ?""",
+            (now, f"ep-{i}"),
+        )
+    conn.executemany(
+        f"INSERT INTO SJEpisode VALUES ({', '.join('?' * 15)})",
+        [
+            (f"ep-{total + j}", f"pod-{j % podcasts}", f"New episode {j}", "<p>Show notes.</p>", 1800,
+             now, f"https://cdn.example.com/new-{j}.mp3", "audio/mpeg", 1800 * 16000, 0, 1, None, now, None, 0)
+            for j in range(new)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _timed_sync(source: Path, target: Path, incremental: bool) -> Dict[str, Any]:
+    start = time.perf_counter()
+    report = import_from_pocketcasts_db(source, target_db=target, incremental=incremental)
+    return {
+        "seconds": round(time.perf_counter() - start, 2),
+        "episodes_added": report.episodes_added,
+        "episodes_changed": report.episodes_updated,
+        "episodes_unchanged": report.episodes_unchanged,
+        "conflicts": report.conflicts_count,
+    }
+
+
+def run(podcasts: int, episodes: int, changed: int, new: int) -> Dict[str, Any]:
+    tmpdir = Path(tempfile.mkdtemp(prefix="audiophile_sync_"))
+    try:
+        source = tmpdir / "export.sqlite3"
+        build_export(source, podcasts, episodes)
+        base = tmpdir / "base.db"
+        initial = _timed_sync(source, base, incremental=True)
+        edit_export(source, changed, new, podcasts)
+        full_db, delta_db = tmpdir / "full.db", tmpdir / "delta.db"
+        shutil.copyfile(base, full_db)
+        shutil.copyfile(base, delta_db)
+        return {
+            "initial": initial,
+            "full": _timed_sync(source, full_db, incremental=False),
+            "delta": _timed_sync(source, delta_db, incremental=True),
+        }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare full and delta Pocket Casts resyncs.")
+    parser.add_argument("--podcasts", type=int, default=300)
+    parser.add_argument("--episodes", type=int, default=60000)
+    parser.add_argument("--changed", type=int, default=300, help="Episodes with new progress before the resync")
+    parser.add_argument("--new", type=int, default=50, help="Episodes added before the resync")
+    args = parser.parse_args(argv)
+    r = run(args.podcasts, args.episodes, args.changed, args.new)
+    print(f"{'':<10} {'seconds':>8} {'added':>7} {'changed':>8} {'unchanged':>10} {'conflicts':>10}")
+    for name, row in r.items():
+        print(
+            f"{name:<10} {row['seconds']:>8} {row['episodes_added']:>7} {row['episodes_changed']:>8} "
+            f"{row['episodes_unchanged']:>10} {row['conflicts']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Range and sort query timings with ISO 8601 TEXT timestamps (schema v7) against INTEGER
+epoch-millisecond timestamps (schema v8+).
+
+The source database is copied into a temporary directory with its timestamp columns
+rewritten as ISO text (as stored before v8), measured, migrated with init_schema, vacuumed
+and measured again. Range queries cover the most recent --days of listening.
+
+Run from project root:
+  python -m benchmarks.timestamp_bench --db /tmp/small.db
+"""
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database import TIMESTAMP_COLUMNS, init_schema, ms_to_iso
+
+DAY_MS = 86400 * 1000
+
+# Indexes as they were at schema v7
+LEGACY_INDEXES = (
+    "CREATE INDEX idx_episodes_podcast_uuid ON episodes(podcast_uuid)",
+    "CREATE INDEX idx_episodes_uuid ON episodes(uuid)",
+    "CREATE INDEX idx_episodes_description_id ON episodes(description_id)",
+    "CREATE INDEX idx_listening_history_episode_uuid ON listening_history(episode_uuid)",
+    "CREATE INDEX idx_listening_history_last_played ON listening_history(last_played_at)",
+    "CREATE INDEX idx_play_sessions_episode_uuid ON play_sessions(episode_uuid)",
+)
+
+# name -> (SQL, whether it takes the (start, end) range bounds)
+QUERIES: Dict[str, Tuple[str, bool]] = {
+    "history_range_count": (
+        "SELECT COUNT(*) FROM listening_history WHERE last_played_at >= ? AND last_played_at < ?",
+        True,
+    ),
+    "history_range_rows": (
+        """SELECT lh.episode_uuid, lh.played_up_to, lh.last_played_at, e.title
+           FROM listening_history lh JOIN episodes e ON e.uuid = lh.episode_uuid
+           WHERE lh.last_played_at >= ? AND lh.last_played_at < ?
+           ORDER BY lh.last_played_at DESC""",
+        True,
+    ),
+    "sessions_range_sum": (
+        "SELECT SUM(duration_seconds) FROM play_sessions WHERE started_at >= ? AND started_at < ?",
+        True,
+    ),
+    "episodes_sort_last_played": (
+        """SELECT e.uuid FROM episodes e LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
+           WHERE e.deleted_at IS NULL ORDER BY lh.last_played_at DESC NULLS LAST LIMIT 100""",
+        False,
+    ),
+    "episodes_sort_created": (
+        "SELECT uuid FROM episodes WHERE deleted_at IS NULL ORDER BY created_at DESC LIMIT 100",
+        False,
+    ),
+    "history_sort_all": (
+        "SELECT episode_uuid, last_played_at FROM listening_history ORDER BY last_played_at DESC",
+        False,
+    ),
+}
+
+
+def _build_legacy(source: Path, target: Path) -> None:
+    """Copy source to target with timestamp columns stored as ISO text and v7 indexes."""
+    shutil.copyfile(source, target)
+    conn = sqlite3.connect(str(target))
+    conn.create_function("ms_to_iso", 1, ms_to_iso, deterministic=True)
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall():
+        conn.execute(f"DROP INDEX {name}")
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        types = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        for column in columns:
+            if not types.get(column, "").upper().startswith("INT"):
+                continue
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}_text TEXT")
+            conn.execute(f"UPDATE {table} SET {column}_text = ms_to_iso({column})")
+            conn.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+            conn.execute(f"ALTER TABLE {table} RENAME COLUMN {column}_text TO {column}")
+    for sql in LEGACY_INDEXES:
+        conn.execute(sql)
+    conn.execute("INSERT OR REPLACE INTO _schema_meta (key, value) VALUES ('schema_version', '7')")
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _measure(db_path: Path, bounds: Tuple[Any, Any], repeat: int) -> Dict[str, Any]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        result: Dict[str, Any] = {"size_mb": round(db_path.stat().st_size / 1e6, 1)}
+        for name, (sql, ranged) in QUERIES.items():
+            params = bounds if ranged else ()
+            result[f"{name}_ms"] = round(_best_of(lambda: conn.execute(sql, params).fetchall(), repeat) * 1000, 2)
+        return result
+    finally:
+        conn.close()
+
+
+def run(source: Path, days: int, repeat: int) -> Dict[str, Any]:
+    conn = sqlite3.connect(str(source))
+    latest = conn.execute("SELECT MAX(last_played_at) FROM listening_history").fetchone()[0]
+    conn.close()
+    if latest is None:
+        raise SystemExit(f"No listening history in {source}; generate a library first (python -m benchmarks.library_generator)")
+    if isinstance(latest, str):
+        raise SystemExit(f"{source} still stores ISO text timestamps; run init_schema on it (or regenerate) first")
+    end = latest + 1
+    start = end - days * DAY_MS
+    tmpdir = Path(tempfile.mkdtemp(prefix="audiophile_ts_"))
+    try:
+        db_path = tmpdir / "legacy.db"
+        _build_legacy(source, db_path)
+        before = _measure(db_path, (ms_to_iso(start), ms_to_iso(end)), repeat)
+        began = time.perf_counter()
+        init_schema(db_path)
+        migrate_seconds = time.perf_counter() - began
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("VACUUM")
+        conn.close()
+        after = _measure(db_path, (start, end), repeat)
+        return {"before": before, "after": after, "migrate_seconds": round(migrate_seconds, 2), "days": days}
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare ISO text vs epoch-ms integer timestamp queries.")
+    parser.add_argument("--db", type=Path, required=True, help="Source library (see benchmarks.library_generator)")
+    parser.add_argument("--days", type=int, default=30, help="Width of the range queries, ending at the latest play")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        parser.error(f"Database not found: {args.db}")
+    r = run(args.db, args.days, args.repeat)
+    print(f"Range: last {r['days']} days; migration {r['migrate_seconds']}s")
+    print(f"{'':<30} {'ISO text (v7)':>14} {'epoch ms':>10}")
+    for key in r["before"]:
+        print(f"{key:<30} {r['before'][key]:>14} {r['after'][key]:>10}")
+
+
+if __name__ == "__main__":
+    main()
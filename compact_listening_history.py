@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Delete placeholder listening_history rows: nothing played, playing_status 0/1, no episode_status,
+play_count <= 1, first/last played equal to the insert time and no play sessions. Episodes without a row read as Not Played, so API output
+is unchanged; earlier versions wrote such a row for every new episode on feed refresh and backfill.
+Run from project root: python compact_listening_history.py [--dry-run] [--vacuum]
+"""
+import argparse
+import sqlite3
+from pathlib import Path
+
+from config import get_db_path
+from database import compact_listening_history, init_schema
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remove placeholder 'not played' listening_history rows.")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help="Path to SQLite database (default: from config)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only count the rows that would be deleted",
+    )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="VACUUM afterwards to return the freed pages to the filesystem",
+    )
+    args = parser.parse_args()
+    db_path = args.db or get_db_path()
+    init_schema(db_path)
+    removed = compact_listening_history(db_path=db_path, dry_run=args.dry_run)
+    if args.dry_run:
+        print(f"Placeholder rows: {removed} (dry run, nothing deleted)")
+        return
+    print(f"Placeholder rows deleted: {removed}")
+    if args.vacuum:
+        conn = sqlite3.connect(str(db_path))
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        print("Vacuumed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 """
 Configuration for podcasts-reviewer SQLite listening history.
 """
+import logging
 import os
 from pathlib import Path
+from typing import Dict, Optional
 
 # Default database path: listening_history.db in project root
 PROJECT_ROOT = Path(__file__).resolve().parent
@@ -22,3 +24,43 @@ def get_source_db_path() -> Path:
     return Path(
         os.environ.get("POCKETCASTS_SOURCE_DB_PATH", str(DEFAULT_SOURCE_DB_PATH))
     )
+
+
+def get_db_trace_enabled() -> bool:
+    """Whether get_connection times statements (PODCASTS_DB_TRACE, default on; set to 0 to disable)."""
+    return os.environ.get("PODCASTS_DB_TRACE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def get_slow_query_ms() -> float:
+    """Statements slower than this (PODCASTS_SLOW_QUERY_MS, default 200) are logged with their query plan."""
+    try:
+        return float(os.environ.get("PODCASTS_SLOW_QUERY_MS", "200"))
+    except ValueError:
+        return 200.0
+
+
+def get_request_log_sample_rate() -> float:
+    """Fraction of successful requests logged (PODCASTS_REQUEST_LOG_SAMPLE, default 1.0). Errors are always logged."""
+    try:
+        rate = float(os.environ.get("PODCASTS_REQUEST_LOG_SAMPLE", "1"))
+    except ValueError:
+        return 1.0
+    return min(max(rate, 0.0), 1.0)
+
+
+def get_request_log_levels() -> Dict[str, Optional[int]]:
+    """
+    Per-route request log levels from PODCASTS_REQUEST_LOG_LEVELS, e.g.
+    "/api/health=off,/api/episodes/{uuid}=debug". Keys are route templates; "off" disables logging.
+    """
+    levels: Dict[str, Optional[int]] = {}
+    for item in os.environ.get("PODCASTS_REQUEST_LOG_LEVELS", "").split(","):
+        route, sep, level = item.strip().rpartition("=")
+        if not sep or not route:
+            continue
+        level = level.strip().upper()
+        if level == "OFF":
+            levels[route.strip()] = None
+        elif isinstance(logging.getLevelName(level), int):
+            levels[route.strip()] = logging.getLevelName(level)
+    return levels
@@ -3,14 +3,20 @@
 Database schema and operations for listening history.
 Creates and manages podcasts, episodes, listening_history, and play_sessions tables.
 """
+import hashlib
 import sqlite3
+import time
+import zlib
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Sequence, Tuple, Union
 from contextlib import contextmanager
 
+import db_trace
+from text_utils import canonical_feed_url, html_to_text, normalize_title, summary_snippet
+
 # Schema version for migrations
-SCHEMA_VERSION = 5
+SCHEMA_VERSION = 12
 
 CREATE_PODCASTS = """
 CREATE TABLE IF NOT EXISTS podcasts (
@@ -19,13 +25,17 @@ CREATE TABLE IF NOT EXISTS podcasts (
     title TEXT,
     author TEXT,
     description TEXT,
+    description_text TEXT,
+    summary_snippet TEXT,
     feed_url TEXT,
     website_url TEXT,
     image_url TEXT,
-    deleted_at TEXT,
+    deleted_at INTEGER,
     is_ended INTEGER NOT NULL DEFAULT 0,
-    created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    title_norm TEXT,
+    feed_url_canonical TEXT
 );
 """
 
@@ -35,20 +45,38 @@ CREATE TABLE IF NOT EXISTS episodes (
     uuid TEXT UNIQUE NOT NULL,
     podcast_uuid TEXT NOT NULL,
     title TEXT,
-    description TEXT,
+    description_id INTEGER REFERENCES episode_descriptions(id),
+    summary_snippet TEXT,
     duration REAL,
     published_date REAL,
     file_url TEXT,
     file_type TEXT,
     size_bytes INTEGER,
     video_url TEXT,
-    deleted_at TEXT,
-    created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL,
+    deleted_at INTEGER,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    title_norm TEXT,
     FOREIGN KEY (podcast_uuid) REFERENCES podcasts(uuid)
 );
 """
 
+# Episode show notes, stored once per distinct text (many feeds repeat the same boilerplate)
+# and compressed; episodes reference them by description_id. text_body holds the plain-text
+# rendering (same codecs), snippet its first ~280 characters (copied to episodes.summary_snippet).
+CREATE_EPISODE_DESCRIPTIONS = """
+CREATE TABLE IF NOT EXISTS episode_descriptions (
+    id INTEGER PRIMARY KEY,
+    hash BLOB NOT NULL UNIQUE,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    snippet TEXT,
+    text_codec TEXT,
+    text_body BLOB
+);
+"""
+
 CREATE_LISTENING_HISTORY = """
 CREATE TABLE IF NOT EXISTS listening_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -58,11 +86,11 @@ CREATE TABLE IF NOT EXISTS listening_history (
     playing_status INTEGER NOT NULL DEFAULT 0,
     episode_status INTEGER,
     completion_percentage REAL,
-    first_played_at TEXT,
-    last_played_at TEXT,
+    first_played_at INTEGER,
+    last_played_at INTEGER,
     play_count INTEGER NOT NULL DEFAULT 1,
-    created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
     FOREIGN KEY (episode_uuid) REFERENCES episodes(uuid)
 );
 """
@@ -71,8 +99,8 @@ CREATE_PLAY_SESSIONS = """
 CREATE TABLE IF NOT EXISTS play_sessions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     episode_uuid TEXT NOT NULL,
-    started_at TEXT NOT NULL,
-    ended_at TEXT,
+    started_at INTEGER NOT NULL,
+    ended_at INTEGER,
     duration_seconds REAL,
     played_from REAL NOT NULL DEFAULT 0,
     played_to REAL NOT NULL DEFAULT 0,
@@ -86,8 +114,41 @@ CREATE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_listening_history_episode_uuid ON listening_history(episode_uuid);",
     "CREATE INDEX IF NOT EXISTS idx_listening_history_last_played ON listening_history(last_played_at);",
     "CREATE INDEX IF NOT EXISTS idx_play_sessions_episode_uuid ON play_sessions(episode_uuid);",
+    "CREATE INDEX IF NOT EXISTS idx_episodes_created_at ON episodes(created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_play_sessions_episode_started ON play_sessions(episode_uuid, started_at);",
+    "CREATE INDEX IF NOT EXISTS idx_sync_history_created_at ON sync_history(created_at);",
+    # Covers the history -> episode lookups in listening_stats without reading episode rows
+    "CREATE INDEX IF NOT EXISTS idx_episodes_uuid_state ON episodes(uuid, deleted_at, duration);",
 ]
 
+# Lookups by the stored matching keys (text_utils.normalize_title / canonical_feed_url).
+# Created after migrations, since older databases only gain the columns in the v11 migration.
+NORMALIZED_KEY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_podcasts_title_norm ON podcasts(title_norm);",
+    "CREATE INDEX IF NOT EXISTS idx_podcasts_feed_url_canonical ON podcasts(feed_url_canonical);",
+    "CREATE INDEX IF NOT EXISTS idx_episodes_podcast_title_norm ON episodes(podcast_uuid, title_norm);",
+]
+
+# Indexes over timestamp columns; dropped and recreated by the v8 (epoch-ms) migration, since
+# SQLite refuses to drop a column an index still covers
+_TIMESTAMP_INDEXES = (
+    "idx_listening_history_last_played",
+    "idx_episodes_created_at",
+    "idx_play_sessions_episode_started",
+    "idx_sync_history_created_at",
+    "idx_episodes_uuid_state",
+)
+
+# Timestamp columns per table. All are INTEGER milliseconds since the Unix epoch (UTC);
+# the API converts them to ISO 8601 strings at the serialization edge (see ms_to_iso).
+TIMESTAMP_COLUMNS: Dict[str, tuple] = {
+    "podcasts": ("deleted_at", "created_at", "updated_at"),
+    "episodes": ("deleted_at", "created_at", "updated_at"),
+    "listening_history": ("first_played_at", "last_played_at", "created_at", "updated_at"),
+    "play_sessions": ("started_at", "ended_at"),
+    "sync_history": ("sync_timestamp", "created_at"),
+}
+
 CREATE_META = """
 CREATE TABLE IF NOT EXISTS _schema_meta (
     key TEXT PRIMARY KEY,
@@ -98,7 +159,7 @@ CREATE TABLE IF NOT EXISTS _schema_meta (
 CREATE_SYNC_HISTORY = """
 CREATE TABLE IF NOT EXISTS sync_history (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    sync_timestamp TEXT NOT NULL,
+    sync_timestamp INTEGER NOT NULL,
     source_path TEXT,
     podcasts_added INTEGER NOT NULL DEFAULT 0,
     podcasts_updated INTEGER NOT NULL DEFAULT 0,
@@ -107,22 +168,166 @@ CREATE TABLE IF NOT EXISTS sync_history (
     episodes_updated INTEGER NOT NULL DEFAULT 0,
     episodes_deleted INTEGER NOT NULL DEFAULT 0,
     conflicts_count INTEGER NOT NULL DEFAULT 0,
-    created_at TEXT NOT NULL
+    created_at INTEGER NOT NULL,
+    podcasts_unchanged INTEGER NOT NULL DEFAULT 0,
+    episodes_unchanged INTEGER NOT NULL DEFAULT 0
 );
 """
 
+# Hash of each Pocket Casts source row as last applied by import_pocketcasts (entity: 'podcast' or
+# 'episode'). Incremental syncs skip source rows whose hash is unchanged.
+CREATE_SYNC_ROW_HASHES = """
+CREATE TABLE IF NOT EXISTS sync_row_hashes (
+    entity TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    row_hash BLOB NOT NULL,
+    PRIMARY KEY (entity, uuid)
+) WITHOUT ROWID;
+"""
 
-def _iso_now() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+
+# Podcasts whose episodes or identity changed since the last incremental duplicate sweep
+# (api.services.duplicate_sweep). Kept by triggers, so every write path (feed refresh, Pocket Casts
+# sync, OPML import, restore) marks what it touched; marked_at lets a sweep clear only the marks it saw.
+CREATE_DIRTY_PODCASTS = """
+CREATE TABLE IF NOT EXISTS dirty_podcasts (
+    podcast_uuid TEXT PRIMARY KEY,
+    marked_at INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_MARK_DIRTY_SQL = (
+    "INSERT OR REPLACE INTO dirty_podcasts (podcast_uuid, marked_at) "
+    "VALUES ({uuid}, CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER));"
+)
+
+# A renamed, re-pointed or archived podcast also leaves its old title / feed URL groups, which can
+# turn a kept 0-episode podcast there into a duplicate: mark the podcasts still in those groups.
+_MARK_OLD_GROUPS_DIRTY_SQL = """INSERT OR REPLACE INTO dirty_podcasts (podcast_uuid, marked_at)
+            SELECT uuid, CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER) FROM podcasts
+            WHERE deleted_at IS NULL AND uuid IS NOT NEW.uuid
+              AND ((OLD.title_norm != '' AND title_norm = OLD.title_norm)
+                OR (OLD.feed_url_canonical != '' AND feed_url_canonical = OLD.feed_url_canonical));"""
+
+CREATE_DIRTY_PODCAST_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_episodes_dirty_insert AFTER INSERT ON episodes
+        BEGIN {_MARK_DIRTY_SQL.format(uuid="NEW.podcast_uuid")} END;""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_episodes_dirty_update
+        AFTER UPDATE OF podcast_uuid, title, published_date, deleted_at ON episodes
+        WHEN OLD.podcast_uuid IS NOT NEW.podcast_uuid OR OLD.title IS NOT NEW.title
+          OR OLD.published_date IS NOT NEW.published_date OR OLD.deleted_at IS NOT NEW.deleted_at
+        BEGIN {_MARK_DIRTY_SQL.format(uuid="NEW.podcast_uuid")} END;""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_podcasts_dirty_insert AFTER INSERT ON podcasts
+        BEGIN {_MARK_DIRTY_SQL.format(uuid="NEW.uuid")} END;""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_podcasts_dirty_update
+        AFTER UPDATE OF title, feed_url, title_norm, feed_url_canonical, deleted_at ON podcasts
+        WHEN OLD.title IS NOT NEW.title OR OLD.feed_url IS NOT NEW.feed_url
+          OR OLD.title_norm IS NOT NEW.title_norm OR OLD.feed_url_canonical IS NOT NEW.feed_url_canonical
+          OR OLD.deleted_at IS NOT NEW.deleted_at
+        BEGIN {_MARK_DIRTY_SQL.format(uuid="NEW.uuid")} {_MARK_OLD_GROUPS_DIRTY_SQL} END;""",
+]
+
+
+def now_ms() -> int:
+    """Current UTC time in milliseconds since the Unix epoch (the stored timestamp format)."""
+    return time.time_ns() // 1_000_000
+
+
+def ms_to_iso(value: Optional[Union[int, float, str]]) -> Optional[str]:
+    """Epoch milliseconds as ISO 8601 UTC ("2026-01-29T12:00:00Z", with .mmm when non-zero). Strings and None pass through."""
+    if value is None or isinstance(value, str):
+        return value
+    seconds, millis = divmod(int(value), 1000)
+    base = "%04d-%02d-%02dT%02d:%02d:%02d" % time.gmtime(seconds)[:6]
+    return f"{base}.{millis:03d}Z" if millis else base + "Z"
+
+
+def iso_to_ms(value: Optional[str]) -> Optional[int]:
+    """Parse an ISO 8601 timestamp (naive means UTC) into epoch milliseconds; None if empty or invalid."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return round(dt.timestamp() * 1000)
+
+
+# Descriptions shorter than this are stored uncompressed (zlib would not pay for its header)
+DESCRIPTION_COMPRESS_MIN_BYTES = 128
+
+
+def _pack_text(raw: bytes) -> tuple:
+    """(codec, body) for UTF-8 bytes; zlib when that saves space."""
+    if len(raw) >= DESCRIPTION_COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return "zlib", packed
+    return "raw", raw
+
+
+def encode_description(text: str) -> tuple:
+    """Return (hash, codec, size, body) for a description; body is zlib-compressed when that helps."""
+    raw = text.encode("utf-8")
+    codec, body = _pack_text(raw)
+    return hashlib.sha256(raw).digest(), codec, len(raw), body
+
+
+def decode_description(codec: Optional[str], body: Optional[bytes]) -> Optional[str]:
+    """Inverse of encode_description; registered as the SQL function decode_description(codec, body)."""
+    if body is None:
+        return None
+    if codec == "zlib":
+        body = zlib.decompress(body)
+    return body.decode("utf-8") if isinstance(body, bytes) else body
+
+
+def store_description(conn: sqlite3.Connection, text: Optional[str]) -> tuple:
+    """
+    Return (episode_descriptions id, summary snippet) for text, inserting it if this text is new.
+    Plain text and snippet are derived only on insert. (None, None) for None.
+    """
+    if text is None:
+        return None, None
+    digest, codec, size, body = encode_description(text)
+    row = conn.execute("SELECT id, snippet FROM episode_descriptions WHERE hash = ?", (digest,)).fetchone()
+    if row:
+        return row[0], row[1]
+    plain = html_to_text(text)
+    snippet = summary_snippet(plain)
+    text_codec, text_body = _pack_text(plain.encode("utf-8"))
+    cur = conn.execute(
+        """INSERT INTO episode_descriptions (hash, codec, size, body, snippet, text_codec, text_body)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (digest, codec, size, body, snippet, text_codec, text_body),
+    )
+    return cur.lastrowid, snippet
+
+
+def prune_episode_descriptions(db_path: Optional[Path] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+    """Delete descriptions no episode references any more. Returns rows deleted."""
+    sql = """DELETE FROM episode_descriptions
+             WHERE NOT EXISTS (SELECT 1 FROM episodes e WHERE e.description_id = episode_descriptions.id)"""
+    if conn is not None:
+        return conn.execute(sql).rowcount
+    with get_connection(db_path) as c:
+        return c.execute(sql).rowcount
 
 
 @contextmanager
-def get_connection(db_path: Optional[Path] = None):
-    """Context manager for database connection with foreign keys enabled."""
+def get_connection(db_path: Optional[Path] = None, check_same_thread: bool = True):
+    """
+    Context manager for database connection with foreign keys enabled. Statements are timed by db_trace.
+    Pass check_same_thread=False for a connection driven from a generator that a threadpool may
+    resume on different threads (used sequentially, never concurrently).
+    """
     from config import get_db_path
     path = db_path or get_db_path()
-    conn = sqlite3.connect(str(path))
+    conn = db_trace.connect(str(path), check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
+    conn.create_function("decode_description", 2, decode_description, deterministic=True)
     conn.execute("PRAGMA foreign_keys = 1")
     try:
         yield conn
@@ -131,10 +336,11 @@ def get_connection(db_path: Optional[Path] = None):
         conn.rollback()
         raise
     finally:
+        db_trace.finish(conn)
         conn.close()
 
 
-def _get_schema_version(conn: sqlite3.Connection) -> int:
+def get_schema_version(conn: sqlite3.Connection) -> int:
     """Return current schema version from _schema_meta, or 0 if not set."""
     try:
         cur = conn.execute(
@@ -149,7 +355,7 @@ def _get_schema_version(conn: sqlite3.Connection) -> int:
 
 def _migrate_schema(conn: sqlite3.Connection) -> None:
     """Run migrations from current schema version to SCHEMA_VERSION."""
-    current = _get_schema_version(conn)
+    current = get_schema_version(conn)
     if current >= SCHEMA_VERSION:
         return
 
@@ -198,30 +404,222 @@ def _migrate_schema(conn: sqlite3.Connection) -> None:
         except sqlite3.OperationalError:
             pass
 
+    # Migration to v6: move episode descriptions into compressed, deduplicated episode_descriptions
+    if current < 6:
+        _migrate_episode_descriptions(conn)
+
+    # Migration to v7: plain-text description and summary snippet for episodes and podcasts
+    if current < 7:
+        _migrate_description_text(conn)
+
+    # Migration to v8: ISO 8601 TEXT timestamps become INTEGER epoch milliseconds
+    if current < 8:
+        _migrate_epoch_ms_timestamps(conn)
+
+    # Migration to v9: unchanged-row counts in sync_history (delta sync)
+    if current < 9:
+        cur = conn.execute("PRAGMA table_info(sync_history)")
+        columns = [row[1] for row in cur.fetchall()]
+        for column in ("podcasts_unchanged", "episodes_unchanged"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE sync_history ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+
+    # Migration to v10: dirty_podcasts for incremental duplicate sweeps. Every podcast starts
+    # dirty, so the first sweep covers the whole library once.
+    if current < 10:
+        conn.execute(CREATE_DIRTY_PODCASTS)
+        conn.execute(
+            "INSERT OR IGNORE INTO dirty_podcasts (podcast_uuid, marked_at) SELECT uuid, ? FROM podcasts",
+            (now_ms(),),
+        )
+
+    # Migration to v11: stored title_norm / feed_url_canonical matching keys
+    if current < 11:
+        _migrate_normalized_keys(conn)
+
+    # Migration to v12: trg_podcasts_dirty_update also marks the groups a podcast leaves (recreated
+    # by init_schema). Groups left before now were never re-checked, so every podcast is marked once.
+    if current < 12:
+        conn.execute("DROP TRIGGER IF EXISTS trg_podcasts_dirty_update")
+        conn.execute(CREATE_DIRTY_PODCASTS)
+        conn.execute(
+            "INSERT OR REPLACE INTO dirty_podcasts (podcast_uuid, marked_at) SELECT uuid, ? FROM podcasts",
+            (now_ms(),),
+        )
+
     conn.execute(
         "INSERT OR REPLACE INTO _schema_meta (key, value) VALUES (?, ?)",
         ("schema_version", str(SCHEMA_VERSION)),
     )
 
 
+def _migrate_episode_descriptions(conn: sqlite3.Connection, batch_size: int = 5000) -> None:
+    """Copy inline episodes.description into episode_descriptions, then drop the inline column."""
+    conn.execute(CREATE_EPISODE_DESCRIPTIONS)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(episodes)").fetchall()]
+    if "description_id" not in columns:
+        conn.execute("ALTER TABLE episodes ADD COLUMN description_id INTEGER REFERENCES episode_descriptions(id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_episodes_description_id ON episodes(description_id)")
+    if "description" not in columns:
+        return
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, description FROM episodes WHERE id > ? AND description IS NOT NULL ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        updates = [(store_description(conn, row[1])[0], row[0]) for row in rows]
+        conn.executemany("UPDATE episodes SET description_id = ? WHERE id = ?", updates)
+        last_id = rows[-1][0]
+    try:
+        conn.execute("ALTER TABLE episodes DROP COLUMN description")
+    except sqlite3.OperationalError:
+        # SQLite < 3.35 cannot drop columns; clear it so the space is reclaimed on VACUUM
+        conn.execute("UPDATE episodes SET description = NULL WHERE description IS NOT NULL")
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+    for name, ddl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+
+def _migrate_description_text(conn: sqlite3.Connection, batch_size: int = 2000) -> None:
+    """Add and backfill description_text / summary_snippet columns."""
+    _add_missing_columns(conn, "episode_descriptions", {"snippet": "TEXT", "text_codec": "TEXT", "text_body": "BLOB"})
+    _add_missing_columns(conn, "episodes", {"summary_snippet": "TEXT"})
+    _add_missing_columns(conn, "podcasts", {"description_text": "TEXT", "summary_snippet": "TEXT"})
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, codec, body FROM episode_descriptions WHERE id > ? AND text_body IS NULL ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            plain = html_to_text(decode_description(row[1], row[2]))
+            text_codec, text_body = _pack_text(plain.encode("utf-8"))
+            updates.append((summary_snippet(plain), text_codec, text_body, row[0]))
+        conn.executemany(
+            "UPDATE episode_descriptions SET snippet = ?, text_codec = ?, text_body = ? WHERE id = ?", updates
+        )
+        last_id = rows[-1][0]
+    conn.execute(
+        """UPDATE episodes SET summary_snippet =
+               (SELECT d.snippet FROM episode_descriptions d WHERE d.id = episodes.description_id)
+           WHERE description_id IS NOT NULL"""
+    )
+    rows = conn.execute("SELECT id, description FROM podcasts WHERE description IS NOT NULL").fetchall()
+    updates = []
+    for row in rows:
+        plain = html_to_text(row[1])
+        updates.append((plain, summary_snippet(plain), row[0]))
+    conn.executemany("UPDATE podcasts SET description_text = ?, summary_snippet = ? WHERE id = ?", updates)
+
+
+def _migrate_normalized_keys(conn: sqlite3.Connection, batch_size: int = 5000) -> None:
+    """Add and backfill podcasts.title_norm / feed_url_canonical and episodes.title_norm."""
+    _add_missing_columns(conn, "podcasts", {"title_norm": "TEXT", "feed_url_canonical": "TEXT"})
+    _add_missing_columns(conn, "episodes", {"title_norm": "TEXT"})
+    rows = conn.execute("SELECT id, title, feed_url FROM podcasts").fetchall()
+    conn.executemany(
+        "UPDATE podcasts SET title_norm = ?, feed_url_canonical = ? WHERE id = ?",
+        [(_title_norm(row[1]), _feed_url_canonical(row[2]), row[0]) for row in rows],
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, title FROM episodes WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany("UPDATE episodes SET title_norm = ? WHERE id = ?", [(_title_norm(row[1]), row[0]) for row in rows])
+        last_id = rows[-1][0]
+
+
+# ISO 8601 text (with or without "Z" / fractional seconds) to epoch milliseconds, in SQL
+_ISO_TO_MS_SQL = "CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER)"
+
+
+def _migrate_epoch_ms_timestamps(conn: sqlite3.Connection) -> None:
+    """
+    Retype TEXT timestamp columns as INTEGER epoch milliseconds. SQLite cannot change a column's
+    type in place, so each column is copied into a new INTEGER column, dropped and the copy renamed.
+    Unparseable values become NULL (or the migration time for NOT NULL columns).
+    """
+    for name in _TIMESTAMP_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    fallback = now_ms()
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        info = {row[1]: row for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+        pending = [c for c in columns if c in info and not (info[c][2] or "").upper().startswith("INT")]
+        if not pending:
+            continue
+        assignments = []
+        for column in pending:
+            not_null = bool(info[column][3])
+            conn.execute(
+                f"ALTER TABLE {table} ADD COLUMN {column}_ms INTEGER" + (" NOT NULL DEFAULT 0" if not_null else "")
+            )
+            expr = _ISO_TO_MS_SQL.format(column=column)
+            assignments.append(f"{column}_ms = COALESCE({expr}, {fallback})" if not_null else f"{column}_ms = {expr}")
+        conn.execute(f"UPDATE {table} SET {', '.join(assignments)}")
+        for column in pending:
+            conn.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+            conn.execute(f"ALTER TABLE {table} RENAME COLUMN {column}_ms TO {column}")
+    row = conn.execute("SELECT value FROM _schema_meta WHERE key = 'last_sync_timestamp'").fetchone()
+    if row and row[0] and not row[0].isdigit():
+        converted = iso_to_ms(row[0])
+        conn.execute(
+            "UPDATE _schema_meta SET value = ? WHERE key = 'last_sync_timestamp'",
+            (str(converted) if converted is not None else None,),
+        )
+    for sql in CREATE_INDEXES:
+        conn.execute(sql)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+        for name in _TIMESTAMP_INDEXES:
+            conn.execute(f"ANALYZE {name}")
+
+
 def init_schema(db_path: Optional[Path] = None) -> None:
     """Create all tables and indexes if they do not exist. Run migrations if needed."""
     with get_connection(db_path) as conn:
         conn.execute(CREATE_PODCASTS)
+        conn.execute(CREATE_EPISODE_DESCRIPTIONS)
         conn.execute(CREATE_EPISODES)
         conn.execute(CREATE_LISTENING_HISTORY)
         conn.execute(CREATE_PLAY_SESSIONS)
         conn.execute(CREATE_META)
         conn.execute(CREATE_SYNC_HISTORY)
+        conn.execute(CREATE_SYNC_ROW_HASHES)
         for sql in CREATE_INDEXES:
             conn.execute(sql)
         _migrate_schema(conn)
+        for sql in NORMALIZED_KEY_INDEXES:
+            conn.execute(sql)
+        conn.execute(CREATE_DIRTY_PODCASTS)
+        for sql in CREATE_DIRTY_PODCAST_TRIGGERS:
+            conn.execute(sql)
         conn.execute(
             "INSERT OR REPLACE INTO _schema_meta (key, value) VALUES (?, ?)",
             ("schema_version", str(SCHEMA_VERSION)),
         )
 
 
+def _title_norm(title: Optional[str]) -> Optional[str]:
+    """Stored title_norm for title; None keeps the existing value on upsert, like title itself."""
+    return normalize_title(title) if title is not None else None
+
+
+def _feed_url_canonical(feed_url: Optional[str]) -> Optional[str]:
+    return canonical_feed_url(feed_url) if feed_url is not None else None
+
+
 def upsert_podcast(
     uuid: str,
     title: Optional[str] = None,
@@ -230,50 +628,60 @@ def upsert_podcast(
     feed_url: Optional[str] = None,
     website_url: Optional[str] = None,
     image_url: Optional[str] = None,
-    deleted_at: Optional[str] = None,
+    deleted_at: Optional[int] = None,
     is_ended: bool = False,
     db_path: Optional[Path] = None,
     conn: Optional[sqlite3.Connection] = None,
 ) -> None:
-    """Insert or update a podcast by uuid. Set deleted_at for soft delete, is_ended for ended feeds."""
-    now = _iso_now()
+    """Insert or update a podcast by uuid. Set deleted_at (epoch ms) for soft delete, is_ended for ended feeds."""
+    now = now_ms()
     is_ended_int = 1 if is_ended else 0
+    description_text = html_to_text(description)
+    snippet = summary_snippet(description_text)
     if conn is not None:
         conn.execute(
             """
-            INSERT INTO podcasts (uuid, title, author, description, feed_url, website_url, image_url, deleted_at, is_ended, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO podcasts (uuid, title, title_norm, author, description, description_text, summary_snippet, feed_url, feed_url_canonical, website_url, image_url, deleted_at, is_ended, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(uuid) DO UPDATE SET
                 title = COALESCE(excluded.title, title),
+                title_norm = COALESCE(excluded.title_norm, title_norm),
                 author = COALESCE(excluded.author, author),
                 description = COALESCE(excluded.description, description),
+                description_text = COALESCE(excluded.description_text, description_text),
+                summary_snippet = COALESCE(excluded.summary_snippet, summary_snippet),
                 feed_url = COALESCE(excluded.feed_url, feed_url),
+                feed_url_canonical = COALESCE(excluded.feed_url_canonical, feed_url_canonical),
                 website_url = COALESCE(excluded.website_url, website_url),
                 image_url = COALESCE(excluded.image_url, image_url),
                 deleted_at = excluded.deleted_at,
                 is_ended = excluded.is_ended,
                 updated_at = excluded.updated_at
             """,
-            (uuid, title, author, description, feed_url, website_url, image_url, deleted_at, is_ended_int, now, now),
+            (uuid, title, _title_norm(title), author, description, description_text, snippet, feed_url, _feed_url_canonical(feed_url), website_url, image_url, deleted_at, is_ended_int, now, now),
         )
         return
     with get_connection(db_path) as c:
         c.execute(
             """
-            INSERT INTO podcasts (uuid, title, author, description, feed_url, website_url, image_url, deleted_at, is_ended, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO podcasts (uuid, title, title_norm, author, description, description_text, summary_snippet, feed_url, feed_url_canonical, website_url, image_url, deleted_at, is_ended, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(uuid) DO UPDATE SET
                 title = COALESCE(excluded.title, title),
+                title_norm = COALESCE(excluded.title_norm, title_norm),
                 author = COALESCE(excluded.author, author),
                 description = COALESCE(excluded.description, description),
+                description_text = COALESCE(excluded.description_text, description_text),
+                summary_snippet = COALESCE(excluded.summary_snippet, summary_snippet),
                 feed_url = COALESCE(excluded.feed_url, feed_url),
+                feed_url_canonical = COALESCE(excluded.feed_url_canonical, feed_url_canonical),
                 website_url = COALESCE(excluded.website_url, website_url),
                 image_url = COALESCE(excluded.image_url, image_url),
                 deleted_at = excluded.deleted_at,
                 is_ended = excluded.is_ended,
                 updated_at = excluded.updated_at
             """,
-            (uuid, title, author, description, feed_url, website_url, image_url, deleted_at, is_ended_int, now, now),
+            (uuid, title, _title_norm(title), author, description, description_text, snippet, feed_url, _feed_url_canonical(feed_url), website_url, image_url, deleted_at, is_ended_int, now, now),
         )
 
 
@@ -288,28 +696,48 @@ def update_podcast_feed_url(
     if conn is not None:
         if website_url is not None:
             conn.execute(
-                "UPDATE podcasts SET feed_url = ?, website_url = ?, updated_at = ? WHERE uuid = ?",
-                (feed_url, website_url, _iso_now(), uuid),
+                "UPDATE podcasts SET feed_url = ?, feed_url_canonical = ?, website_url = ?, updated_at = ? WHERE uuid = ?",
+                (feed_url, _feed_url_canonical(feed_url), website_url, now_ms(), uuid),
             )
         else:
             conn.execute(
-                "UPDATE podcasts SET feed_url = ?, updated_at = ? WHERE uuid = ?",
-                (feed_url, _iso_now(), uuid),
+                "UPDATE podcasts SET feed_url = ?, feed_url_canonical = ?, updated_at = ? WHERE uuid = ?",
+                (feed_url, _feed_url_canonical(feed_url), now_ms(), uuid),
             )
         return
     with get_connection(db_path) as c:
         if website_url is not None:
             c.execute(
-                "UPDATE podcasts SET feed_url = ?, website_url = ?, updated_at = ? WHERE uuid = ?",
-                (feed_url, website_url, _iso_now(), uuid),
+                "UPDATE podcasts SET feed_url = ?, feed_url_canonical = ?, website_url = ?, updated_at = ? WHERE uuid = ?",
+                (feed_url, _feed_url_canonical(feed_url), website_url, now_ms(), uuid),
             )
         else:
             c.execute(
-                "UPDATE podcasts SET feed_url = ?, updated_at = ? WHERE uuid = ?",
-                (feed_url, _iso_now(), uuid),
+                "UPDATE podcasts SET feed_url = ?, feed_url_canonical = ?, updated_at = ? WHERE uuid = ?",
+                (feed_url, _feed_url_canonical(feed_url), now_ms(), uuid),
             )
 
 
+def update_podcast_feed_urls(
+    updates: List[Tuple[str, str, Optional[str]]],
+    db_path: Optional[Path] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> None:
+    """
+    Batch form of update_podcast_feed_url: (uuid, feed_url, website_url) tuples in one statement;
+    a None website_url keeps the stored one.
+    """
+    now = now_ms()
+    sql = """UPDATE podcasts SET feed_url = ?, feed_url_canonical = ?, website_url = COALESCE(?, website_url), updated_at = ?
+             WHERE uuid = ?"""
+    params = [(feed_url, _feed_url_canonical(feed_url), website_url, now, uuid) for uuid, feed_url, website_url in updates]
+    if conn is not None:
+        conn.executemany(sql, params)
+        return
+    with get_connection(db_path) as c:
+        c.executemany(sql, params)
+
+
 def update_podcast_is_ended(
     uuid: str,
     is_ended: bool,
@@ -321,13 +749,13 @@ def update_podcast_is_ended(
     if conn is not None:
         conn.execute(
             "UPDATE podcasts SET is_ended = ?, updated_at = ? WHERE uuid = ?",
-            (is_ended_int, _iso_now(), uuid),
+            (is_ended_int, now_ms(), uuid),
         )
         return
     with get_connection(db_path) as c:
         c.execute(
             "UPDATE podcasts SET is_ended = ?, updated_at = ? WHERE uuid = ?",
-            (is_ended_int, _iso_now(), uuid),
+            (is_ended_int, now_ms(), uuid),
         )
 
 
@@ -344,6 +772,26 @@ def delete_podcast(
         c.execute("DELETE FROM podcasts WHERE uuid = ?", (uuid,))
 
 
+_UPSERT_EPISODE_SQL = """
+    INSERT INTO episodes (uuid, podcast_uuid, title, title_norm, description_id, summary_snippet, duration, published_date, file_url, file_type, size_bytes, video_url, deleted_at, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(uuid) DO UPDATE SET
+        podcast_uuid = excluded.podcast_uuid,
+        title = COALESCE(excluded.title, title),
+        title_norm = COALESCE(excluded.title_norm, title_norm),
+        description_id = COALESCE(excluded.description_id, description_id),
+        summary_snippet = COALESCE(excluded.summary_snippet, summary_snippet),
+        duration = COALESCE(excluded.duration, duration),
+        published_date = COALESCE(excluded.published_date, published_date),
+        file_url = COALESCE(excluded.file_url, file_url),
+        file_type = COALESCE(excluded.file_type, file_type),
+        size_bytes = COALESCE(excluded.size_bytes, size_bytes),
+        video_url = COALESCE(excluded.video_url, video_url),
+        deleted_at = excluded.deleted_at,
+        updated_at = excluded.updated_at
+"""
+
+
 def upsert_episode(
     uuid: str,
     podcast_uuid: str,
@@ -355,34 +803,49 @@ def upsert_episode(
     file_type: Optional[str] = None,
     size_bytes: Optional[int] = None,
     video_url: Optional[str] = None,
-    deleted_at: Optional[str] = None,
+    deleted_at: Optional[int] = None,
     db_path: Optional[Path] = None,
     conn: Optional[sqlite3.Connection] = None,
 ) -> None:
-    """Insert or update an episode by uuid. Set deleted_at for soft delete."""
-    now = _iso_now()
-    params = (uuid, podcast_uuid, title, description, duration, published_date, file_url, file_type, size_bytes, video_url, deleted_at, now, now)
-    sql = """
-        INSERT INTO episodes (uuid, podcast_uuid, title, description, duration, published_date, file_url, file_type, size_bytes, video_url, deleted_at, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(uuid) DO UPDATE SET
-            podcast_uuid = excluded.podcast_uuid,
-            title = COALESCE(excluded.title, title),
-            description = COALESCE(excluded.description, description),
-            duration = COALESCE(excluded.duration, duration),
-            published_date = COALESCE(excluded.published_date, published_date),
-            file_url = COALESCE(excluded.file_url, file_url),
-            file_type = COALESCE(excluded.file_type, file_type),
-            size_bytes = COALESCE(excluded.size_bytes, size_bytes),
-            video_url = COALESCE(excluded.video_url, video_url),
-            deleted_at = excluded.deleted_at,
-            updated_at = excluded.updated_at
+    """Insert or update an episode by uuid. Set deleted_at (epoch ms) for soft delete. description is stored in episode_descriptions."""
+    now = now_ms()
+    if conn is not None:
+        description_id, snippet = store_description(conn, description)
+        conn.execute(_UPSERT_EPISODE_SQL, (uuid, podcast_uuid, title, _title_norm(title), description_id, snippet, duration, published_date, file_url, file_type, size_bytes, video_url, deleted_at, now, now))
+        return
+    with get_connection(db_path) as c:
+        description_id, snippet = store_description(c, description)
+        c.execute(_UPSERT_EPISODE_SQL, (uuid, podcast_uuid, title, _title_norm(title), description_id, snippet, duration, published_date, file_url, file_type, size_bytes, video_url, deleted_at, now, now))
+
+
+def _episode_upsert_params(c: sqlite3.Connection, podcast_uuid: str, episodes: List[Dict[str, Any]]) -> List[tuple]:
+    now = now_ms()
+    params = []
+    for ep in episodes:
+        description_id, snippet = store_description(c, ep.get("description"))
+        params.append((
+            ep["uuid"], podcast_uuid, ep.get("title"), _title_norm(ep.get("title")), description_id, snippet,
+            ep.get("duration"), ep.get("published_date"), ep.get("file_url"), ep.get("file_type"),
+            ep.get("size_bytes"), ep.get("video_url"), ep.get("deleted_at"), now, now,
+        ))
+    return params
+
+
+def upsert_episodes(
+    podcast_uuid: str,
+    episodes: List[Dict[str, Any]],
+    db_path: Optional[Path] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> None:
+    """
+    Batch form of upsert_episode for one podcast: each dict has uuid and the upsert_episode
+    fields (missing keys are None). Descriptions are stored first, then all rows go in one executemany.
     """
     if conn is not None:
-        conn.execute(sql, params)
+        conn.executemany(_UPSERT_EPISODE_SQL, _episode_upsert_params(conn, podcast_uuid, episodes))
         return
     with get_connection(db_path) as c:
-        c.execute(sql, params)
+        c.executemany(_UPSERT_EPISODE_SQL, _episode_upsert_params(c, podcast_uuid, episodes))
 
 
 def upsert_listening_history(
@@ -391,18 +854,18 @@ def upsert_listening_history(
     duration: float = 0,
     playing_status: int = 0,
     episode_status: Optional[int] = None,
-    first_played_at: Optional[str] = None,
-    last_played_at: Optional[str] = None,
+    first_played_at: Optional[int] = None,
+    last_played_at: Optional[int] = None,
     play_count: int = 1,
     db_path: Optional[Path] = None,
     conn: Optional[sqlite3.Connection] = None,
 ) -> None:
-    """Insert or update listening history for an episode. Computes completion_percentage."""
+    """Insert or update listening history for an episode (timestamps in epoch ms). Computes completion_percentage."""
     if duration and duration > 0:
         completion_percentage = min(100.0, (played_up_to / duration) * 100.0)
     else:
         completion_percentage = None
-    now = _iso_now()
+    now = now_ms()
     first_played_at = first_played_at or now
     last_played_at = last_played_at or now
     params = (episode_uuid, played_up_to, duration, playing_status, episode_status, completion_percentage, first_played_at, last_played_at, play_count, now, now)
@@ -427,16 +890,81 @@ def upsert_listening_history(
         c.execute(sql, params)
 
 
+# Episodes without a listening_history row are implicitly "not played": status 1, nothing played.
+# Placeholder rows restating that default are no longer written; compact_listening_history removes old ones.
+NOT_PLAYED_STATUS = 1
+# Play times an episode without a history row reads as: the old placeholder rows set both to the insert time
+IMPLICIT_LAST_PLAYED_SQL = "COALESCE(lh.last_played_at, e.created_at)"
+# Placeholder rows: nothing played, no episode_status, and play timestamps only ever set to the insert time
+_PLACEHOLDER_HISTORY_SQL = """played_up_to = 0 AND COALESCE(playing_status, 0) IN (0, 1) AND episode_status IS NULL
+        AND play_count <= 1
+        AND COALESCE(first_played_at, created_at) = created_at AND COALESCE(last_played_at, created_at) = created_at"""
+
+
+def implicit_listening_history(
+    episode_uuid: str,
+    duration: Optional[float] = None,
+    created_at: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    The listening_history row an episode without one is read as (same values the old placeholder rows had).
+    created_at is the episode's insert time, which placeholders used for every timestamp.
+    """
+    duration = duration or 0
+    return {
+        "id": None,
+        "episode_uuid": episode_uuid,
+        "played_up_to": 0.0,
+        "duration": duration,
+        "playing_status": NOT_PLAYED_STATUS,
+        "episode_status": None,
+        "completion_percentage": 0.0 if duration > 0 else None,
+        "first_played_at": created_at,
+        "last_played_at": created_at,
+        "play_count": 1,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def compact_listening_history(
+    db_path: Optional[Path] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Delete placeholder listening_history rows (nothing played, status 0/1, no play times of their own, no sessions).
+    Returns the number of rows deleted (or that would be deleted with dry_run).
+    """
+    where = f"""{_PLACEHOLDER_HISTORY_SQL}
+        AND NOT EXISTS (SELECT 1 FROM play_sessions ps WHERE ps.episode_uuid = listening_history.episode_uuid)"""
+    if conn is not None:
+        if dry_run:
+            return conn.execute(f"SELECT COUNT(*) FROM listening_history WHERE {where}").fetchone()[0]
+        return conn.execute(f"DELETE FROM listening_history WHERE {where}").rowcount
+    with get_connection(db_path) as c:
+        return compact_listening_history(conn=c, dry_run=dry_run)
+
+
+def _playing_status_filter(playing_status: Union[int, str]) -> tuple:
+    """(SQL condition on lh, params) for a playing_status filter; a missing history row counts as not played."""
+    if playing_status == "played":
+        return "lh.playing_status IN (2, 3)", []
+    if str(playing_status) == str(NOT_PLAYED_STATUS):
+        return "(lh.playing_status = 1 OR lh.episode_uuid IS NULL)", []
+    return "lh.playing_status = ?", [playing_status]
+
+
 def add_play_session(
     episode_uuid: str,
-    started_at: str,
-    ended_at: Optional[str] = None,
+    started_at: int,
+    ended_at: Optional[int] = None,
     duration_seconds: Optional[float] = None,
     played_from: float = 0,
     played_to: float = 0,
     db_path: Optional[Path] = None,
 ) -> None:
-    """Insert a play session record."""
+    """Insert a play session record (started_at/ended_at in epoch ms)."""
     with get_connection(db_path) as conn:
         conn.execute(
             """
@@ -457,6 +985,13 @@ def get_listening_history_list(db_path: Optional[Path] = None, limit: int = 1000
         return [dict(row) for row in cur.fetchall()]
 
 
+# Podcast columns for list queries: summary_snippet instead of the full HTML/plain descriptions
+PODCAST_LIST_COLUMNS = (
+    "p.id, p.uuid, p.title, p.author, p.summary_snippet, p.feed_url, p.website_url, p.image_url, "
+    "p.deleted_at, p.is_ended, p.created_at, p.updated_at"
+)
+
+
 def get_all_podcasts(
     db_path: Optional[Path] = None,
     search: Optional[str] = None,
@@ -470,8 +1005,8 @@ def get_all_podcasts(
     filter: "active" (not archived and not ended), "archived" (archived), "ended" (ended but not archived), or None (all)
     """
     with get_connection(db_path) as conn:
-        sql = """
-            SELECT p.*, (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND (e.deleted_at IS NULL OR ? = 1)) AS episode_count
+        sql = f"""
+            SELECT {PODCAST_LIST_COLUMNS}, (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND (e.deleted_at IS NULL OR ? = 1)) AS episode_count
             FROM podcasts p
             WHERE 1=1
         """
@@ -553,15 +1088,15 @@ def get_podcast_by_feed_url(
     db_path: Optional[Path] = None,
     include_deleted: bool = False,
 ) -> Optional[Dict[str, Any]]:
-    """Get podcast by feed_url. Normalizes by stripping and trimming trailing slash for comparison."""
-    if not feed_url or not feed_url.strip():
+    """Get podcast by feed_url, compared by canonical form (feed_url_canonical: https, lowercase host, no trailing slash)."""
+    url = canonical_feed_url(feed_url)
+    if not url:
         return None
-    url = feed_url.strip().rstrip("/")
     with get_connection(db_path) as conn:
         sql = """
             SELECT p.*, (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND (e.deleted_at IS NULL OR ? = 1)) AS episode_count
             FROM podcasts p
-            WHERE TRIM(RTRIM(TRIM(COALESCE(p.feed_url, '')), '/')) = ?
+            WHERE p.feed_url_canonical = ?
         """
         params: list = [1 if include_deleted else 0, url]
         if not include_deleted:
@@ -571,6 +1106,65 @@ def get_podcast_by_feed_url(
         return dict(row) if row else None
 
 
+# Episode list columns keyed by response field name. Heavy columns are left out of the
+# default "summary" projection and must be requested explicitly via fields.
+EPISODE_LIST_FIELDS: Dict[str, str] = {
+    "id": "e.id",
+    "uuid": "e.uuid",
+    "podcast_uuid": "e.podcast_uuid",
+    "title": "e.title",
+    "description": "(SELECT decode_description(d.codec, d.body) FROM episode_descriptions d WHERE d.id = e.description_id)",
+    "description_text": "(SELECT decode_description(d.text_codec, d.text_body) FROM episode_descriptions d WHERE d.id = e.description_id)",
+    "summary_snippet": "e.summary_snippet",
+    "duration": "e.duration",
+    "published_date": "e.published_date",
+    "file_url": "e.file_url",
+    "file_type": "e.file_type",
+    "size_bytes": "e.size_bytes",
+    "video_url": "e.video_url",
+    "deleted_at": "e.deleted_at",
+    "created_at": "e.created_at",
+    "updated_at": "e.updated_at",
+    "podcast_title": "p.title",
+    "podcast_author": "p.author",
+    "podcast_image_url": "p.image_url",
+    # Episodes without a history row read as not played (see implicit_listening_history)
+    "played_up_to": "COALESCE(lh.played_up_to, 0.0)",
+    "playing_status": "COALESCE(lh.playing_status, 1)",
+    "episode_status": "lh.episode_status",
+    "completion_percentage": "IIF(lh.episode_uuid IS NULL AND e.duration > 0, 0.0, lh.completion_percentage)",
+    "first_played_at": "COALESCE(lh.first_played_at, e.created_at)",
+    "last_played_at": IMPLICIT_LAST_PLAYED_SQL,
+    "play_count": "COALESCE(lh.play_count, 1)",
+}
+EPISODE_HEAVY_FIELDS = frozenset({"description", "description_text"})
+EPISODE_SUMMARY_FIELDS = tuple(f for f in EPISODE_LIST_FIELDS if f not in EPISODE_HEAVY_FIELDS)
+
+
+def episode_list_fields(fields: Optional[Union[str, Sequence[str]]] = "summary") -> Tuple[str, ...]:
+    """
+    Field names returned by episode list queries. fields: "summary" (default, no heavy columns), "full",
+    or field names (a list or comma-separated string; uuid and podcast_uuid are always included).
+    Raises ValueError for unknown field names.
+    """
+    if fields is None or fields == "summary":
+        return EPISODE_SUMMARY_FIELDS
+    if fields == "full":
+        return tuple(EPISODE_LIST_FIELDS)
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    requested = [f.strip() for f in fields if f.strip()]
+    unknown = [f for f in requested if f not in EPISODE_LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown episode fields: {', '.join(unknown)}")
+    return ("uuid", "podcast_uuid") + tuple(f for f in dict.fromkeys(requested) if f not in ("uuid", "podcast_uuid"))
+
+
+def episode_list_select(fields: Optional[Union[str, Sequence[str]]] = "summary") -> str:
+    """SELECT list for episode list queries over episode_list_fields(fields). Raises ValueError for unknown field names."""
+    return ", ".join(f"{EPISODE_LIST_FIELDS[name]} AS {name}" for name in episode_list_fields(fields))
+
+
 def get_episodes_by_podcast(
     podcast_uuid: str,
     db_path: Optional[Path] = None,
@@ -579,19 +1173,19 @@ def get_episodes_by_podcast(
     playing_status: Optional[Union[int, str]] = None,
     sort: Optional[str] = "newest",
     include_deleted: bool = False,
+    fields: Optional[Union[str, Sequence[str]]] = "summary",
 ) -> List[Dict[str, Any]]:
-    """List episodes for a podcast, optionally filtered by playing_status (1=not played, 2=in progress, 3=completed, 'played'=2 or 3). sort: newest, oldest, last_played, oldest_played."""
+    """List episodes for a podcast, optionally filtered by playing_status (1=not played, 2=in progress, 3=completed, 'played'=2 or 3). sort: newest, oldest, last_played, oldest_played. fields: see episode_list_select."""
     order_by = {
         "newest": "e.published_date DESC NULLS LAST, e.created_at DESC NULLS LAST",
         "oldest": "e.published_date ASC NULLS LAST, e.created_at ASC NULLS LAST",
-        "last_played": "lh.last_played_at DESC NULLS LAST, e.published_date DESC NULLS LAST",
-        "oldest_played": "lh.last_played_at ASC NULLS LAST, e.published_date DESC NULLS LAST",
+        "last_played": f"{IMPLICIT_LAST_PLAYED_SQL} DESC NULLS LAST, e.published_date DESC NULLS LAST",
+        "oldest_played": f"{IMPLICIT_LAST_PLAYED_SQL} ASC NULLS LAST, e.published_date DESC NULLS LAST",
     }.get(sort if sort in ("newest", "oldest", "last_played", "oldest_played") else None, "e.published_date DESC NULLS LAST, e.created_at DESC NULLS LAST")
+    select = episode_list_select(fields)
     with get_connection(db_path) as conn:
-        sql = """
-            SELECT e.*, p.title AS podcast_title, p.author AS podcast_author, p.image_url AS podcast_image_url,
-                   lh.played_up_to, lh.playing_status, lh.completion_percentage,
-                   lh.first_played_at, lh.last_played_at, lh.play_count
+        sql = f"""
+            SELECT {select}
             FROM episodes e
             LEFT JOIN podcasts p ON p.uuid = e.podcast_uuid
             LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
@@ -601,11 +1195,9 @@ def get_episodes_by_podcast(
         if not include_deleted:
             sql += " AND e.deleted_at IS NULL"
         if playing_status is not None:
-            if playing_status == "played":
-                sql += " AND lh.playing_status IN (2, 3)"
-            else:
-                sql += " AND lh.playing_status = ?"
-                params.append(playing_status)
+            condition, condition_params = _playing_status_filter(playing_status)
+            sql += f" AND {condition}"
+            params.extend(condition_params)
         sql += f" ORDER BY {order_by} LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         cur = conn.execute(sql, params)
@@ -613,12 +1205,10 @@ def get_episodes_by_podcast(
 
 
 def get_episode_by_uuid(uuid: str, db_path: Optional[Path] = None, include_deleted: bool = False) -> Optional[Dict[str, Any]]:
-    """Get single episode by uuid with podcast and listening history."""
+    """Get single episode by uuid with podcast, listening history and full description."""
     with get_connection(db_path) as conn:
-        sql = """
-            SELECT e.*, p.title AS podcast_title, p.author AS podcast_author, p.image_url AS podcast_image_url,
-                   lh.played_up_to, lh.playing_status, lh.episode_status, lh.completion_percentage,
-                   lh.first_played_at, lh.last_played_at, lh.play_count
+        sql = f"""
+            SELECT {episode_list_select("full")}
             FROM episodes e
             LEFT JOIN podcasts p ON p.uuid = e.podcast_uuid
             LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
@@ -673,8 +1263,8 @@ def search_podcasts(
     """Search podcasts by title or author."""
     with get_connection(db_path) as conn:
         term = f"%{q}%"
-        sql = """
-            SELECT p.*, (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND (e.deleted_at IS NULL OR ? = 1)) AS episode_count
+        sql = f"""
+            SELECT {PODCAST_LIST_COLUMNS}, (SELECT COUNT(*) FROM episodes e WHERE e.podcast_uuid = p.uuid AND (e.deleted_at IS NULL OR ? = 1)) AS episode_count
             FROM podcasts p
             WHERE (p.title LIKE ? OR p.author LIKE ?)
         """
@@ -695,13 +1285,14 @@ def search_episodes(
     limit: int = 50,
     offset: int = 0,
     include_deleted: bool = False,
+    fields: Optional[Union[str, Sequence[str]]] = "summary",
 ) -> List[Dict[str, Any]]:
-    """Search episodes by title, optionally filtered by podcast and playing_status (1=not played, 2=in progress, 3=completed, 'played'=2 or 3)."""
+    """Search episodes by title, optionally filtered by podcast and playing_status (1=not played, 2=in progress, 3=completed, 'played'=2 or 3). fields: see episode_list_select."""
+    select = episode_list_select(fields)
     with get_connection(db_path) as conn:
         term = f"%{q}%"
-        sql = """
-            SELECT e.*, p.title AS podcast_title, p.image_url AS podcast_image_url, lh.played_up_to, lh.playing_status,
-                   lh.completion_percentage, lh.last_played_at
+        sql = f"""
+            SELECT {select}
             FROM episodes e
             LEFT JOIN podcasts p ON p.uuid = e.podcast_uuid
             LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
@@ -714,12 +1305,10 @@ def search_episodes(
             sql += " AND e.podcast_uuid = ?"
             params.append(podcast_uuid)
         if playing_status is not None:
-            if playing_status == "played":
-                sql += " AND lh.playing_status IN (2, 3)"
-            else:
-                sql += " AND lh.playing_status = ?"
-                params.append(playing_status)
-        sql += " ORDER BY lh.last_played_at DESC NULLS LAST LIMIT ? OFFSET ?"
+            condition, condition_params = _playing_status_filter(playing_status)
+            sql += f" AND {condition}"
+            params.extend(condition_params)
+        sql += f" ORDER BY {IMPLICIT_LAST_PLAYED_SQL} DESC NULLS LAST LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         cur = conn.execute(sql, params)
         return [dict(row) for row in cur.fetchall()]
@@ -733,19 +1322,19 @@ def get_episodes_list(
     playing_status: Optional[Union[int, str]] = None,
     sort: Optional[str] = "last_played",
     include_deleted: bool = False,
+    fields: Optional[Union[str, Sequence[str]]] = "summary",
 ) -> List[Dict[str, Any]]:
-    """List episodes with optional filters for API list endpoint. playing_status: 1=not played, 2=in progress, 3=completed, 'played'=2 or 3. sort: last_played, published, created, title."""
+    """List episodes with optional filters for API list endpoint. playing_status: 1=not played, 2=in progress, 3=completed, 'played'=2 or 3. sort: last_played, published, created, title. fields: see episode_list_select."""
     order_by = {
-        "last_played": "lh.last_played_at DESC NULLS LAST, e.published_date DESC NULLS LAST",
+        "last_played": f"{IMPLICIT_LAST_PLAYED_SQL} DESC NULLS LAST, e.published_date DESC NULLS LAST",
         "published": "e.published_date DESC NULLS LAST, e.created_at DESC NULLS LAST",
         "created": "e.created_at DESC NULLS LAST",
         "title": "e.title ASC NULLS LAST, e.published_date DESC NULLS LAST",
-    }.get(sort, "lh.last_played_at DESC NULLS LAST, e.published_date DESC NULLS LAST")
+    }.get(sort, f"{IMPLICIT_LAST_PLAYED_SQL} DESC NULLS LAST, e.published_date DESC NULLS LAST")
+    select = episode_list_select(fields)
     with get_connection(db_path) as conn:
-        sql = """
-            SELECT e.*, p.title AS podcast_title, p.author AS podcast_author, p.image_url AS podcast_image_url,
-                   lh.played_up_to, lh.playing_status, lh.completion_percentage,
-                   lh.first_played_at, lh.last_played_at, lh.play_count
+        sql = f"""
+            SELECT {select}
             FROM episodes e
             LEFT JOIN podcasts p ON p.uuid = e.podcast_uuid
             LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
@@ -758,11 +1347,9 @@ def get_episodes_list(
             sql += " AND e.podcast_uuid = ?"
             params.append(podcast_uuid)
         if playing_status is not None:
-            if playing_status == "played":
-                sql += " AND lh.playing_status IN (2, 3)"
-            else:
-                sql += " AND lh.playing_status = ?"
-                params.append(playing_status)
+            condition, condition_params = _playing_status_filter(playing_status)
+            sql += f" AND {condition}"
+            params.extend(condition_params)
         sql += f" ORDER BY {order_by} LIMIT ? OFFSET ?"
         params.extend([limit, offset])
         cur = conn.execute(sql, params)
@@ -789,11 +1376,9 @@ def get_episodes_list_count(
             sql += " AND e.podcast_uuid = ?"
             params.append(podcast_uuid)
         if playing_status is not None:
-            if playing_status == "played":
-                sql += " AND lh.playing_status IN (2, 3)"
-            else:
-                sql += " AND lh.playing_status = ?"
-                params.append(playing_status)
+            condition, condition_params = _playing_status_filter(playing_status)
+            sql += f" AND {condition}"
+            params.extend(condition_params)
         cur = conn.execute(sql, params)
         row = cur.fetchone()
         return row["n"] if row else 0
@@ -802,29 +1387,29 @@ def get_episodes_list_count(
 def get_last_sync_timestamp(
     db_path: Optional[Path] = None,
     conn: Optional[sqlite3.Connection] = None,
-) -> Optional[str]:
-    """Return the last sync timestamp (ISO string) from _schema_meta, or None if never synced."""
+) -> Optional[int]:
+    """Return the last sync timestamp (epoch ms) from _schema_meta, or None if never synced."""
     if conn is not None:
         cur = conn.execute(
             "SELECT value FROM _schema_meta WHERE key = ?",
             ("last_sync_timestamp",),
         )
         row = cur.fetchone()
-        return row["value"] if row else None
+        return int(row["value"]) if row and row["value"] else None
     with get_connection(db_path) as c:
         return get_last_sync_timestamp(conn=c)
 
 
 def set_last_sync_timestamp(
-    timestamp: str,
+    timestamp: int,
     db_path: Optional[Path] = None,
     conn: Optional[sqlite3.Connection] = None,
 ) -> None:
-    """Store the last sync timestamp (ISO string) in _schema_meta."""
+    """Store the last sync timestamp (epoch ms) in _schema_meta."""
     if conn is not None:
         conn.execute(
             "INSERT OR REPLACE INTO _schema_meta (key, value) VALUES (?, ?)",
-            ("last_sync_timestamp", timestamp),
+            ("last_sync_timestamp", str(timestamp)),
         )
         return
     with get_connection(db_path) as c:
@@ -832,7 +1417,7 @@ def set_last_sync_timestamp(
 
 
 def record_sync_history(
-    sync_timestamp: str,
+    sync_timestamp: int,
     source_path: Optional[str] = None,
     podcasts_added: int = 0,
     podcasts_updated: int = 0,
@@ -841,30 +1426,34 @@ def record_sync_history(
     episodes_updated: int = 0,
     episodes_deleted: int = 0,
     conflicts_count: int = 0,
+    podcasts_unchanged: int = 0,
+    episodes_unchanged: int = 0,
     db_path: Optional[Path] = None,
     conn: Optional[sqlite3.Connection] = None,
 ) -> None:
     """Insert a sync history record."""
-    now = _iso_now()
+    now = now_ms()
     params = (
         sync_timestamp,
         source_path,
         podcasts_added,
         podcasts_updated,
         podcasts_deleted,
+        podcasts_unchanged,
         episodes_added,
         episodes_updated,
         episodes_deleted,
+        episodes_unchanged,
         conflicts_count,
         now,
     )
     sql = """
         INSERT INTO sync_history (
             sync_timestamp, source_path,
-            podcasts_added, podcasts_updated, podcasts_deleted,
-            episodes_added, episodes_updated, episodes_deleted,
+            podcasts_added, podcasts_updated, podcasts_deleted, podcasts_unchanged,
+            episodes_added, episodes_updated, episodes_deleted, episodes_unchanged,
             conflicts_count, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
     if conn is not None:
         conn.execute(sql, params)
@@ -873,6 +1462,34 @@ def record_sync_history(
         c.execute(sql, params)
 
 
+def get_sync_row_hashes(entity: str, conn: sqlite3.Connection) -> Dict[str, bytes]:
+    """Return {uuid: row_hash} for source rows of entity ('podcast' or 'episode') applied by earlier syncs."""
+    cur = conn.execute("SELECT uuid, row_hash FROM sync_row_hashes WHERE entity = ?", (entity,))
+    return {row[0]: row[1] for row in cur.fetchall()}
+
+
+def set_sync_row_hashes(entity: str, hashes: List[tuple], conn: sqlite3.Connection) -> None:
+    """Store (uuid, row_hash) pairs for source rows of entity applied by this sync."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO sync_row_hashes (entity, uuid, row_hash) VALUES (?, ?, ?)",
+        [(entity, uuid, row_hash) for uuid, row_hash in hashes],
+    )
+
+
+def get_dirty_podcasts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Return {podcast_uuid: marked_at} for podcasts changed since the last duplicate sweep."""
+    cur = conn.execute("SELECT podcast_uuid, marked_at FROM dirty_podcasts")
+    return {row[0]: row[1] for row in cur.fetchall()}
+
+
+def clear_dirty_podcasts(marks: Dict[str, int], conn: sqlite3.Connection) -> None:
+    """Clear the marks a sweep read; podcasts marked again since then stay dirty."""
+    conn.executemany(
+        "DELETE FROM dirty_podcasts WHERE podcast_uuid = ? AND marked_at = ?",
+        list(marks.items()),
+    )
+
+
 def get_sync_history(
     db_path: Optional[Path] = None,
     limit: int = 50,
@@ -0,0 +1,289 @@
+"""
+SQLite statement tracing for get_connection: per-statement timing, rows returned and a
+normalized query fingerprint. Statements are attributed to the current API request via a
+contextvar, aggregated per fingerprint for a top-N slow query view, and statements over
+the slow-query threshold are logged with their EXPLAIN QUERY PLAN.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import metrics
+from config import get_db_trace_enabled, get_slow_query_ms
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestDBStats:
+    """DB work attributed to one request."""
+    queries: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class QueryStats:
+    """Aggregated timings for one query fingerprint."""
+    fingerprint: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+    slow_count: int = 0
+
+
+_request_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("db_request_stats", default=None)
+_query_stats: Dict[str, QueryStats] = {}
+_query_stats_lock = threading.Lock()
+
+# Cap on distinct fingerprints kept in memory (ad-hoc SQL could otherwise grow it forever)
+MAX_FINGERPRINTS = 2000
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so statements differing only in literals or IN-list length group together."""
+    s = _STRING_LITERAL.sub("?", sql)
+    s = _NUMBER_LITERAL.sub("?", s)
+    s = _IN_LIST.sub("IN (...)", s)
+    return _WHITESPACE.sub(" ", s).strip()
+
+
+def begin_request() -> Token:
+    """Start attributing statements on this context to a new request."""
+    return _request_stats.set(RequestDBStats())
+
+
+def current_request_stats() -> Optional[RequestDBStats]:
+    return _request_stats.get()
+
+
+def end_request(token: Token) -> None:
+    _request_stats.reset(token)
+
+
+def top_queries(limit: int = 20, sort: str = "total") -> List[Dict[str, Any]]:
+    """Aggregated statement stats, ordered by total, max or mean time."""
+    with _query_stats_lock:
+        items = list(_query_stats.values())
+    key = {
+        "max": lambda q: q.max_seconds,
+        "mean": lambda q: q.total_seconds / q.count if q.count else 0.0,
+        "count": lambda q: q.count,
+    }.get(sort, lambda q: q.total_seconds)
+    items.sort(key=key, reverse=True)
+    return [
+        {
+            "fingerprint": q.fingerprint,
+            "count": q.count,
+            "slow_count": q.slow_count,
+            "total_ms": round(q.total_seconds * 1000, 3),
+            "mean_ms": round(q.total_seconds / q.count * 1000, 3) if q.count else 0.0,
+            "max_ms": round(q.max_seconds * 1000, 3),
+            "rows": q.rows,
+        }
+        for q in items[:limit]
+    ]
+
+
+def reset_query_stats() -> None:
+    with _query_stats_lock:
+        _query_stats.clear()
+
+
+class _Statement:
+    __slots__ = ("sql", "params", "seconds", "rows", "many")
+
+    def __init__(self, sql: str, params: Any, seconds: float, many: bool):
+        self.sql = sql
+        self.params = params
+        self.seconds = seconds
+        self.rows = 0
+        self.many = many
+
+
+class TracedCursor(sqlite3.Cursor):
+    """
+    Cursor that times execute and fetch calls. A statement is reported once it is done:
+    right after execute for statements without result rows, otherwise when its rows are
+    exhausted, the cursor is re-used, closed or garbage-collected.
+    """
+
+    _statement: Optional[_Statement] = None
+
+    def execute(self, sql, parameters=()):
+        self._close_statement()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._statement = _Statement(sql, parameters, time.perf_counter() - start, many=False)
+            if self.description is None:
+                self._close_statement()
+
+    def executemany(self, sql, seq_of_parameters):
+        self._close_statement()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._statement = _Statement(sql, None, time.perf_counter() - start, many=True)
+            self._close_statement()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._add_fetch(time.perf_counter() - start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._add_fetch(time.perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._add_fetch(time.perf_counter() - start, len(rows))
+        self._close_statement()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._close_statement()
+            raise
+        self._add_fetch(time.perf_counter() - start, 1)
+        return row
+
+    def close(self):
+        self._close_statement()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._close_statement()
+        except Exception:
+            pass
+
+    def _add_fetch(self, seconds: float, rows: int) -> None:
+        statement = self._statement
+        if statement is not None:
+            statement.seconds += seconds
+            statement.rows += rows
+
+    def _close_statement(self) -> None:
+        statement = self._statement
+        if statement is None:
+            return
+        self._statement = None
+        if not statement.rows and self.rowcount > 0:
+            statement.rows = self.rowcount
+        self.connection._record(statement)
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors are TracedCursor; slow statements are explained on finish()."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slow_ms = get_slow_query_ms()
+        self._slow: List[_Statement] = []
+        self._finished = False
+        self._live_cursors: "weakref.WeakSet[TracedCursor]" = weakref.WeakSet()
+
+    def cursor(self, factory=TracedCursor):
+        cur = super().cursor(factory)
+        if isinstance(cur, TracedCursor):
+            self._live_cursors.add(cur)
+        return cur
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def _record(self, statement: _Statement) -> None:
+        metrics.DB_QUERIES.inc()
+        metrics.DB_QUERY_SECONDS.inc(amount=statement.seconds)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += statement.seconds
+        slow = statement.seconds * 1000 >= self._slow_ms
+        if slow:
+            if self._finished:
+                logger.warning("Slow query %.1fms rows=%d: %s", statement.seconds * 1000, statement.rows, fingerprint(statement.sql))
+            else:
+                self._slow.append(statement)
+        fp = fingerprint(statement.sql)
+        with _query_stats_lock:
+            q = _query_stats.get(fp)
+            if q is None:
+                if len(_query_stats) >= MAX_FINGERPRINTS:
+                    return
+                q = _query_stats[fp] = QueryStats(fingerprint=fp)
+            q.count += 1
+            q.total_seconds += statement.seconds
+            q.rows += statement.rows
+            if statement.seconds > q.max_seconds:
+                q.max_seconds = statement.seconds
+            if slow:
+                q.slow_count += 1
+
+    def finish(self) -> None:
+        """Report statements still open on live cursors, then log slow ones with their query plan."""
+        for cur in list(self._live_cursors):
+            cur._close_statement()
+        self._finished = True
+        slow, self._slow = self._slow, []
+        for statement in slow:
+            logger.warning(
+                "Slow query %.1fms rows=%d: %s\n%s",
+                statement.seconds * 1000,
+                statement.rows,
+                fingerprint(statement.sql),
+                self._explain(statement),
+            )
+
+    def _explain(self, statement: _Statement) -> str:
+        if statement.many or not statement.sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+            return "  (no plan)"
+        try:
+            rows = sqlite3.Connection.execute(self, "EXPLAIN QUERY PLAN " + statement.sql, statement.params).fetchall()
+        except sqlite3.Error as e:
+            return f"  (plan unavailable: {e})"
+        return "\n".join(f"  {row[3]}" for row in rows)
+
+
+def connect(path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a connection, traced when PODCASTS_DB_TRACE is enabled."""
+    metrics.DB_CONNECTIONS.inc()
+    if get_db_trace_enabled():
+        return sqlite3.connect(path, factory=TracedConnection, check_same_thread=check_same_thread)
+    return sqlite3.connect(path, check_same_thread=check_same_thread)
+
+
+def finish(conn: sqlite3.Connection) -> None:
+    """Flush tracing for conn (no-op for untraced connections). Call before close."""
+    if isinstance(conn, TracedConnection):
+        try:
+            conn.finish()
+        except Exception:
+            logger.exception("Failed to flush DB trace")
@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
 Match OPML entries to DB podcasts by title and set feed_url from OPML's xmlUrl.
+Titles without an exact match fall back to a ranked fuzzy match (see api.services.feed_url_enrichment).
 Run from project root. Usage:
   python enrich_feeds_from_opml.py [path/to/file.opml]
+  python enrich_feeds_from_opml.py --dry-run --no-fuzzy path/to/file.opml
 Default OPML path: PocketCasts.opml in project root.
 """
 import argparse
-import html
-import re
 import sys
 from pathlib import Path
 
@@ -17,18 +17,9 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from config import get_db_path
-from database import get_connection, init_schema, update_podcast_feed_url
-from api.utils.opml_parser import parse_opml
-
-
-def _normalize_title(title: str) -> str:
-    """Normalize for matching: strip, lower, decode entities, collapse spaces."""
-    if not title:
-        return ""
-    s = title.strip().lower()
-    s = html.unescape(s)
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+from database import init_schema
+from api.services.feed_url_enrichment import DEFAULT_FUZZY_MIN_SCORE, enrich_feed_urls
+from api.utils.opml_parser import OPMLError
 
 
 def main() -> None:
@@ -41,78 +32,61 @@ def main() -> None:
         default=str(PROJECT_ROOT / "PocketCasts.opml"),
         help="Path to OPML file (default: PocketCasts.opml in project root)",
     )
+    parser.add_argument("--db", type=Path, default=None, help="Path to SQLite database (default: from config)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report matches; do not update the database")
+    parser.add_argument("--no-fuzzy", action="store_true", help="Only match titles exactly (after normalization)")
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=DEFAULT_FUZZY_MIN_SCORE,
+        help=f"Minimum fuzzy match score, 0-1 (default: {DEFAULT_FUZZY_MIN_SCORE})",
+    )
     args = parser.parse_args()
     opml_path = Path(args.opml_path)
     if not opml_path.is_file():
         print(f"Error: OPML file not found: {opml_path}", file=sys.stderr)
         sys.exit(1)
 
-    opml_content = opml_path.read_bytes()
+    db_path = args.db or get_db_path()
+    init_schema(db_path)
+
+    # Entries are streamed from the file; a parse error means nothing is updated
     try:
-        entries = parse_opml(opml_content)
-    except Exception as e:
+        with open(opml_path, "rb") as opml_file:
+            report = enrich_feed_urls(
+                opml_file,
+                db_path=db_path,
+                dry_run=args.dry_run,
+                fuzzy=not args.no_fuzzy,
+                min_score=args.min_score,
+            )
+    except OPMLError as e:
         print(f"Error parsing OPML: {e}", file=sys.stderr)
         sys.exit(1)
 
-    db_path = get_db_path()
-    init_schema(db_path)
-
-    with get_connection(db_path) as conn:
-        cur = conn.execute(
-            """SELECT uuid, title, website_url, feed_url FROM podcasts
-               WHERE deleted_at IS NULL"""
-        )
-        podcasts = [dict(row) for row in cur.fetchall()]
-
-    # Build normalized_title -> list of podcasts (for duplicate detection)
-    by_normalized: dict[str, list[dict]] = {}
-    for p in podcasts:
-        t = (p.get("title") or "").strip()
-        key = _normalize_title(t)
-        if key not in by_normalized:
-            by_normalized[key] = []
-        by_normalized[key].append(p)
-
-    updated = 0
-    unmatched: list[str] = []
-    multiple_matches: list[str] = []
-
-    for entry in entries:
-        feed_url = (entry.get("feed_url") or "").strip()
-        opml_title = (entry.get("title") or "").strip()
-        website_url = (entry.get("website_url") or "").strip() or None
-        if not feed_url:
-            continue
-        key = _normalize_title(opml_title)
-        candidates = by_normalized.get(key, [])
-        if len(candidates) == 0:
-            unmatched.append(opml_title)
-            continue
-        if len(candidates) > 1:
-            multiple_matches.append(opml_title)
-            continue
-        podcast = candidates[0]
-        update_podcast_feed_url(
-            uuid=podcast["uuid"],
-            feed_url=feed_url,
-            website_url=website_url,
-            db_path=db_path,
-        )
-        updated += 1
-
-    print(f"Updated feed_url for {updated} podcast(s).")
+    verb = "Would update" if report.dry_run else "Updated"
+    print(f"{verb} feed_url for {report.updated} podcast(s) ({report.exact} exact, {report.fuzzy} fuzzy title match(es)).")
+    fuzzy = [m for m in report.matches if m.status == "fuzzy"]
+    if fuzzy:
+        print(f"Fuzzy title matches ({len(fuzzy)}):")
+        for m in fuzzy[:20]:
+            print(f"  - {m.opml_title} -> {m.podcast_title} ({m.score:.2f})")
+        if len(fuzzy) > 20:
+            print(f"  ... and {len(fuzzy) - 20} more")
+    unmatched = [m for m in report.matches if m.status == "unmatched"]
     if unmatched:
         print(f"Unmatched OPML titles ({len(unmatched)}):")
-        for t in unmatched[:20]:
-            print(f"  - {t}")
+        for m in unmatched[:20]:
+            print(f"  - {m.opml_title}")
         if len(unmatched) > 20:
             print(f"  ... and {len(unmatched) - 20} more")
-    if multiple_matches:
-        print(f"Multiple DB matches (skipped) ({len(multiple_matches)}):")
-        for t in multiple_matches[:10]:
-            print(f"  - {t}")
-        if len(multiple_matches) > 10:
-            print(f"  ... and {len(multiple_matches) - 10} more")
+    ambiguous = [m for m in report.matches if m.status == "ambiguous"]
+    if ambiguous:
+        print(f"Multiple DB matches (skipped) ({len(ambiguous)}):")
+        for m in ambiguous[:10]:
+            print(f"  - {m.opml_title}: {', '.join(c.title for c in m.candidates)}")
+        if len(ambiguous) > 10:
+            print(f"  ... and {len(ambiguous) - 10} more")
 
 
 if __name__ == "__main__":
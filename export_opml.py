@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Export podcast subscriptions as OPML, e.g. to move them to another instance or podcast app.
+Streams from the database, so large libraries export in constant memory.
+Run from project root. Usage:
+  python export_opml.py -o subscriptions.opml                   # active and ended podcasts
+  python export_opml.py --status active --status archived > subscriptions.opml
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure project root is on path
+PROJECT_ROOT = Path(__file__).resolve().parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from api.services.opml_export import DEFAULT_OPML_STATUSES, OPML_STATUSES, export_opml
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export podcast subscriptions as OPML.")
+    parser.add_argument("--db", type=Path, default=None, help="Path to SQLite database (default: from config)")
+    parser.add_argument(
+        "--status",
+        choices=OPML_STATUSES,
+        action="append",
+        default=None,
+        help=f"Podcasts to include; repeat for several (default: {' and '.join(DEFAULT_OPML_STATUSES)})",
+    )
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Output file (default: stdout)")
+    args = parser.parse_args()
+    statuses = args.status or DEFAULT_OPML_STATUSES
+
+    if args.output is None:
+        export_opml(sys.stdout.buffer, statuses, db_path=args.db)
+        return
+    with open(args.output, "wb") as out:
+        written = export_opml(out, statuses, db_path=args.db)
+    print(f"Exported {written / 1e3:.1f} KB to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
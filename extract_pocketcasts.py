@@ -7,36 +7,32 @@ import json
 import sqlite3
 import zipfile
 import argparse
-import os
+import shutil
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
+from import_pocketcasts import extract_db_from_zip, find_db_member
 
-def extract_database(zip_path: str, extract_dir: str = "/tmp/pocketcasts_extract") -> Optional[str]:
-    """Extract the Pocket Casts database from ZIP file."""
-    os.makedirs(extract_dir, exist_ok=True)
-    
+
+def extract_database(zip_path: str, extract_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Extract the Pocket Casts database from ZIP file.
+    Only the database member is streamed out; without extract_dir it goes to a new temporary directory.
+    """
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        
-        # Look for SQLite database files
-        db_files = list(Path(extract_dir).rglob("*.db")) + list(Path(extract_dir).rglob("*.sqlite"))
-        
-        if not db_files:
-            print("No database files found in ZIP. Looking for other files...")
-            all_files = list(Path(extract_dir).rglob("*"))
-            print(f"Found files: {[str(f) for f in all_files]}")
-            return None
-        
-        # Return the first database file found
-        return str(db_files[0])
-    
-    except Exception as e:
+            if find_db_member(zip_ref) is None:
+                print("No database files found in ZIP. Looking for other files...")
+                print(f"Found files: {zip_ref.namelist()}")
+                return None
+    except zipfile.BadZipFile as e:
         print(f"Error extracting ZIP: {e}")
         return None
 
+    db_path = extract_db_from_zip(zip_path, extract_dir=extract_dir)
+    return str(db_path) if db_path else None
+
 
 def get_listening_history(db_path: str) -> List[Dict[str, Any]]:
     """Extract listening history from Pocket Casts database."""
@@ -247,6 +243,7 @@ def main():
     args = parser.parse_args()
     
     # Get database path
+    extract_dir = None
     if args.db_path:
         db_path = args.db_path
     else:
@@ -255,23 +252,27 @@ def main():
         if not db_path:
             print("Failed to extract database")
             return
+        extract_dir = Path(db_path).parent
     
-    print(f"Reading database from {db_path}...")
-    
-    # Extract history
-    history = get_listening_history(db_path)
-    
-    if not history:
-        print("No history found")
-        return
-    
-    # Save to JSON
-    save_to_json(history, args.json)
-    
-    # Save to SQLite if requested
-    if args.sqlite:
-        save_to_sqlite(history, args.sqlite)
-
+    try:
+        print(f"Reading database from {db_path}...")
+        
+        # Extract history
+        history = get_listening_history(db_path)
+        
+        if not history:
+            print("No history found")
+            return
+        
+        # Save to JSON
+        save_to_json(history, args.json)
+        
+        # Save to SQLite if requested
+        if args.sqlite:
+            save_to_sqlite(history, args.sqlite)
+    finally:
+        if extract_dir is not None:
+            shutil.rmtree(extract_dir, ignore_errors=True)
 
 if __name__ == '__main__':
     main()
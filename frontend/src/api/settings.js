@@ -3,7 +3,7 @@ import api from './api';
 /**
  * Upload OPML file and run import. Returns import report.
  * @param {File} file - OPML file (.opml or .xml)
- * @returns {Promise<{ podcasts_found: number, podcasts_added: number, podcasts_updated: number, metadata_enriched: number, errors: string[] }>}
+ * @returns {Promise<{ podcasts_found: number, podcasts_added: number, podcasts_updated: number, metadata_enriched: number, fetches_skipped: number, elapsed_seconds: number, fetch_seconds: number, db_seconds: number, errors: string[] }>}
  */
 export async function importOPML(file) {
   const formData = new FormData();
@@ -123,6 +123,8 @@ export default function SettingsPage() {
             <li>Added: <strong className="text-foreground">{report.podcasts_added}</strong></li>
             <li>Updated: <strong className="text-foreground">{report.podcasts_updated}</strong></li>
             <li>Metadata enriched from RSS: <strong className="text-foreground">{report.metadata_enriched}</strong></li>
+            <li>Already complete (not fetched): <strong className="text-foreground">{report.fetches_skipped}</strong></li>
+            <li>Time: <strong className="text-foreground">{report.elapsed_seconds?.toFixed(1)}s</strong></li>
           </ul>
           {report.errors?.length > 0 && (
             <div className="mt-4">
@@ -167,8 +167,8 @@ export default function SyncPage() {
             Last run summary
           </h2>
           <ul className="text-muted-foreground text-sm space-y-1">
-            <li>Podcasts: +{lastReport.podcasts_added ?? 0} added, {lastReport.podcasts_updated ?? 0} updated, {lastReport.podcasts_deleted ?? 0} deleted</li>
-            <li>Episodes: +{lastReport.episodes_added ?? 0} added, {lastReport.episodes_updated ?? 0} updated, {lastReport.episodes_deleted ?? 0} deleted</li>
+            <li>Podcasts: +{lastReport.podcasts_added ?? 0} added, {lastReport.podcasts_updated ?? 0} changed, {lastReport.podcasts_deleted ?? 0} deleted, {lastReport.podcasts_unchanged ?? 0} unchanged</li>
+            <li>Episodes: +{lastReport.episodes_added ?? 0} added, {lastReport.episodes_updated ?? 0} changed, {lastReport.episodes_deleted ?? 0} deleted, {lastReport.episodes_unchanged ?? 0} unchanged</li>
             <li>Conflicts resolved: {lastReport.conflicts_count ?? 0}</li>
           </ul>
         </section>
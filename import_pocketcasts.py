@@ -3,48 +3,102 @@
 Import listening history from Pocket Casts export database into the local SQLite schema.
 Supports initial import and incremental updates (merge by uuid), sync tracking,
 conflict resolution, deletion handling, and sync reporting.
+
+Incremental (delta) syncs hash every source podcast and episode row and skip those whose hash
+matches the one stored by the previous sync (sync_row_hashes), so a resync only touches rows
+that changed in Pocket Casts since then.
 """
 import argparse
+import hashlib
+import shutil
 import sqlite3
+import tempfile
+import time
 import zipfile
-import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
+import metrics
 from config import get_db_path
 from database import (
+    CREATE_EPISODE_DESCRIPTIONS,
+    CREATE_EPISODES,
+    CREATE_LISTENING_HISTORY,
+    CREATE_PODCASTS,
+    SCHEMA_VERSION,
+    encode_description,
+    get_schema_version,
     init_schema,
     upsert_podcast,
     upsert_episode,
     upsert_listening_history,
     get_connection,
+    get_sync_row_hashes,
+    set_sync_row_hashes,
+    ms_to_iso,
+    now_ms,
     set_last_sync_timestamp,
     record_sync_history,
 )
 
 
+class TargetSchemaOutdatedError(Exception):
+    """Raised by a dry run when the target database has not been migrated to the current schema yet."""
+
+    def __init__(self, version: int):
+        self.version = version
+        super().__init__(
+            f"Target database is at schema version {version}, expected {SCHEMA_VERSION}; "
+            "run a sync (or init_schema) to migrate it before a dry run."
+        )
+
+
 @dataclass
 class SyncReport:
-    """Statistics from a sync run."""
-    sync_timestamp: str
+    """Statistics from a sync run. *_updated counts changed rows; *_unchanged rows were skipped."""
+    sync_timestamp: int  # epoch ms
+    source_path: Optional[str] = None
+    podcasts_added: int = 0
+    podcasts_updated: int = 0
+    podcasts_deleted: int = 0
+    podcasts_unchanged: int = 0
+    episodes_added: int = 0
+    episodes_updated: int = 0
+    episodes_deleted: int = 0
+    episodes_unchanged: int = 0
+    conflicts_count: int = 0
+
+
+@dataclass
+class SyncDiff:
+    """
+    Change set a sync would apply, computed without writing (dry run). Counts mirror SyncReport;
+    *_fields count, per target column, the changed existing rows whose value would differ.
+    """
     source_path: Optional[str] = None
+    incremental: bool = True
     podcasts_added: int = 0
     podcasts_updated: int = 0
     podcasts_deleted: int = 0
+    podcasts_unchanged: int = 0
+    podcast_fields: Dict[str, int] = field(default_factory=dict)
     episodes_added: int = 0
     episodes_updated: int = 0
     episodes_deleted: int = 0
+    episodes_unchanged: int = 0
+    episode_fields: Dict[str, int] = field(default_factory=dict)
+    history_added: int = 0
     conflicts_count: int = 0
+    history_fields: Dict[str, int] = field(default_factory=dict)
 
 
 # Cocoa epoch: seconds between 2001-01-01 and 1970-01-01 (Unix)
 _COCOA_EPOCH_OFFSET = 978307200
 
 
-def _timestamp_to_iso(value: Optional[float]) -> Optional[str]:
-    """Convert Pocket Casts REAL timestamp (seconds since epoch or Cocoa epoch) to ISO string."""
+def _timestamp_to_ms(value: Optional[float]) -> Optional[int]:
+    """Convert Pocket Casts REAL timestamp (seconds since epoch or Cocoa epoch) to epoch milliseconds."""
     if value is None:
         return None
     try:
@@ -54,46 +108,79 @@ def _timestamp_to_iso(value: Optional[float]) -> Optional[str]:
             v = v / 1000.0
         if v < 1e9:  # likely Cocoa (seconds since 2001)
             v = v + _COCOA_EPOCH_OFFSET
-        return datetime.utcfromtimestamp(v).strftime("%Y-%m-%dT%H:%M:%SZ")
-    except (ValueError, OSError):
+        return int(v) * 1000
+    except (ValueError, OverflowError):
         return None
 
 
-def _iso_to_cocoa_timestamp(iso_str: Optional[str]) -> Optional[float]:
-    """Convert ISO 8601 timestamp to Cocoa epoch (seconds since 2001-01-01) for Pocket Casts comparison."""
-    if not iso_str:
-        return None
-    try:
-        # Parse ISO format (e.g. 2026-01-29T12:00:00Z)
-        dt = datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
-        unix_ts = dt.timestamp()
-        return unix_ts - _COCOA_EPOCH_OFFSET
-    except (ValueError, TypeError):
-        return None
+# Database member suffixes, in order of preference
+DB_MEMBER_SUFFIXES = (".sqlite3", ".sqlite", ".db")
+# Copy buffer for streaming archive members and uploads to disk
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def find_db_member(z: zipfile.ZipFile) -> Optional[zipfile.ZipInfo]:
+    """Return the archive member holding the Pocket Casts database, or None. Skips macOS resource forks."""
+    candidates = [
+        info
+        for info in z.infolist()
+        if not info.is_dir() and not info.filename.startswith("__MACOSX/") and not Path(info.filename).name.startswith("._")
+    ]
+    for suffix in DB_MEMBER_SUFFIXES:
+        for info in candidates:
+            if info.filename.lower().endswith(suffix):
+                return info
+    return None
 
 
-def extract_db_from_zip(zip_path: str, extract_dir: str = "/tmp/pocketcasts_extract") -> Optional[Path]:
-    """Extract Pocket Casts database from ZIP; return path to SQLite file."""
-    os.makedirs(extract_dir, exist_ok=True)
+def extract_db_from_zip(zip_path: str, extract_dir: Optional[str] = None) -> Optional[Path]:
+    """
+    Stream the Pocket Casts database member out of a ZIP; return the path of the extracted SQLite file.
+    Only that member is read. Without extract_dir a fresh temporary directory is created, which the
+    caller owns and should remove.
+    """
     try:
         with zipfile.ZipFile(zip_path, "r") as z:
-            z.extractall(extract_dir)
-        for ext in ("*.sqlite3", "*.sqlite", "*.db"):
-            for f in Path(extract_dir).rglob(ext):
-                return f
-        return None
-    except Exception as e:
+            info = find_db_member(z)
+            if info is None:
+                return None
+            extract_dir = extract_dir or tempfile.mkdtemp(prefix="pocketcasts_extract_")
+            # Flatten the member name so archive paths cannot escape extract_dir
+            target = Path(extract_dir) / Path(info.filename).name
+            with z.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+            return target
+    except (zipfile.BadZipFile, OSError) as e:
         print(f"Error extracting ZIP: {e}")
         return None
 
 
+# Source columns read from the export; row hashes cover exactly these, in this order
+PODCAST_SOURCE_COLUMNS = (
+    "uuid", "title", "author", "podcastDescription", "podcastUrl", "imageURL", "thumbnailURL", "wasDeleted",
+)
+EPISODE_SOURCE_COLUMNS = (
+    "uuid", "podcastUuid", "title", "episodeDescription", "duration", "publishedDate",
+    "downloadUrl", "fileType", "sizeInBytes", "playedUpTo", "playingStatus", "episodeStatus",
+    "addedDate", "lastPlaybackInteractionDate", "wasDeleted",
+)
+
+
+def _row_hash(*values) -> bytes:
+    """
+    Digest of the selected columns of a source row; equal digests mean nothing changed.
+    Registered as the SQL function sync_row_hash(...) for dry runs.
+    """
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=16).digest()
+
+
 def _resolve_listening_history_conflict(
     existing: dict,
     new_played_up_to: float,
-    new_first_played_at: Optional[str],
-    new_last_played_at: Optional[str],
+    new_first_played_at: Optional[int],
+    new_last_played_at: Optional[int],
     new_play_count: int,
-) -> tuple[float, Optional[str], Optional[str], int]:
+) -> tuple[float, Optional[int], Optional[int], int]:
     """
     Resolve conflict: played_up_to = max, first_played_at = earliest, last_played_at = latest, play_count = sum.
     Returns (played_up_to, first_played_at, last_played_at, play_count).
@@ -124,33 +211,39 @@ def import_from_pocketcasts_db(
     """
     Read SJPodcast and SJEpisode from source_db and upsert into target schema.
     Tracks sync timestamp, handles conflicts and deletions, returns SyncReport.
+    With incremental=True rows unchanged since the previous sync are skipped; otherwise
+    every row is applied again. Row hashes are stored either way.
     """
+    start = time.perf_counter()
     target_db = target_db or get_db_path()
     init_schema(target_db)
-    now = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    now = now_ms()
     report = SyncReport(sync_timestamp=now, source_path=source_path_for_report or str(source_db))
 
     src = sqlite3.connect(str(source_db))
     src.row_factory = sqlite3.Row
 
     try:
-        cur = src.execute(
-            "SELECT uuid, title, author, podcastDescription, podcastUrl, imageURL, thumbnailURL, wasDeleted FROM SJPodcast"
-        )
+        cur = src.execute(f"SELECT {', '.join(PODCAST_SOURCE_COLUMNS)} FROM SJPodcast")
         podcasts = cur.fetchall()
-        cur = src.execute(
-            """SELECT uuid, podcastUuid, title, episodeDescription, duration, publishedDate,
-                      downloadUrl, fileType, sizeInBytes, playedUpTo, playingStatus, episodeStatus,
-                      addedDate, lastPlaybackInteractionDate, wasDeleted
-               FROM SJEpisode"""
-        )
+        cur = src.execute(f"SELECT {', '.join(EPISODE_SOURCE_COLUMNS)} FROM SJEpisode")
         episodes = cur.fetchall()
     finally:
         src.close()
 
     with get_connection(target_db) as conn:
+        known_podcasts = get_sync_row_hashes("podcast", conn) if incremental else {}
+        known_episodes = get_sync_row_hashes("episode", conn) if incremental else {}
+        applied_podcasts = []
+        applied_episodes = []
+
         for row in podcasts:
             uuid_val = row["uuid"]
+            row_hash = _row_hash(*row)
+            if known_podcasts.get(uuid_val) == row_hash:
+                report.podcasts_unchanged += 1
+                continue
+            applied_podcasts.append((uuid_val, row_hash))
             was_deleted = "wasDeleted" in row.keys() and row["wasDeleted"] != 0
             deleted_at = now if was_deleted else None
             if was_deleted:
@@ -175,6 +268,11 @@ def import_from_pocketcasts_db(
 
         for row in episodes:
             uuid_val = row["uuid"]
+            row_hash = _row_hash(*row)
+            if known_episodes.get(uuid_val) == row_hash:
+                report.episodes_unchanged += 1
+                continue
+            applied_episodes.append((uuid_val, row_hash))
             podcast_uuid = row["podcastUuid"]
             was_deleted = "wasDeleted" in row.keys() and row["wasDeleted"] != 0
             deleted_at = now if was_deleted else None
@@ -205,8 +303,8 @@ def import_from_pocketcasts_db(
 
             played_up_to = row["playedUpTo"] or 0
             duration_val = row["duration"] or 0
-            first_played = _timestamp_to_iso(row["addedDate"])
-            last_played = _timestamp_to_iso(
+            first_played = _timestamp_to_ms(row["addedDate"])
+            last_played = _timestamp_to_ms(
                 row["lastPlaybackInteractionDate"] if "lastPlaybackInteractionDate" in row.keys() else row["addedDate"]
             ) or first_played
             playing_status = row["playingStatus"] or 0
@@ -242,6 +340,8 @@ def import_from_pocketcasts_db(
                 conn=conn,
             )
 
+        set_sync_row_hashes("podcast", applied_podcasts, conn=conn)
+        set_sync_row_hashes("episode", applied_episodes, conn=conn)
         set_last_sync_timestamp(now, conn=conn)
         record_sync_history(
             sync_timestamp=report.sync_timestamp,
@@ -253,23 +353,194 @@ def import_from_pocketcasts_db(
             episodes_updated=report.episodes_updated,
             episodes_deleted=report.episodes_deleted,
             conflicts_count=report.conflicts_count,
+            podcasts_unchanged=report.podcasts_unchanged,
+            episodes_unchanged=report.episodes_unchanged,
             conn=conn,
         )
 
+    _record_sync_metrics(report, time.perf_counter() - start)
     return report
 
 
+# Target column -> SQL condition (over source row s and target row t) that the import would change it.
+# Mirrors the COALESCE rules of upsert_podcast / upsert_episode: a NULL source value keeps the old one.
+_PODCAST_FIELD_CHANGES = (
+    ("title", "s.title IS NOT NULL AND s.title IS NOT t.title"),
+    ("author", "s.author IS NOT NULL AND s.author IS NOT t.author"),
+    ("description", "s.podcastDescription IS NOT NULL AND s.podcastDescription IS NOT t.description"),
+    ("feed_url", "s.podcastUrl IS NOT NULL AND s.podcastUrl IS NOT t.feed_url"),
+    ("website_url", "s.podcastUrl IS NOT NULL AND s.podcastUrl IS NOT t.website_url"),
+    ("image_url", "COALESCE(s.imageURL, s.thumbnailURL) IS NOT NULL AND COALESCE(s.imageURL, s.thumbnailURL) IS NOT t.image_url"),
+    ("deleted_at", "(s.wasDeleted IS NOT 0) IS NOT (t.deleted_at IS NOT NULL)"),
+)
+_EPISODE_FIELD_CHANGES = (
+    ("podcast_uuid", "s.podcastUuid IS NOT t.podcast_uuid"),
+    ("title", "s.title IS NOT NULL AND s.title IS NOT t.title"),
+    ("description", "s.episodeDescription IS NOT NULL AND description_hash(s.episodeDescription) IS NOT d.hash"),
+    ("duration", "s.duration IS NOT NULL AND s.duration IS NOT t.duration"),
+    ("published_date", "s.publishedDate IS NOT NULL AND s.publishedDate IS NOT t.published_date"),
+    ("file_url", "s.downloadUrl IS NOT NULL AND s.downloadUrl IS NOT t.file_url"),
+    ("file_type", "s.fileType IS NOT NULL AND s.fileType IS NOT t.file_type"),
+    ("size_bytes", "s.sizeInBytes IS NOT NULL AND s.sizeInBytes IS NOT t.size_bytes"),
+    ("deleted_at", "(s.wasDeleted IS NOT 0) IS NOT (t.deleted_at IS NOT NULL)"),
+)
+# Listening history columns a merge would change (played_up_to keeps the max; play_count always grows)
+_HISTORY_FIELD_CHANGES = (
+    ("played_up_to", "COALESCE(s.playedUpTo, 0) > lh.played_up_to"),
+    ("playing_status", "COALESCE(s.playingStatus, 0) IS NOT lh.playing_status"),
+)
+
+
+def _diff_entity(conn: sqlite3.Connection, entity: str, source_table: str, columns: tuple,
+                 target_joins: str, field_changes: tuple, extra: tuple, incremental: bool) -> sqlite3.Row:
+    """One aggregate pass over a source table joined to the target; see diff_pocketcasts_db."""
+    if incremental:
+        changed = f"h.row_hash IS NOT sync_row_hash({', '.join('src_row.' + c for c in columns)})"
+        hashes = f"LEFT JOIN main.sync_row_hashes h ON h.entity = '{entity}' AND h.uuid = src_row.uuid"
+    else:
+        changed, hashes = "1", ""
+    sums = [
+        "SUM(NOT c.changed) AS unchanged",
+        "SUM(c.changed AND t.uuid IS NULL) AS added",
+        "SUM(c.changed AND t.uuid IS NOT NULL) AS updated",
+        "SUM(c.changed AND s.wasDeleted IS NOT 0) AS deleted",
+    ]
+    sums += [f"SUM(c.changed AND t.uuid IS NOT NULL AND ({cond})) AS \"field:{name}\"" for name, cond in field_changes]
+    sums += [f"SUM({expr}) AS \"{alias}\"" for alias, expr in extra]
+    # MATERIALIZED: hash each source row once rather than once per SUM; only rowids are kept
+    sql = f"""
+        WITH c AS MATERIALIZED (
+            SELECT src_row.rowid AS source_rowid, {changed} AS changed
+            FROM src.{source_table} src_row {hashes}
+        )
+        SELECT {', '.join(sums)}
+        FROM c
+        JOIN src.{source_table} s ON s.rowid = c.source_rowid
+        {target_joins}
+    """
+    return conn.execute(sql).fetchone()
+
+
+def diff_pocketcasts_db(
+    source_db: Path,
+    target_db: Optional[Path] = None,
+    incremental: bool = True,
+    source_path_for_report: Optional[str] = None,
+) -> SyncDiff:
+    """
+    Dry run of import_from_pocketcasts_db: compute adds, per-field updates, deletes and history
+    merges with set-based queries over the source attached read-only to the target. Nothing is
+    written (the target is opened read-only, so only a read lock is taken) and no schema migration runs;
+    raises TargetSchemaOutdatedError when the target still needs migrating.
+    """
+    target_db = target_db or get_db_path()
+    diff = SyncDiff(source_path=source_path_for_report or str(source_db), incremental=incremental)
+    if Path(target_db).exists():
+        conn = sqlite3.connect(f"{Path(target_db).resolve().as_uri()}?mode=ro", uri=True)
+    else:
+        # Nothing imported yet: diff against an empty schema
+        conn = sqlite3.connect(":memory:", uri=True)
+        for ddl in (CREATE_PODCASTS, CREATE_EPISODE_DESCRIPTIONS, CREATE_EPISODES, CREATE_LISTENING_HISTORY):
+            conn.execute(ddl)
+    conn.row_factory = sqlite3.Row
+    if Path(target_db).exists():
+        # The diff reads current-schema tables and columns, and a dry run never migrates
+        version = get_schema_version(conn)
+        if version < SCHEMA_VERSION:
+            conn.close()
+            raise TargetSchemaOutdatedError(version)
+    conn.create_function("sync_row_hash", -1, _row_hash, deterministic=True)
+    conn.create_function(
+        "description_hash", 1, lambda text: encode_description(text)[0] if text is not None else None, deterministic=True
+    )
+    try:
+        conn.execute("ATTACH DATABASE ? AS src", (f"{Path(source_db).resolve().as_uri()}?mode=ro",))
+        has_hashes = conn.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'sync_row_hashes'"
+        ).fetchone() is not None
+        conn.execute("BEGIN")  # one read snapshot for all queries
+        pods = _diff_entity(
+            conn, "podcast", "SJPodcast", PODCAST_SOURCE_COLUMNS,
+            "LEFT JOIN main.podcasts t ON t.uuid = s.uuid",
+            _PODCAST_FIELD_CHANGES, (), incremental and has_hashes,
+        )
+        live = "c.changed AND s.wasDeleted IS 0"
+        eps = _diff_entity(
+            conn, "episode", "SJEpisode", EPISODE_SOURCE_COLUMNS,
+            """LEFT JOIN main.episodes t ON t.uuid = s.uuid
+               LEFT JOIN main.episode_descriptions d ON d.id = t.description_id
+               LEFT JOIN main.listening_history lh ON lh.episode_uuid = s.uuid""",
+            _EPISODE_FIELD_CHANGES,
+            (
+                ("history_added", f"{live} AND lh.episode_uuid IS NULL"),
+                ("conflicts", f"{live} AND lh.episode_uuid IS NOT NULL"),
+            ) + tuple(
+                (f"history:{name}", f"{live} AND lh.episode_uuid IS NOT NULL AND ({cond})")
+                for name, cond in _HISTORY_FIELD_CHANGES
+            ),
+            incremental and has_hashes,
+        )
+        conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+
+    for prefix, row in (("podcasts", pods), ("episodes", eps)):
+        for action in ("added", "updated", "deleted", "unchanged"):
+            setattr(diff, f"{prefix}_{action}", row[action] or 0)
+    diff.podcast_fields = {name: pods[f"field:{name}"] or 0 for name, _ in _PODCAST_FIELD_CHANGES}
+    diff.episode_fields = {name: eps[f"field:{name}"] or 0 for name, _ in _EPISODE_FIELD_CHANGES}
+    diff.history_added = eps["history_added"] or 0
+    diff.conflicts_count = eps["conflicts"] or 0
+    diff.history_fields = {name: eps[f"history:{name}"] or 0 for name, _ in _HISTORY_FIELD_CHANGES}
+    return diff
+
+
+def _record_sync_metrics(report: SyncReport, seconds: float) -> None:
+    metrics.SYNC_RUNS.inc()
+    metrics.SYNC_SECONDS.observe(seconds)
+    for entity in ("podcasts", "episodes"):
+        for action in ("added", "updated", "deleted", "unchanged"):
+            metrics.SYNC_ROWS.inc(entity, action, amount=getattr(report, f"{entity}_{action}"))
+    metrics.SYNC_ROWS.inc("listening_history", "merged", amount=report.conflicts_count)
+
+
 def _print_sync_report(report: SyncReport) -> None:
     """Print a formatted sync report to the console."""
     print("Sync report:")
-    print(f"  Timestamp: {report.sync_timestamp}")
+    print(f"  Timestamp: {ms_to_iso(report.sync_timestamp)}")
     if report.source_path:
         print(f"  Source: {report.source_path}")
-    print(f"  Podcasts: +{report.podcasts_added} updated {report.podcasts_updated} deleted {report.podcasts_deleted}")
-    print(f"  Episodes: +{report.episodes_added} updated {report.episodes_updated} deleted {report.episodes_deleted}")
+    print(
+        f"  Podcasts: +{report.podcasts_added} changed {report.podcasts_updated} "
+        f"deleted {report.podcasts_deleted} unchanged {report.podcasts_unchanged}"
+    )
+    print(
+        f"  Episodes: +{report.episodes_added} changed {report.episodes_updated} "
+        f"deleted {report.episodes_deleted} unchanged {report.episodes_unchanged}"
+    )
     print(f"  Conflicts resolved: {report.conflicts_count}")
 
 
+def _print_sync_diff(diff: SyncDiff) -> None:
+    """Print a formatted dry-run diff to the console."""
+    print("Dry run (nothing written):" + ("" if diff.incremental else " every row applied"))
+    if diff.source_path:
+        print(f"  Source: {diff.source_path}")
+    print(
+        f"  Podcasts: +{diff.podcasts_added} changed {diff.podcasts_updated} "
+        f"deleted {diff.podcasts_deleted} unchanged {diff.podcasts_unchanged}"
+    )
+    print(
+        f"  Episodes: +{diff.episodes_added} changed {diff.episodes_updated} "
+        f"deleted {diff.episodes_deleted} unchanged {diff.episodes_unchanged}"
+    )
+    print(f"  History: +{diff.history_added} merged {diff.conflicts_count}")
+    for label, fields in (("podcast", diff.podcast_fields), ("episode", diff.episode_fields), ("history", diff.history_fields)):
+        changed = ", ".join(f"{name} {count}" for name, count in fields.items() if count)
+        if changed:
+            print(f"  Changed {label} fields: {changed}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Import Pocket Casts listening history from export into SQLite."
@@ -287,7 +558,12 @@ def main():
     parser.add_argument(
         "--no-incremental",
         action="store_true",
-        help="Treat run as full import (still merges by uuid).",
+        help="Apply every source row, not only rows changed since the last sync (still merges by uuid).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report what the sync would change; nothing is written.",
     )
     args = parser.parse_args()
 
@@ -301,23 +577,38 @@ def main():
     target = Path(args.db) if args.db else get_db_path()
     source_path_for_report: Optional[str] = str(source)
 
-    if source.suffix.lower() == ".zip":
-        db_path = extract_db_from_zip(str(source))
-        if not db_path:
-            print("No database found in ZIP.")
+    with tempfile.TemporaryDirectory(prefix="pocketcasts_extract_") as extract_dir:
+        if source.suffix.lower() == ".zip":
+            db_path = extract_db_from_zip(str(source), extract_dir=extract_dir)
+            if not db_path:
+                print("No database found in ZIP.")
+                return
+            source = db_path
+
+        if not source.exists():
+            print(f"Source not found: {source}")
             return
-        source = Path(db_path)
 
-    if not source.exists():
-        print(f"Source not found: {source}")
-        return
+        if args.dry_run:
+            try:
+                diff = diff_pocketcasts_db(
+                    source,
+                    target_db=target,
+                    incremental=not args.no_incremental,
+                    source_path_for_report=source_path_for_report,
+                )
+            except TargetSchemaOutdatedError as e:
+                print(e)
+                return
+            _print_sync_diff(diff)
+            return
 
-    report = import_from_pocketcasts_db(
-        source,
-        target_db=target,
-        incremental=not args.no_incremental,
-        source_path_for_report=source_path_for_report,
-    )
+        report = import_from_pocketcasts_db(
+            source,
+            target_db=target,
+            incremental=not args.no_incremental,
+            source_path_for_report=source_path_for_report,
+        )
     _print_sync_report(report)
     print(f"Done. Database: {target}")
 
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Streaming export of the whole library (podcasts, episodes, listening history, play sessions)
+as NDJSON or CSV, and a bulk restore of such a file.
+
+Export reads each table through a cursor in chunks inside one read transaction, so memory stays
+constant and the file is a consistent snapshot. Episode descriptions are written as text (not
+episode_descriptions ids); timestamps stay epoch milliseconds.
+
+NDJSON: a header line {"format": "audiophile-library", "version": 1, "schema_version": ...,
+"tables": {table: [columns]}}, then one {"table": ..., "row": {...}} line per row.
+CSV: a "#format" row, then per table a "#<table>" row naming the columns followed by rows whose
+first cell is the table name. Empty CSV cells restore as NULL.
+
+Restore upserts rows by their natural key in batches, in one transaction. Play sessions have no
+unique key: they are matched on (episode_uuid, started_at) and inserted with fresh ids.
+
+Run from project root:
+  python library_export.py export --format ndjson -o library.ndjson
+  python library_export.py restore library.ndjson --db /path/to/restored.db
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from config import get_db_path
+from database import SCHEMA_VERSION, get_connection, init_schema, now_ms, store_description
+from text_utils import canonical_feed_url, normalize_title
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+EXPORT_FORMAT = "audiophile-library"
+EXPORT_VERSION = 1
+EXPORT_FORMATS = ("ndjson", "csv")
+# Columns restore computes per row and appends to the insert
+_DERIVED_COLUMNS = {
+    "podcasts": ("title_norm", "feed_url_canonical"),
+    "episodes": ("title_norm", "description_id", "summary_snippet"),
+    "listening_history": (),
+    "play_sessions": (),
+}
+
+# Rows fetched per cursor batch on export and inserted per executemany on restore
+EXPORT_CHUNK_ROWS = 1000
+RESTORE_BATCH_ROWS = 5000
+
+# Exported tables in restore (foreign key) order, with the key restore upserts on.
+# Surrogate ids are left out (and ignored in older files that have play_sessions.id), and so are
+# the matching keys (title_norm, feed_url_canonical), which restore derives again.
+EXPORT_TABLES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("podcasts", ("uuid",)),
+    ("episodes", ("uuid",)),
+    ("listening_history", ("episode_uuid",)),
+    ("play_sessions", ("episode_uuid", "started_at")),
+)
+_SKIPPED_COLUMNS = {
+    "podcasts": ("id", "title_norm", "feed_url_canonical"),
+    "episodes": ("id", "description_id", "title_norm"),
+    "listening_history": ("id",),
+    "play_sessions": ("id",),
+}
+# Tables whose restore key has no unique constraint: matching rows are updated, the rest inserted
+_UNCONSTRAINED_KEYS = frozenset({"play_sessions"})
+
+
+class RestoreError(ValueError):
+    """The file is not a library export this version can restore."""
+
+
+def _table_columns(conn, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def _export_columns(conn, table: str) -> List[str]:
+    columns = [c for c in _table_columns(conn, table) if c not in _SKIPPED_COLUMNS[table]]
+    if table == "episodes":
+        columns.insert(columns.index("title") + 1, "description")
+    return columns
+
+
+def _select_sql(table: str, columns: List[str]) -> str:
+    if table == "episodes":
+        exprs = [
+            "decode_description(d.codec, d.body)" if c == "description" else f"e.{c}"
+            for c in columns
+        ]
+        return (
+            f"SELECT {', '.join(exprs)} FROM episodes e "
+            "LEFT JOIN episode_descriptions d ON d.id = e.description_id ORDER BY e.id"
+        )
+    return f"SELECT {', '.join(columns)} FROM {table} ORDER BY rowid"
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def iter_export(fmt: str = "ndjson", db_path: Optional[Path] = None) -> Iterator[bytes]:
+    """Yield the export as encoded chunks (one per cursor batch). fmt is 'ndjson' or 'csv'."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    # Streaming responses may resume this generator on different threadpool threads
+    with get_connection(db_path, check_same_thread=False) as conn:
+        conn.execute("BEGIN")  # one snapshot across all tables
+        tables = {table: _export_columns(conn, table) for table, _ in EXPORT_TABLES}
+        if fmt == "ndjson":
+            header = {
+                "format": EXPORT_FORMAT,
+                "version": EXPORT_VERSION,
+                "schema_version": SCHEMA_VERSION,
+                "exported_at": now_ms(),
+                "tables": tables,
+            }
+            yield _dumps(header) + b"\n"
+        else:
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            writer.writerow(["#format", EXPORT_FORMAT, EXPORT_VERSION, SCHEMA_VERSION])
+            yield buf.getvalue().encode("utf-8")
+        for table, columns in tables.items():
+            cur = conn.execute(_select_sql(table, columns))
+            if fmt == "csv":
+                buf = io.StringIO()
+                writer = csv.writer(buf, lineterminator="\n")
+                writer.writerow([f"#{table}"] + columns)
+            while True:
+                rows = cur.fetchmany(EXPORT_CHUNK_ROWS)
+                if not rows:
+                    break
+                if fmt == "ndjson":
+                    yield b"".join(_dumps({"table": table, "row": dict(zip(columns, row))}) + b"\n" for row in rows)
+                else:
+                    writer.writerows([table, *row] for row in rows)
+                    yield buf.getvalue().encode("utf-8")
+                    buf.seek(0)
+                    buf.truncate()
+            if fmt == "csv" and buf.tell():
+                yield buf.getvalue().encode("utf-8")
+        conn.execute("ROLLBACK")
+
+
+def export_library(out: IO[bytes], fmt: str = "ndjson", db_path: Optional[Path] = None) -> int:
+    """Write the export to a binary file object; returns bytes written."""
+    written = 0
+    for chunk in iter_export(fmt, db_path=db_path):
+        out.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def _read_ndjson(src: IO[bytes]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    lines = iter(src)
+    header = json.loads(next(lines, b"{}") or b"{}")
+    if header.get("format") != EXPORT_FORMAT or header.get("version") != EXPORT_VERSION:
+        raise RestoreError("Not an audiophile library export (NDJSON header missing or unsupported version)")
+    for line in lines:
+        if line.strip():
+            record = json.loads(line)
+            yield record["table"], record["row"]
+
+
+def _read_csv(src: IO[bytes]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    reader = csv.reader(io.TextIOWrapper(src, encoding="utf-8", newline=""))
+    header = next(reader, [])
+    if header[:3] != ["#format", EXPORT_FORMAT, str(EXPORT_VERSION)]:
+        raise RestoreError("Not an audiophile library export (CSV #format row missing or unsupported version)")
+    columns: Dict[str, List[str]] = {}
+    for row in reader:
+        if not row:
+            continue
+        if row[0].startswith("#"):
+            columns[row[0][1:]] = row[1:]
+            continue
+        table = row[0]
+        yield table, {c: (v if v != "" else None) for c, v in zip(columns[table], row[1:])}
+
+
+class _PrefixedReader(io.RawIOBase):
+    """src with prefix (bytes already read from it, e.g. to sniff the format) put back in front."""
+
+    def __init__(self, prefix: bytes, src: IO[bytes]):
+        self.prefix = prefix
+        self.src = src
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self.prefix:
+            n = min(len(b), len(self.prefix))
+            b[:n], self.prefix = self.prefix[:n], self.prefix[n:]
+            return n
+        data = self.src.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+class _TableWriter:
+    """Batched upserts into one table; episode descriptions go through store_description."""
+
+    def __init__(self, conn, table: str, key: Tuple[str, ...]):
+        self.conn = conn
+        self.table = table
+        self.key = key
+        self.target_columns = set(_table_columns(conn, table))
+        self.columns: Optional[List[str]] = None
+        self.sql = ""
+        self.update_sql = ""
+        self.batch: List[tuple] = []
+        self.count = 0
+        # sha256 of description text -> (description_id, snippet), so repeats skip store_description
+        self.description_ids: Dict[bytes, tuple] = {}
+
+    def _prepare(self, row: Dict[str, Any]) -> None:
+        derived = _DERIVED_COLUMNS[self.table]
+        skipped = _SKIPPED_COLUMNS[self.table]
+        names = [c for c in row if c in self.target_columns and c not in derived and c not in skipped] + list(derived)
+        self.columns = names
+        if self.table in _UNCONSTRAINED_KEYS:
+            # Named parameters: the update and the insert bind the same row dicts
+            match = " AND ".join(f"{c} = :{c}" for c in self.key)
+            updates = ", ".join(f"{c} = :{c}" for c in names if c not in self.key)
+            self.update_sql = f"UPDATE {self.table} SET {updates} WHERE {match}"
+            self.sql = (
+                f"INSERT INTO {self.table} ({', '.join(names)}) SELECT {', '.join(':' + c for c in names)} "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {self.table} WHERE {match})"
+            )
+            return
+        updates = ", ".join(f"{c} = excluded.{c}" for c in names if c not in self.key)
+        self.sql = (
+            f"INSERT INTO {self.table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT({', '.join(self.key)}) DO UPDATE SET {updates}"
+        )
+
+    def add(self, row: Dict[str, Any]) -> None:
+        if self.columns is None:
+            self._prepare(row)
+        if self.table in ("podcasts", "episodes"):
+            title = row.get("title")
+            row = dict(row, title_norm=normalize_title(title) if title is not None else None)
+        if self.table == "podcasts":
+            feed_url = row.get("feed_url")
+            row["feed_url_canonical"] = canonical_feed_url(feed_url) if feed_url is not None else None
+        elif self.table == "episodes":
+            text = row.get("description")
+            if text is not None:
+                digest = hashlib.sha256(text.encode("utf-8")).digest()
+                stored = self.description_ids.get(digest)
+                if stored is None:
+                    stored = self.description_ids[digest] = store_description(self.conn, text)
+                row.update(description_id=stored[0], summary_snippet=row.get("summary_snippet") or stored[1])
+        self.batch.append(tuple(row.get(c) for c in self.columns))
+        if len(self.batch) >= RESTORE_BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.batch:
+            if self.update_sql:
+                params = [dict(zip(self.columns, values)) for values in self.batch]
+                self.conn.executemany(self.update_sql, params)
+                self.conn.executemany(self.sql, params)
+            else:
+                self.conn.executemany(self.sql, self.batch)
+            self.count += len(self.batch)
+            self.batch = []
+            # Keep the cache bounded; a miss only costs a store_description lookup
+            if len(self.description_ids) > 20 * RESTORE_BATCH_ROWS:
+                self.description_ids.clear()
+
+
+def restore_library(src: IO[bytes], fmt: Optional[str] = None, db_path: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Load an export (binary file object) into db_path in one transaction: rows are upserted by key
+    (uuid / episode_uuid; play sessions by episode_uuid and started_at, with new ids), so restoring
+    into a non-empty library overwrites matching rows and keeps the rest. fmt is sniffed from the
+    first byte when not given. Returns rows per table.
+    """
+    db_path = db_path or get_db_path()
+    init_schema(db_path)
+    if fmt is None:
+        first = src.read(1)
+        fmt = "ndjson" if first == b"{" else "csv"
+        src = io.BufferedReader(_PrefixedReader(first, src))
+    records = _read_ndjson(src) if fmt == "ndjson" else _read_csv(src)
+    keys = dict(EXPORT_TABLES)
+    with get_connection(db_path) as conn:
+        writers: Dict[str, _TableWriter] = {}
+        current: Optional[_TableWriter] = None
+        for table, row in records:
+            if table not in keys:
+                raise RestoreError(f"Unknown table in export: {table}")
+            if current is None or current.table != table:
+                # Flush before moving on so parent rows exist before children reference them
+                if current is not None:
+                    current.flush()
+                current = writers.get(table)
+                if current is None:
+                    current = writers[table] = _TableWriter(conn, table, keys[table])
+            current.add(row)
+        if current is not None:
+            current.flush()
+    return {table: writers[table].count if table in writers else 0 for table, _ in EXPORT_TABLES}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export the library as NDJSON/CSV, or restore such an export.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="Stream the library to a file (or stdout)")
+    exp.add_argument("--db", type=Path, default=None, help="Path to SQLite database (default: from config)")
+    exp.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    exp.add_argument("-o", "--output", type=Path, default=None, help="Output file (default: stdout)")
+    res = sub.add_parser("restore", help="Load an export into a database in one transaction")
+    res.add_argument("file", type=Path, help="NDJSON or CSV export")
+    res.add_argument("--db", type=Path, default=None, help="Target SQLite database (default: from config)")
+    res.add_argument("--format", choices=EXPORT_FORMATS, default=None, help="Default: detect from the file")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        if args.output is None:
+            export_library(sys.stdout.buffer, args.format, db_path=args.db)
+            return
+        with open(args.output, "wb") as out:
+            written = export_library(out, args.format, db_path=args.db)
+        print(f"Exported {written / 1e6:.1f} MB to {args.output}")
+        return
+
+    with open(args.file, "rb") as src:
+        try:
+            counts = restore_library(src, args.format, db_path=args.db)
+        except RestoreError as e:
+            parser.error(str(e))
+    print("Restored: " + ", ".join(f"{table} {count}" for table, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@
 """
 Analytics and statistics for listening history.
 Total hours, completion rates, top podcasts, and common queries.
+
+listening_history is sparse: library episodes without a row count as not played
+(0 seconds, 0% complete when the duration is known), so totals and averages match
+what they were when every episode had a placeholder row.
 """
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -20,12 +24,36 @@ def total_listening_hours(db_path: Optional[Path] = None) -> float:
         return (row["total"] or 0) / 3600.0
 
 
+def _library_totals(conn) -> Dict[str, Any]:
+    """
+    Episode count and average completion over the library: active episodes plus history
+    rows for any other episode. Active episodes with a known duration and no history row
+    count as 0% complete. One pass over listening_history and one over episodes.
+    """
+    history = conn.execute(
+        """SELECT SUM(e.uuid IS NULL OR e.deleted_at IS NOT NULL) AS outside_active,
+                  SUM(e.deleted_at IS NULL AND e.duration > 0) AS timed_with_row,
+                  SUM(lh.completion_percentage) AS total_pct,
+                  COUNT(lh.completion_percentage) AS rows_with_pct
+           FROM listening_history lh
+           LEFT JOIN episodes e ON e.uuid = lh.episode_uuid"""
+    ).fetchone()
+    active = conn.execute(
+        "SELECT COUNT(*) AS n, SUM(duration > 0) AS timed FROM episodes WHERE deleted_at IS NULL"
+    ).fetchone()
+    implicit_zero = (active["timed"] or 0) - (history["timed_with_row"] or 0)
+    denominator = (history["rows_with_pct"] or 0) + implicit_zero
+    return {
+        "episodes": (active["n"] or 0) + (history["outside_active"] or 0),
+        "average_completion_percent": (history["total_pct"] or 0) / denominator if denominator else 0,
+    }
+
+
 def total_episodes_in_library(db_path: Optional[Path] = None) -> int:
-    """Number of episodes in listening history (library)."""
+    """Number of episodes in the library (with or without a listening_history row)."""
     db_path = db_path or get_db_path()
     with get_connection(db_path) as conn:
-        row = conn.execute("SELECT COUNT(*) AS n FROM listening_history").fetchone()
-        return row["n"] or 0
+        return _library_totals(conn)["episodes"]
 
 
 def completion_rate(db_path: Optional[Path] = None) -> Dict[str, Any]:
@@ -35,33 +63,36 @@ def completion_rate(db_path: Optional[Path] = None) -> Dict[str, Any]:
     """
     db_path = db_path or get_db_path()
     with get_connection(db_path) as conn:
-        avg = conn.execute(
-            "SELECT AVG(completion_percentage) AS avg_pct FROM listening_history WHERE completion_percentage IS NOT NULL"
-        ).fetchone()
-        # Pocket Casts: 1=not played, 2=in progress, 3=completed
-        in_progress = conn.execute(
-            "SELECT COUNT(*) AS n FROM listening_history WHERE playing_status = 2"
-        ).fetchone()
-        completed = conn.execute(
-            "SELECT COUNT(*) AS n FROM listening_history WHERE playing_status = 3"
-        ).fetchone()
-        return {
-            "average_completion_percent": round((avg["avg_pct"] or 0), 2),
-            "episodes_completed": completed["n"] or 0,
-            "episodes_in_progress": in_progress["n"] or 0,
-        }
+        return _completion_rate(conn, _library_totals(conn))
+
+
+def _completion_rate(conn, totals: Dict[str, Any]) -> Dict[str, Any]:
+    # Pocket Casts: 1=not played, 2=in progress, 3=completed
+    in_progress = conn.execute(
+        "SELECT COUNT(*) AS n FROM listening_history WHERE playing_status = 2"
+    ).fetchone()
+    completed = conn.execute(
+        "SELECT COUNT(*) AS n FROM listening_history WHERE playing_status = 3"
+    ).fetchone()
+    return {
+        "average_completion_percent": round(totals["average_completion_percent"], 2),
+        "episodes_completed": completed["n"] or 0,
+        "episodes_in_progress": in_progress["n"] or 0,
+    }
 
 
 def top_podcasts_by_episodes(limit: int = 20, db_path: Optional[Path] = None) -> List[Dict[str, Any]]:
-    """Top podcasts by number of episodes in listening history."""
+    """Top podcasts by number of library episodes (played or not)."""
     db_path = db_path or get_db_path()
     with get_connection(db_path) as conn:
         cur = conn.execute(
             """
-            SELECT p.uuid, p.title, p.author, COUNT(lh.episode_uuid) AS episode_count,
+            SELECT p.uuid, p.title, p.author, COUNT(*) AS episode_count,
                    SUM(lh.played_up_to) AS total_seconds
             FROM podcasts p
-            JOIN listening_history lh ON lh.episode_uuid IN (SELECT uuid FROM episodes WHERE podcast_uuid = p.uuid)
+            JOIN episodes e ON e.podcast_uuid = p.uuid
+            LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
+            WHERE e.deleted_at IS NULL OR lh.episode_uuid IS NOT NULL
             GROUP BY p.uuid
             ORDER BY episode_count DESC
             LIMIT ?
@@ -89,10 +120,11 @@ def top_podcasts_by_hours(limit: int = 20, db_path: Optional[Path] = None) -> Li
             """
             SELECT p.uuid, p.title, p.author,
                    SUM(lh.played_up_to) AS total_seconds,
-                   COUNT(lh.episode_uuid) AS episode_count
+                   COUNT(*) AS episode_count
             FROM podcasts p
             JOIN episodes e ON e.podcast_uuid = p.uuid
-            JOIN listening_history lh ON lh.episode_uuid = e.uuid
+            LEFT JOIN listening_history lh ON lh.episode_uuid = e.uuid
+            WHERE e.deleted_at IS NULL OR lh.episode_uuid IS NOT NULL
             GROUP BY p.uuid
             ORDER BY total_seconds DESC
             LIMIT ?
@@ -114,10 +146,13 @@ def top_podcasts_by_hours(limit: int = 20, db_path: Optional[Path] = None) -> Li
 
 def summary_report(db_path: Optional[Path] = None) -> Dict[str, Any]:
     """Single summary of key stats for reports."""
-    comp = completion_rate(db_path)
+    db_path = db_path or get_db_path()
+    with get_connection(db_path) as conn:
+        totals = _library_totals(conn)
+        comp = _completion_rate(conn, totals)
     return {
         "total_listening_hours": round(total_listening_hours(db_path), 2),
-        "total_episodes": total_episodes_in_library(db_path),
+        "total_episodes": totals["episodes"],
         "average_completion_percent": comp["average_completion_percent"],
         "episodes_completed": comp["episodes_completed"],
         "episodes_in_progress": comp["episodes_in_progress"],
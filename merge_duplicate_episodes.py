@@ -3,13 +3,18 @@
 Merge duplicate podcast episodes (same podcast, same normalized title, same/close published_date).
 Reassigns listening_history and play_sessions to a canonical episode per group, then removes duplicate episode rows.
 Safe to run after deployment to clean existing DBs.
+With --incremental, only podcasts changed since the last sweep are checked, and duplicate podcasts are removed too.
+With --near, lists near-duplicate groups ("Ep 123: Foo" / "123 - Foo") for review; add --merge to merge them.
 """
 import argparse
+import sys
 from pathlib import Path
 
 from config import get_db_path
 from database import init_schema
 from api.services.duplicate_episode_merge import merge_duplicate_episodes, DuplicateEpisodeMergeReport
+from api.services.duplicate_sweep import sweep_dirty_duplicates
+from api.services.near_duplicate_episodes import DEFAULT_SIMILARITY, find_near_duplicate_episodes
 
 
 def main() -> None:
@@ -25,10 +30,52 @@ def main() -> None:
         action="store_true",
         help="Initialize schema before merging (default: no)",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regroup podcasts changed since the last sweep (also removes duplicate podcasts there)",
+    )
+    parser.add_argument(
+        "--near",
+        action="store_true",
+        help="Find near-duplicate titles (MinHash/LSH) instead of exact matches; lists groups unless --merge",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_SIMILARITY,
+        help=f"Minimum title similarity for --near (default: {DEFAULT_SIMILARITY})",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="With --near, merge each group into its canonical episode",
+    )
     args = parser.parse_args()
     db_path = args.db or get_db_path()
-    if args.init_schema:
+    if args.init_schema or args.incremental:
         init_schema(db_path)
+    if args.incremental:
+        sweep = sweep_dirty_duplicates(db_path=db_path)
+        print(f"Podcasts checked: {sweep.podcasts_checked}")
+        print(f"Duplicate podcasts removed: {sweep.podcasts_removed}")
+        print(f"Duplicate groups merged: {sweep.duplicate_groups}")
+        print(f"Episode rows removed: {sweep.episodes_removed}")
+        for error in sweep.errors:
+            print(f"Failed (left marked for the next sweep): {error}", file=sys.stderr)
+        return
+    if args.near:
+        near = find_near_duplicate_episodes(db_path=db_path, threshold=args.threshold, merge=args.merge)
+        for group in near.groups:
+            print(f"[{group.similarity:.2f}] podcast {group.podcast_uuid}")
+            for ep in group.episodes:
+                marker = "*" if ep["uuid"] == group.canonical_uuid else " "
+                print(f"  {marker} {ep['uuid']}  {ep['title']}")
+        print(f"Episodes scanned: {near.episodes_scanned} ({near.candidate_pairs} candidate pairs checked)")
+        print(f"Near-duplicate groups: {len(near.groups)}")
+        if args.merge:
+            print(f"Episode rows removed: {near.episodes_removed}")
+        return
     report = merge_duplicate_episodes(db_path=db_path)
     print(f"Podcasts processed: {report.podcasts_processed}")
     print(f"Duplicate groups merged: {report.duplicate_groups}")
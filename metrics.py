@@ -0,0 +1,157 @@
+"""
+Lightweight in-process metrics (counters, gauges, histograms) rendered in the
+Prometheus text exposition format. No external service or client library: each
+update is a dict lookup and an add under a per-metric lock.
+"""
+import bisect
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; covers fast JSON endpoints up to long imports
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: List["_Metric"] = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonic counter. Label values are passed positionally in labelnames order."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in sorted(items):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Point-in-time value."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in sorted(items):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Bucketed distribution with _bucket / _sum / _count series."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last slot is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(labels, (list(counts), total)) for labels, (counts, total) in self._values.items()]
+        for labels, (counts, total) in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+def render_all() -> str:
+    """All registered metrics in Prometheus text format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    return "\n".join(m.render() for m in metrics) + "\n"
+
+
+# API
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status"))
+HTTP_REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route"))
+
+# Database (updated by db_trace; statements are only counted on traced connections, i.e. unless PODCASTS_DB_TRACE=0)
+DB_CONNECTIONS = Counter("db_connections_total", "SQLite connections opened via get_connection.")
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed via get_connection (not counted when PODCASTS_DB_TRACE=0).")
+DB_QUERY_SECONDS = Counter("db_query_seconds_total", "Time spent executing and fetching SQL statements (not counted when PODCASTS_DB_TRACE=0).")
+
+# Feed refresh
+FEED_FETCHES = Counter("feed_fetches_total", "Feed downloads attempted.")
+FEED_BYTES = Counter("feed_bytes_total", "Feed bytes downloaded (after decompression).")
+FEED_FETCH_SECONDS = Counter("feed_fetch_seconds_total", "Time spent downloading feeds.")
+FEED_PARSE_SECONDS = Counter("feed_parse_seconds_total", "Time spent parsing feeds.")
+FEED_ERRORS = Counter("feed_errors_total", "Feed fetch/parse errors by type.", ("type",))
+FEED_REFRESH_RUNS = Counter("feed_refresh_runs_total", "Completed refresh_all_feeds runs.")
+FEED_REFRESH_SECONDS = Histogram("feed_refresh_duration_seconds", "refresh_all_feeds duration.",
+                                 buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600))
+FEED_EPISODES = Counter("feed_refresh_episodes_total", "Episodes seen by feed refresh.", ("result",))
+SCHEDULER_LAG_SECONDS = Gauge("scheduler_lag_seconds", "Delay between a scheduled job's run time and its submission.", ("job",))
+
+# Pocket Casts sync
+SYNC_RUNS = Counter("pocketcasts_sync_runs_total", "Completed Pocket Casts syncs.")
+SYNC_SECONDS = Histogram("pocketcasts_sync_duration_seconds", "Pocket Casts sync duration.",
+                         buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600))
+SYNC_ROWS = Counter("pocketcasts_sync_rows_total", "Rows processed by Pocket Casts sync (unchanged rows are skipped).", ("entity", "action"))
@@ -0,0 +1,20 @@
+"""Shared fixtures. Tests run from project root: python -m pytest tests"""
+import sys
+from pathlib import Path
+
+# Ensure project root is on path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest  # noqa: E402
+
+from database import init_schema  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Empty library database with the current schema."""
+    path = tmp_path / "library.db"
+    init_schema(path)
+    return path
@@ -0,0 +1,48 @@
+"""Duplicate podcast cleanup."""
+from database import get_connection, now_ms, upsert_episode, upsert_podcast
+from api.services.duplicate_cleanup import remove_duplicate_podcasts
+
+
+def _podcast_uuids(db):
+    with get_connection(db) as conn:
+        return {row[0] for row in conn.execute("SELECT uuid FROM podcasts")}
+
+
+def test_duplicate_with_only_soft_deleted_episodes_is_kept(db):
+    # Same feed spelled three ways: a has episodes, b only a soft-deleted one, c none
+    upsert_podcast(uuid="a", title="Show", feed_url="https://feeds.example.com/show", db_path=db)
+    upsert_podcast(uuid="b", title="Show (old)", feed_url="http://FEEDS.example.com/show/", db_path=db)
+    upsert_podcast(uuid="c", title="Show (imported)", feed_url="https://feeds.example.com/show/", db_path=db)
+    upsert_episode(uuid="e-a", podcast_uuid="a", title="Episode 1", db_path=db)
+    upsert_episode(uuid="e-b", podcast_uuid="b", title="Episode 1", deleted_at=now_ms(), db_path=db)
+
+    preview = remove_duplicate_podcasts(db_path=db, dry_run=True)
+    report = remove_duplicate_podcasts(db_path=db)
+
+    assert [d.uuid for d in preview.duplicates] == ["c"]
+    assert [d.uuid for d in report.duplicates] == ["c"]
+    assert _podcast_uuids(db) == {"a", "b"}
+
+
+def test_title_duplicate_with_only_soft_deleted_episodes_is_kept(db):
+    upsert_podcast(uuid="a", title="Daily News", feed_url="https://a.example.com/feed", db_path=db)
+    upsert_podcast(uuid="b", title="daily  news", feed_url="https://b.example.com/feed", db_path=db)
+    upsert_episode(uuid="e-a", podcast_uuid="a", title="Monday", db_path=db)
+    upsert_episode(uuid="e-b", podcast_uuid="b", title="Monday", deleted_at=now_ms(), db_path=db)
+
+    report = remove_duplicate_podcasts(db_path=db)
+
+    assert report.deleted_count == 0
+    assert _podcast_uuids(db) == {"a", "b"}
+
+
+def test_scoped_cleanup_removes_empty_duplicate(db):
+    upsert_podcast(uuid="a", title="Show", feed_url="https://feeds.example.com/show", db_path=db)
+    upsert_podcast(uuid="b", title="Show", feed_url="https://mirror.example.com/show", db_path=db)
+    upsert_podcast(uuid="other", title="Other", feed_url="https://feeds.example.com/other", db_path=db)
+    upsert_episode(uuid="e-a", podcast_uuid="a", title="Episode 1", db_path=db)
+
+    report = remove_duplicate_podcasts(db_path=db, podcast_uuids={"b"})
+
+    assert [(d.uuid, d.reason, d.kept_uuid) for d in report.duplicates] == [("b", "title", "a")]
+    assert _podcast_uuids(db) == {"a", "other"}
@@ -0,0 +1,174 @@
+"""Set-based duplicate episode merge against the previous per-group merge."""
+import shutil
+from collections import defaultdict
+
+import pytest
+
+from database import (
+    add_play_session,
+    get_connection,
+    now_ms,
+    prune_episode_descriptions,
+    upsert_episode,
+    upsert_listening_history,
+    upsert_podcast,
+)
+from api.services.duplicate_episode_merge import (
+    DuplicateEpisodeMergeReport,
+    _group_duplicate_episodes,
+    merge_duplicate_episodes,
+)
+
+PUBLISHED = 1_700_000_000.0
+
+# (podcast, uuid, title, created_at, history as (played_up_to, duration, play_count, first, last) or None, sessions)
+EPISODES = [
+    # Canonical and a duplicate both have history (duplicate with no last_played_at, no duration)
+    ("a", "a1", "Episode 1", 1, (100, 600, 2, 10_000, 20_000), 1),
+    ("a", "a2", "Episode 1", 2, (300, 0, 1, 5_000, None), 2),
+    ("a", "a3", "Episode 1", 3, None, 1),
+    # Only a later (non-oldest) episode has history
+    ("a", "a4", "Episode 2", 1, None, 1),
+    ("a", "a5", "Episode 2", 2, (50, 0, 3, None, 30_000), 0),
+    # No history anywhere: the oldest is kept, sessions move to it
+    ("a", "a6", "Episode 3", 5, None, 0),
+    ("a", "a7", "episode  3", 4, None, 2),
+    # Canonical without duration, duplicates with one
+    ("a", "a8", "Episode 4", 1, (500, 0, 1, 1_000, 2_000), 0),
+    ("a", "a9", "Episode 4", 2, (10, 1000, 1, 500, 1_500), 1),
+    ("a", "a10", "Episode 4", 3, (20, 1000, 4, 700, 9_000), 0),
+    # Not duplicates: unique title, and the same title in another podcast
+    ("a", "a11", "Bonus", 1, (5, 60, 1, 100, 100), 1),
+    ("b", "b1", "Episode 1", 1, (1, 600, 1, 100, 100), 1),
+    ("b", "b2", "Episode 5", 1, None, 0),
+]
+
+
+@pytest.fixture
+def library(db):
+    for podcast in ("a", "b"):
+        upsert_podcast(uuid=podcast, title=f"Show {podcast}", db_path=db)
+    with get_connection(db) as conn:
+        for podcast, uuid, title, created_at, history, sessions in EPISODES:
+            upsert_episode(uuid=uuid, podcast_uuid=podcast, title=title, description=f"<p>{title}</p>",
+                           published_date=PUBLISHED, conn=conn)
+            conn.execute("UPDATE episodes SET created_at = ? WHERE uuid = ?", (created_at, uuid))
+    for podcast, uuid, title, created_at, history, sessions in EPISODES:
+        if history is not None:
+            played_up_to, duration, play_count, first, last = history
+            upsert_listening_history(uuid, played_up_to=played_up_to, duration=duration, playing_status=2,
+                                     play_count=play_count, db_path=db)
+            # upsert_listening_history fills missing play times with now; keep the NULLs
+            with get_connection(db) as conn:
+                conn.execute("UPDATE listening_history SET first_played_at = ?, last_played_at = ? WHERE episode_uuid = ?",
+                             (first, last, uuid))
+        for i in range(sessions):
+            add_play_session(uuid, 1_000 * (i + 1), ended_at=1_000 * (i + 2), played_to=10.0 * i, db_path=db)
+    return db
+
+
+def _per_group_merge(db_path) -> DuplicateEpisodeMergeReport:
+    """The merge as it ran before it was set-based: per group, pairwise, in Python."""
+    report = DuplicateEpisodeMergeReport()
+    with get_connection(db_path) as conn:
+        rows = [dict(r) for r in conn.execute(
+            "SELECT uuid, podcast_uuid, title, published_date, file_url, created_at FROM episodes WHERE deleted_at IS NULL"
+        )]
+    by_podcast = defaultdict(list)
+    for ep in rows:
+        by_podcast[ep["podcast_uuid"]].append(ep)
+    for episodes in by_podcast.values():
+        report.podcasts_processed += 1
+        for group in _group_duplicate_episodes(episodes):
+            report.duplicate_groups += 1
+            with get_connection(db_path) as conn:
+                history = {r["episode_uuid"]: dict(r) for r in conn.execute(
+                    f"SELECT * FROM listening_history WHERE episode_uuid IN ({','.join('?' * len(group))})",
+                    [e["uuid"] for e in group],
+                )}
+                with_history = [e for e in group if e["uuid"] in history]
+                if with_history:
+                    canonical = max(with_history, key=lambda e: (
+                        float(history[e["uuid"]]["played_up_to"] or 0),
+                        int(history[e["uuid"]]["play_count"] or 0),
+                        e["created_at"] or 0,
+                    ))
+                else:
+                    canonical = min(group, key=lambda e: (e["created_at"] or 0, e["uuid"]))
+                for dup in group:
+                    if dup["uuid"] == canonical["uuid"]:
+                        continue
+                    _merge_history_pair(conn, canonical["uuid"], dup["uuid"])
+                    conn.execute("UPDATE play_sessions SET episode_uuid = ? WHERE episode_uuid = ?",
+                                 (canonical["uuid"], dup["uuid"]))
+                    conn.execute("DELETE FROM episodes WHERE uuid = ?", (dup["uuid"],))
+                    report.episodes_removed += 1
+    if report.episodes_removed:
+        prune_episode_descriptions(db_path)
+    return report
+
+
+def _merge_history_pair(conn, canonical_uuid, duplicate_uuid):
+    rows = {r["episode_uuid"]: dict(r) for r in conn.execute(
+        "SELECT * FROM listening_history WHERE episode_uuid IN (?, ?)", (canonical_uuid, duplicate_uuid)
+    )}
+    canon, dup = rows.get(canonical_uuid), rows.get(duplicate_uuid)
+    if not dup:
+        return
+    if not canon:
+        conn.execute("UPDATE listening_history SET episode_uuid = ?, updated_at = ? WHERE episode_uuid = ?",
+                     (canonical_uuid, now_ms(), duplicate_uuid))
+        return
+    played = max(float(canon["played_up_to"] or 0), float(dup["played_up_to"] or 0))
+    firsts = [t for t in (canon["first_played_at"], dup["first_played_at"]) if t is not None]
+    lasts = [t for t in (canon["last_played_at"], dup["last_played_at"]) if t is not None]
+    duration = canon["duration"] or dup["duration"] or 0
+    conn.execute(
+        """UPDATE listening_history SET played_up_to = ?, play_count = ?, first_played_at = ?, last_played_at = ?,
+               completion_percentage = ?, updated_at = ? WHERE episode_uuid = ?""",
+        (played, int(canon["play_count"] or 0) + int(dup["play_count"] or 0), min(firsts) if firsts else None,
+         max(lasts) if lasts else None, played / duration * 100.0 if duration > 0 else None, now_ms(), canonical_uuid),
+    )
+    conn.execute("DELETE FROM listening_history WHERE episode_uuid = ?", (duplicate_uuid,))
+
+
+def _state(db_path):
+    with get_connection(db_path) as conn:
+        return {
+            "episodes": sorted(r[0] for r in conn.execute("SELECT uuid FROM episodes")),
+            "history": sorted(tuple(r) for r in conn.execute(
+                """SELECT episode_uuid, played_up_to, duration, play_count, first_played_at, last_played_at,
+                          ROUND(completion_percentage, 6) FROM listening_history""")),
+            "sessions": sorted(tuple(r) for r in conn.execute(
+                "SELECT episode_uuid, started_at, ended_at, played_to FROM play_sessions")),
+            "descriptions": conn.execute("SELECT COUNT(*) FROM episode_descriptions").fetchone()[0],
+        }
+
+
+def test_set_based_merge_matches_per_group_merge(library, tmp_path):
+    reference = tmp_path / "reference.db"
+    shutil.copy(library, reference)
+
+    report = merge_duplicate_episodes(db_path=library)
+    expected = _per_group_merge(reference)
+
+    assert report == expected
+    assert (report.duplicate_groups, report.episodes_removed) == (4, 6)
+    assert _state(library) == _state(reference)
+
+
+def test_merge_folds_history_and_moves_sessions(library):
+    merge_duplicate_episodes(db_path=library)
+    state = _state(library)
+
+    assert state["episodes"] == sorted(["a2", "a5", "a7", "a8", "a11", "b1", "b2"])
+    history = {row[0]: row[1:] for row in state["history"]}
+    # a2 (most played) is kept: summed play counts, earliest first / latest last play, a1's duration for completion
+    assert history["a2"] == (300, 0, 3, 5_000, 20_000, 50.0)
+    # Only a5 had history, so it is kept over the older a4 and its row is unchanged
+    assert history["a5"] == (50, 0, 3, None, 30_000, None)
+    assert history["a8"] == (500, 0, 6, 500, 9_000, 50.0)
+    sessions = defaultdict(int)
+    for episode_uuid, *_rest in state["sessions"]:
+        sessions[episode_uuid] += 1
+    assert dict(sessions) == {"a2": 4, "a5": 1, "a7": 2, "a8": 1, "a11": 1, "b1": 1}
@@ -0,0 +1,81 @@
+"""Incremental duplicate sweep over podcasts marked in dirty_podcasts."""
+import sqlite3
+
+import pytest
+
+from database import get_connection, get_dirty_podcasts, now_ms, upsert_episode, upsert_podcast
+from api.services import duplicate_sweep
+from api.services.duplicate_sweep import sweep_dirty_duplicates
+
+
+def _dirty(db):
+    with get_connection(db) as conn:
+        return set(get_dirty_podcasts(conn))
+
+
+def test_sweep_keeps_podcast_with_soft_deleted_episodes_and_clears_marks(db):
+    upsert_podcast(uuid="a", title="Show", feed_url="https://feeds.example.com/show", db_path=db)
+    upsert_podcast(uuid="b", title="Show", feed_url="http://feeds.example.com/show/", db_path=db)
+    upsert_episode(uuid="e-a", podcast_uuid="a", title="Episode 1", db_path=db)
+    upsert_episode(uuid="e-b", podcast_uuid="b", title="Episode 1", deleted_at=now_ms(), db_path=db)
+
+    report = sweep_dirty_duplicates(db_path=db)
+
+    assert report.errors == []
+    assert report.podcasts_removed == 0
+    assert _dirty(db) == set()
+
+
+def test_failing_podcast_stays_marked_without_blocking_others(db, monkeypatch):
+    upsert_podcast(uuid="a", title="Show", feed_url="https://feeds.example.com/show", db_path=db)
+    upsert_podcast(uuid="a-copy", title="Show", feed_url="https://feeds.example.com/show/", db_path=db)
+    upsert_podcast(uuid="bad", title="Broken", feed_url="https://feeds.example.com/broken", db_path=db)
+    upsert_episode(uuid="e-a", podcast_uuid="a", title="Episode 1", db_path=db)
+    real_remove = duplicate_sweep.remove_duplicate_podcasts
+
+    def remove(db_path=None, podcast_uuids=None, dry_run=False):
+        if "bad" in podcast_uuids:
+            raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+        return real_remove(db_path=db_path, podcast_uuids=podcast_uuids, dry_run=dry_run)
+
+    monkeypatch.setattr(duplicate_sweep, "remove_duplicate_podcasts", remove)
+
+    report = sweep_dirty_duplicates(db_path=db)
+
+    assert report.podcasts_removed == 1
+    assert [e.split(":")[0] for e in report.errors] == ["bad"]
+    assert _dirty(db) == {"bad"}
+    with get_connection(db) as conn:
+        assert {row[0] for row in conn.execute("SELECT uuid FROM podcasts")} == {"a", "bad"}
+
+
+
+def _library_with_kept_empty_podcast(db):
+    # x has no episodes but is kept: two podcasts titled "Foo" have episodes
+    for uuid in ("x", "y", "w"):
+        upsert_podcast(uuid=uuid, title="Foo", feed_url=f"https://{uuid}.example.com/feed", db_path=db)
+    upsert_episode(uuid="e-y", podcast_uuid="y", title="Pilot", db_path=db)
+    upsert_episode(uuid="e-w", podcast_uuid="w", title="Pilot", db_path=db)
+    assert sweep_dirty_duplicates(db_path=db).podcasts_removed == 0
+    assert _dirty(db) == set()
+
+
+def _rename(db):
+    upsert_podcast(uuid="w", title="Bar", db_path=db)
+
+
+def _archive(db):
+    with get_connection(db) as conn:
+        conn.execute("UPDATE podcasts SET deleted_at = ? WHERE uuid = 'w'", (now_ms(),))
+
+
+@pytest.mark.parametrize("leave", [_rename, _archive], ids=["rename", "archive"])
+def test_sibling_leaving_title_group_rechecks_the_group(db, leave):
+    _library_with_kept_empty_podcast(db)
+
+    leave(db)
+    report = sweep_dirty_duplicates(db_path=db)
+
+    assert report.removed_titles == ["Foo"]
+    with get_connection(db) as conn:
+        assert {row[0] for row in conn.execute("SELECT uuid FROM podcasts")} == {"y", "w"}
@@ -0,0 +1,45 @@
+"""fields= projection on episode list endpoints."""
+import json
+
+import pytest
+
+from database import upsert_episode, upsert_podcast
+from api.routers.episodes import list_episodes
+from api.routers.podcasts import list_podcast_episodes
+from api.routers.search import search
+
+
+@pytest.fixture
+def library(db, monkeypatch):
+    monkeypatch.setenv("PODCASTS_DB_PATH", str(db))
+    upsert_podcast(uuid="p", title="Show", db_path=db)
+    upsert_episode(uuid="e", podcast_uuid="p", title="Pilot", description="<p>Notes</p>", duration=60, db_path=db)
+    return db
+
+
+def _items(response):
+    body = json.loads(response.body)
+    return body["items"] if isinstance(body, dict) and "items" in body else body
+
+
+def test_selected_fields_only(library):
+    listed = _items(list_episodes(limit=10, offset=0, podcast_uuid=None, playing_status=None, sort="last_played",
+                                  fields="title,last_played_at"))
+    by_podcast = _items(list_podcast_episodes("p", limit=10, offset=0, playing_status=None, sort="newest",
+                                              fields="title,last_played_at"))
+    found = json.loads(search(q="Pilot", podcast_uuid=None, playing_status=None, limit=10,
+                              fields="title,last_played_at").body)["episodes"]
+
+    for items in (listed, by_podcast, found):
+        assert len(items) == 1
+        assert set(items[0]) == {"uuid", "podcast_uuid", "title", "last_played_at"}
+        assert items[0]["title"] == "Pilot"
+        assert isinstance(items[0]["last_played_at"], str)
+
+
+def test_summary_leaves_out_descriptions(library):
+    items = _items(list_episodes(limit=10, offset=0, podcast_uuid=None, playing_status=None, sort="last_played",
+                                 fields="summary"))
+
+    assert "description" not in items[0] and "description_text" not in items[0]
+    assert items[0]["summary_snippet"] == "Notes"
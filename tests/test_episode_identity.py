@@ -0,0 +1,26 @@
+"""Resolving feed entries to stored episodes."""
+from api.services.episode_identity import ExistingEpisodes
+
+EXISTING = [
+    {"uuid": "by-url", "title": "Intro", "title_norm": "intro", "published_date": 1000.0, "file_url": "https://cdn.example.com/1.mp3", "created_at": 5},
+    {"uuid": "late", "title": "Ep 2", "title_norm": "ep 2", "published_date": 90000.0, "file_url": None, "created_at": 3},
+    {"uuid": "newer", "title": "Ep 2", "title_norm": "ep 2", "published_date": 90000.0, "file_url": None, "created_at": 9},
+    {"uuid": "untitled", "title": "", "title_norm": "", "published_date": None, "file_url": None, "created_at": 1},
+]
+
+
+def test_matches_file_url_before_title():
+    known = ExistingEpisodes(EXISTING)
+    entry = {"uuid": "guid-1", "title": "Renamed", "published_date": 5.0, "file_url": " https://cdn.example.com/1.mp3 "}
+    assert known.resolve(entry) == "by-url"
+
+
+def test_title_match_within_a_day_prefers_oldest_row():
+    known = ExistingEpisodes(EXISTING)
+    assert known.resolve({"uuid": "guid-2", "title": "EP  2", "published_date": 90000.0 + 3600}) == "late"
+    assert known.resolve({"uuid": "guid-3", "title": "Ep 2", "published_date": 90000.0 + 2 * 86400}) == "guid-3"
+
+
+def test_empty_title_never_matches():
+    known = ExistingEpisodes(EXISTING)
+    assert known.resolve({"uuid": "guid-4", "title": "", "published_date": None}) == "guid-4"
@@ -0,0 +1,47 @@
+"""Library export and restore."""
+import io
+
+import pytest
+
+from database import add_play_session, get_connection, init_schema, upsert_episode, upsert_podcast
+from library_export import export_library, restore_library
+
+
+def _library(path, sessions):
+    init_schema(path)
+    upsert_podcast(uuid="p", title="Show", db_path=path)
+    upsert_episode(uuid="e", podcast_uuid="p", title="Pilot", description="<p>Notes</p>", db_path=path)
+    for started_at in sessions:
+        add_play_session("e", started_at, ended_at=started_at + 60_000, played_to=60, db_path=path)
+
+
+def _sessions(path):
+    with get_connection(path) as conn:
+        return sorted(tuple(row) for row in conn.execute("SELECT episode_uuid, started_at, played_to FROM play_sessions"))
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_restore_sniffs_format_from_bytesio(tmp_path, fmt):
+    source, target = tmp_path / "source.db", tmp_path / "target.db"
+    _library(source, sessions=[1_000])
+    out = io.BytesIO()
+    export_library(out, fmt, db_path=source)
+
+    counts = restore_library(io.BytesIO(out.getvalue()), db_path=target)
+
+    assert counts == {"podcasts": 1, "episodes": 1, "listening_history": 0, "play_sessions": 1}
+    assert _sessions(target) == _sessions(source)
+
+
+def test_restore_keeps_unrelated_sessions_and_matches_on_start_time(tmp_path):
+    source, target = tmp_path / "source.db", tmp_path / "target.db"
+    _library(source, sessions=[1_000, 2_000])
+    # Target session id 1 is unrelated to the export's session id 1
+    _library(target, sessions=[5_000])
+    out = io.BytesIO()
+    export_library(out, "ndjson", db_path=source)
+
+    restore_library(io.BytesIO(out.getvalue()), db_path=target)
+    restore_library(io.BytesIO(out.getvalue()), db_path=target)
+
+    assert _sessions(target) == [("e", 1_000, 60), ("e", 2_000, 60), ("e", 5_000, 60)]
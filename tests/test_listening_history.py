@@ -0,0 +1,69 @@
+"""Episodes without a listening_history row read the same as the old placeholder rows."""
+import pytest
+
+from database import (
+    compact_listening_history,
+    get_connection,
+    get_episode_by_uuid,
+    get_episodes_by_podcast,
+    get_episodes_list,
+    implicit_listening_history,
+    upsert_episode,
+    upsert_listening_history,
+    upsert_podcast,
+)
+
+HISTORY_FIELDS = (
+    "played_up_to", "playing_status", "completion_percentage", "first_played_at", "last_played_at", "play_count",
+)
+
+
+@pytest.fixture
+def library(db):
+    upsert_podcast(uuid="p", title="Show", db_path=db)
+    with get_connection(db) as conn:
+        for i, created_at in enumerate((1_000, 3_000, 5_000)):
+            upsert_episode(uuid=f"e{i}", podcast_uuid="p", title=f"Episode {i}", duration=600, published_date=i, conn=conn)
+            conn.execute("UPDATE episodes SET created_at = ? WHERE uuid = ?", (created_at, f"e{i}"))
+    # e1 was played between the other two inserts; e0 and e2 only have placeholder rows
+    upsert_listening_history("e1", played_up_to=300, duration=600, playing_status=2,
+                             first_played_at=4_000, last_played_at=4_000, db_path=db)
+    with get_connection(db) as conn:
+        for uuid, created_at in (("e0", 1_000), ("e2", 5_000)):
+            conn.execute(
+                """INSERT INTO listening_history (episode_uuid, played_up_to, duration, playing_status,
+                       completion_percentage, first_played_at, last_played_at, play_count, created_at, updated_at)
+                   VALUES (?, 0, 600, 1, 0.0, ?, ?, 1, ?, ?)""",
+                (uuid, created_at, created_at, created_at, created_at),
+            )
+    return db
+
+
+def _listed(rows):
+    return [(row["uuid"],) + tuple(row[f] for f in HISTORY_FIELDS) for row in rows]
+
+
+def test_episode_lists_unchanged_by_compaction(library):
+    before = (
+        _listed(get_episodes_list(db_path=library, sort="last_played")),
+        _listed(get_episodes_by_podcast("p", db_path=library, sort="oldest_played")),
+    )
+    assert compact_listening_history(db_path=library) == 2
+    after = (
+        _listed(get_episodes_list(db_path=library, sort="last_played")),
+        _listed(get_episodes_by_podcast("p", db_path=library, sort="oldest_played")),
+    )
+
+    assert after == before
+    assert [row[0] for row in after[0]] == ["e2", "e1", "e0"]
+
+
+def test_implicit_history_matches_placeholder_row(library):
+    with get_connection(library) as conn:
+        placeholder = dict(conn.execute("SELECT * FROM listening_history WHERE episode_uuid = 'e2'").fetchone())
+    compact_listening_history(db_path=library)
+    episode = get_episode_by_uuid("e2", db_path=library)
+
+    implicit = implicit_listening_history("e2", episode["duration"], episode["created_at"])
+
+    assert {f: implicit[f] for f in HISTORY_FIELDS} == {f: placeholder[f] for f in HISTORY_FIELDS}
@@ -0,0 +1,95 @@
+"""Request metrics and per-route log levels use the full route template, never raw path values."""
+import asyncio
+import logging
+
+from fastapi import APIRouter, FastAPI
+
+import metrics
+from api.middleware import MetricsMiddleware, RequestLogMiddleware
+
+
+def _router():
+    router = APIRouter()
+
+    @router.get("")
+    def listing():
+        return []
+
+    @router.get("/{uuid}")
+    def detail(uuid: str):
+        return {}
+
+    @router.get("/{uuid}/episodes/{episode_uuid}")
+    def episode(uuid: str, episode_uuid: str):
+        return {}
+
+    return router
+
+
+def _app(wrap=MetricsMiddleware):
+    app = FastAPI()
+    # Mounted as api/main.py does: the prefix is given to include_router
+    app.include_router(_router(), prefix="/api/podcasts")
+    app.include_router(_router(), prefix="/api/episodes")
+    return wrap(app)
+
+
+def _get(app, path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    asyncio.run(app(scope, receive, send))
+
+
+def _count(route):
+    return sum(v for labels, v in metrics.HTTP_REQUESTS._values.items() if labels[1] == route)
+
+
+def test_prefixed_routers_get_distinct_labels():
+    before = {r: _count(r) for r in ("/api/podcasts", "/api/episodes", "/api/podcasts/{uuid}", "/api/episodes/{uuid}")}
+    app = _app()
+    _get(app, "/api/podcasts")
+    _get(app, "/api/episodes")
+    _get(app, "/api/podcasts/y")
+    _get(app, "/api/episodes/x")
+    _get(app, "/api/episodes/z")
+
+    assert {r: _count(r) - n for r, n in before.items()} == {
+        "/api/podcasts": 1, "/api/episodes": 1, "/api/podcasts/{uuid}": 1, "/api/episodes/{uuid}": 2,
+    }
+
+
+def test_route_label_is_template_when_values_repeat_in_path():
+    app = _app()
+    # "api" and "podcasts" also appear earlier in the path; "e" is a substring of "episodes"
+    _get(app, "/api/podcasts/api/episodes/podcasts")
+    _get(app, "/api/podcasts/podcasts/episodes/e")
+    _get(app, "/nowhere/else")
+
+    routes = {labels[1] for labels in metrics.HTTP_REQUESTS._values}
+    assert "/api/podcasts/{uuid}/episodes/{episode_uuid}" in routes
+    assert "unmatched" in routes
+    assert not {"/{uuid}", "", "/{uuid}/episodes/{episode_uuid}"} & routes
+    assert not any(r.startswith(("/api/{", "/api/podcasts/podcasts", "/api/podcasts/api")) for r in routes)
+
+
+def test_route_log_level_matches_full_template(caplog):
+    app = _app(lambda inner: RequestLogMiddleware(
+        inner, sample_rate=1.0, route_levels={"/api/episodes/{uuid}": logging.DEBUG, "/api/podcasts": None},
+    ))
+    with caplog.at_level(logging.DEBUG, logger="api.middleware"):
+        _get(app, "/api/episodes/x")
+        _get(app, "/api/podcasts/y")
+        _get(app, "/api/podcasts")
+
+    levels = {record.getMessage().split()[1]: record.levelno for record in caplog.records}
+    assert levels == {"/api/episodes/x": logging.DEBUG, "/api/podcasts/y": logging.INFO}
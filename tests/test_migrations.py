@@ -0,0 +1,189 @@
+"""Schema migrations from databases created by older releases."""
+import sqlite3
+
+import pytest
+
+from database import SCHEMA_VERSION, get_connection, init_schema
+from import_pocketcasts import TargetSchemaOutdatedError, diff_pocketcasts_db
+
+# Schema as created by schema version 5 (TEXT ISO timestamps, descriptions inline)
+V5_SCHEMA = """
+CREATE TABLE podcasts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid TEXT UNIQUE NOT NULL,
+    title TEXT,
+    author TEXT,
+    description TEXT,
+    feed_url TEXT,
+    website_url TEXT,
+    image_url TEXT,
+    deleted_at TEXT,
+    is_ended INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE episodes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid TEXT UNIQUE NOT NULL,
+    podcast_uuid TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    duration REAL,
+    published_date REAL,
+    file_url TEXT,
+    file_type TEXT,
+    size_bytes INTEGER,
+    video_url TEXT,
+    deleted_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY (podcast_uuid) REFERENCES podcasts(uuid)
+);
+CREATE TABLE listening_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    episode_uuid TEXT NOT NULL UNIQUE,
+    played_up_to REAL NOT NULL DEFAULT 0,
+    duration REAL NOT NULL DEFAULT 0,
+    playing_status INTEGER NOT NULL DEFAULT 0,
+    episode_status INTEGER,
+    completion_percentage REAL,
+    first_played_at TEXT,
+    last_played_at TEXT,
+    play_count INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY (episode_uuid) REFERENCES episodes(uuid)
+);
+CREATE TABLE play_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    episode_uuid TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    duration_seconds REAL,
+    played_from REAL NOT NULL DEFAULT 0,
+    played_to REAL NOT NULL DEFAULT 0,
+    FOREIGN KEY (episode_uuid) REFERENCES episodes(uuid)
+);
+CREATE INDEX idx_episodes_podcast_uuid ON episodes(podcast_uuid);
+CREATE INDEX idx_episodes_uuid ON episodes(uuid);
+CREATE INDEX idx_listening_history_episode_uuid ON listening_history(episode_uuid);
+CREATE INDEX idx_listening_history_last_played ON listening_history(last_played_at);
+CREATE INDEX idx_play_sessions_episode_uuid ON play_sessions(episode_uuid);
+CREATE TABLE _schema_meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE sync_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sync_timestamp TEXT NOT NULL,
+    source_path TEXT,
+    podcasts_added INTEGER NOT NULL DEFAULT 0,
+    podcasts_updated INTEGER NOT NULL DEFAULT 0,
+    podcasts_deleted INTEGER NOT NULL DEFAULT 0,
+    episodes_added INTEGER NOT NULL DEFAULT 0,
+    episodes_updated INTEGER NOT NULL DEFAULT 0,
+    episodes_deleted INTEGER NOT NULL DEFAULT 0,
+    conflicts_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+INSERT INTO _schema_meta (key, value) VALUES ('schema_version', '5');
+INSERT INTO _schema_meta (key, value) VALUES ('last_sync_timestamp', '2024-03-01T10:00:00Z');
+INSERT INTO podcasts (uuid, title, feed_url, created_at, updated_at)
+    VALUES ('p1', 'The Show', 'https://example.com/feed.xml', '2024-01-01T00:00:00Z', '2024-01-02T00:00:00Z');
+INSERT INTO episodes (uuid, podcast_uuid, title, description, duration, published_date, deleted_at, created_at, updated_at)
+    VALUES ('e1', 'p1', 'Episode 1', '<p>Hello <b>world</b></p>', 1800, 1704067200, NULL,
+            '2024-01-01T00:00:00Z', '2024-01-01T00:00:00Z');
+INSERT INTO episodes (uuid, podcast_uuid, title, duration, deleted_at, created_at, updated_at)
+    VALUES ('e2', 'p1', 'Episode 2', 600, '2024-02-01T12:30:00.500Z', '2024-01-08T00:00:00Z', '2024-02-01T12:30:00Z');
+INSERT INTO listening_history (episode_uuid, played_up_to, duration, playing_status, first_played_at, last_played_at, created_at, updated_at)
+    VALUES ('e1', 900, 1800, 2, '2024-01-03T08:00:00Z', '2024-01-04T08:00:00Z', '2024-01-03T08:00:00Z', '2024-01-04T08:00:00Z');
+INSERT INTO play_sessions (episode_uuid, started_at, ended_at, duration_seconds, played_from, played_to)
+    VALUES ('e1', '2024-01-04T08:00:00Z', '2024-01-04T08:15:00Z', 900, 0, 900);
+"""
+
+
+def _make_v5_db(path, extra_sql=""):
+    conn = sqlite3.connect(path)
+    conn.executescript(V5_SCHEMA + extra_sql)
+    conn.close()
+
+
+def _column_types(conn, table):
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_migrates_v5_database(tmp_path):
+    db = tmp_path / "v5.db"
+    _make_v5_db(db)
+
+    init_schema(db)
+
+    with get_connection(db) as conn:
+        version = conn.execute("SELECT value FROM _schema_meta WHERE key = 'schema_version'").fetchone()[0]
+        assert int(version) == SCHEMA_VERSION
+        assert _column_types(conn, "episodes")["deleted_at"] == "INTEGER"
+        assert _column_types(conn, "listening_history")["last_played_at"] == "INTEGER"
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_episodes_uuid_state", "idx_episodes_podcast_title_norm", "idx_podcasts_feed_url_canonical"} <= indexes
+
+        e2 = conn.execute("SELECT deleted_at, created_at, title_norm FROM episodes WHERE uuid = 'e2'").fetchone()
+        assert e2["deleted_at"] == 1706790600500
+        assert e2["created_at"] == 1704672000000
+        assert e2["title_norm"] == "episode 2"
+        history = conn.execute("SELECT last_played_at FROM listening_history WHERE episode_uuid = 'e1'").fetchone()
+        assert history["last_played_at"] == 1704355200000
+        podcast = conn.execute("SELECT feed_url_canonical FROM podcasts WHERE uuid = 'p1'").fetchone()
+        assert podcast["feed_url_canonical"] == "https://example.com/feed.xml"
+        assert conn.execute("SELECT description_id FROM episodes WHERE uuid = 'e1'").fetchone()[0] is not None
+        last_sync = conn.execute("SELECT value FROM _schema_meta WHERE key = 'last_sync_timestamp'").fetchone()[0]
+        assert last_sync == "1709287200000"
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+
+
+def test_migrates_v5_database_left_with_covering_index(tmp_path):
+    # An upgrade that failed on the v8 column drop could leave the covering index behind
+    db = tmp_path / "v5.db"
+    _make_v5_db(db, "CREATE INDEX idx_episodes_uuid_state ON episodes(uuid, deleted_at, duration);")
+
+    init_schema(db)
+
+    with get_connection(db) as conn:
+        assert _column_types(conn, "episodes")["deleted_at"] == "INTEGER"
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_episodes_uuid_state'").fetchone()
+
+
+def test_init_schema_is_idempotent(tmp_path):
+    db = tmp_path / "new.db"
+    init_schema(db)
+    init_schema(db)
+    with get_connection(db) as conn:
+        version = conn.execute("SELECT value FROM _schema_meta WHERE key = 'schema_version'").fetchone()[0]
+        assert int(version) == SCHEMA_VERSION
+
+
+def _make_source_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE SJPodcast (uuid TEXT, title TEXT, author TEXT, podcastDescription TEXT, podcastUrl TEXT,
+                                imageURL TEXT, thumbnailURL TEXT, wasDeleted INTEGER);
+        CREATE TABLE SJEpisode (uuid TEXT, podcastUuid TEXT, title TEXT, episodeDescription TEXT, duration REAL,
+                                publishedDate REAL, downloadUrl TEXT, fileType TEXT, sizeInBytes INTEGER,
+                                playedUpTo REAL, playingStatus INTEGER, episodeStatus INTEGER, addedDate REAL,
+                                lastPlaybackInteractionDate REAL, wasDeleted INTEGER);
+        INSERT INTO SJPodcast VALUES ('p1', 'Show', 'Author', NULL, NULL, NULL, NULL, 0);
+        INSERT INTO SJEpisode VALUES ('e9', 'p1', 'New', NULL, 600, NULL, NULL, NULL, NULL, 0, 1, NULL, NULL, NULL, 0);
+    """)
+    conn.close()
+
+
+def test_dry_run_reports_unmigrated_target(tmp_path):
+    db, source = tmp_path / "v5.db", tmp_path / "export.sqlite3"
+    _make_v5_db(db)
+    _make_source_db(source)
+
+    with pytest.raises(TargetSchemaOutdatedError) as excinfo:
+        diff_pocketcasts_db(source, target_db=db)
+    assert excinfo.value.version == 5
+    with get_connection(db) as conn:
+        assert conn.execute("SELECT value FROM _schema_meta WHERE key = 'schema_version'").fetchone()[0] == "5"
+
+    init_schema(db)
+    diff = diff_pocketcasts_db(source, target_db=db)
+    assert diff.episodes_added == 1
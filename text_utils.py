@@ -0,0 +1,82 @@
+"""
+Plain-text helpers for feed HTML (show notes, podcast descriptions), and the normalized
+title / canonical feed URL keys used for matching (stored as title_norm / feed_url_canonical).
+Regex-based rather than a full HTML parser: good enough for previews and search
+text, and fast enough to run on every upsert.
+"""
+import html
+import re
+from typing import Optional
+from urllib.parse import urlparse
+
+# Length of summary_snippet in characters
+SNIPPET_LENGTH = 280
+
+_DROP_BLOCKS = re.compile(r"<(script|style|head)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENTS = re.compile(r"<!--.*?-->", re.DOTALL)
+_BREAKS = re.compile(r"<\s*(br|/p|/div|/li|/h[1-6]|/tr|/blockquote)\b[^>]*>", re.IGNORECASE)
+_LIST_ITEMS = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+_TAGS = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"[ \t\r\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\s*\n\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def html_to_text(value: Optional[str]) -> Optional[str]:
+    """Strip tags and entities from HTML, keeping paragraph/line breaks as newlines. None stays None."""
+    if value is None:
+        return None
+    if "<" not in value and "&" not in value:
+        text = value
+    else:
+        text = _COMMENTS.sub("", value)
+        text = _DROP_BLOCKS.sub("", text)
+        text = _BREAKS.sub("\n", text)
+        text = _LIST_ITEMS.sub("\n- ", text)
+        text = _TAGS.sub("", text)
+        text = html.unescape(text)
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n", text)
+    return text.strip()
+
+
+def summary_snippet(text: Optional[str], length: int = SNIPPET_LENGTH) -> Optional[str]:
+    """First ~length characters of plain text on one line, cut at a word boundary with an ellipsis."""
+    if text is None:
+        return None
+    flat = " ".join(text.split())
+    if len(flat) <= length:
+        return flat
+    cut = flat[:length]
+    space = cut.rfind(" ")
+    if space > length * 0.6:
+        cut = cut[:space]
+    return cut.rstrip(" ,;:.-") + "…"
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Title key for matching: entities decoded, lowercased, whitespace collapsed and stripped."""
+    if not title or not isinstance(title, str):
+        return ""
+    if "&" in title:
+        title = html.unescape(title)
+    return _WHITESPACE.sub(" ", title.lower()).strip()
+
+
+def canonical_feed_url(url: Optional[str]) -> str:
+    """Feed URL key for matching: stripped, no trailing slash, https, lowercase host."""
+    if not url or not isinstance(url, str):
+        return ""
+    s = url.strip().rstrip("/")
+    if not s:
+        return ""
+    parsed = urlparse(s)
+    if not parsed.netloc:
+        return s
+    scheme = "https" if parsed.scheme in ("http", "https") else (parsed.scheme or "https")
+    path = parsed.path or "/"
+    if parsed.query:
+        path = path + "?" + parsed.query
+    if parsed.fragment:
+        path = path + "#" + parsed.fragment
+    return f"{scheme}://{parsed.netloc.lower()}{path}"